@@ -1,1670 +1,4691 @@
-import sys
-import json
-import os
-import random
-import string
-from datetime import datetime, timedelta
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,QLabel, QPushButton, QDialog, QLineEdit, QComboBox, QSpinBox, QColorDialog,QMessageBox, QCalendarWidget, QTabWidget, QInputDialog, QListWidget, QListWidgetItem,QMenu, QAction, QToolBar, QStatusBar, QSystemTrayIcon, QScrollArea, QGroupBox, QFileDialog
-from PyQt5.QtGui import QFont, QColor, QIcon, QPainter, QBrush, QPixmap, QTextDocument, QTextOption
-from PyQt5.QtCore import Qt, QDate, QTime, QTimer, pyqtSignal, QRectF, QSizeF
-from PyQt5.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog
-
-# 导入配置信息
-import config
-
-# 悬浮课程表窗口类
-class FloatingScheduleWindow(QWidget):
-    closed = pyqtSignal()  # 定义关闭信号
-    
-    def __init__(self, courses, day_names, parent=None):
-        """初始化悬浮课程表窗口。"""
-        super().__init__(parent)
-        self.courses = courses
-        self.day_names = day_names
-        self.setWindowTitle("悬浮课程表")
-        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.Window)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.resize(config.FLOATING_WINDOW_WIDTH, config.FLOATING_WINDOW_HEIGHT + 100)  # 增加高度以容纳时间信息
-        self.init_ui()
-        
-        # 设置定时器，每秒更新一次时间信息
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_time_info)
-        self.timer.start(1000)  # 1000毫秒 = 1秒
-        
-    def init_ui(self):
-        """初始化悬浮窗口的用户界面。"""
-        layout = QVBoxLayout()
-        layout.setContentsMargins(10, 10, 10, 10)
-        
-        # 创建时间信息区域
-        time_info_widget = QWidget()
-        time_info_widget.setStyleSheet("background-color: rgba(255, 255, 255, 220); border-radius: 8px; padding: 10px;")
-        time_info_layout = QVBoxLayout(time_info_widget)
-        
-        # 当前时间显示 - 增大字体并增强对比度
-        self.current_time_label = QLabel("加载中...")
-        self.current_time_label.setFont(QFont("SimHei", 16, QFont.Bold))
-        self.current_time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.current_time_label.setStyleSheet("color: #000000;")
-        time_info_layout.addWidget(self.current_time_label)
-        
-        # 倒计时信息显示 - 增大字体并增强对比度
-        self.countdown_label = QLabel("加载中...")
-        self.countdown_label.setFont(QFont("SimHei", 14, QFont.Bold))
-        self.countdown_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.countdown_label.setStyleSheet("color: #000000;")
-        time_info_layout.addWidget(self.countdown_label)
-        
-        # 下节课信息显示 - 增大字体并增强对比度
-        self.next_course_label = QLabel("加载中...")
-        self.next_course_label.setFont(QFont("SimHei", 12))
-        self.next_course_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.next_course_label.setStyleSheet("color: #000000;")
-        self.next_course_label.setWordWrap(True)  # 启用自动换行
-        time_info_layout.addWidget(self.next_course_label)
-        
-        # 添加时间信息区域到主布局
-        layout.addWidget(time_info_widget)
-        
-        # 获取今天是星期几
-        today = datetime.now().weekday()  # 0=周一, 6=周日
-        
-        # 创建今天的课程标题 - 添加对周六和周日的处理
-        if 0 <= today < len(self.day_names):
-            today_label = QLabel(f"{self.day_names[today]}的课程")
-        else:
-            # 对于周六和周日，使用通用标题
-            week_day_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-            today_label = QLabel(f"{week_day_names[today]}的课程")
-            
-        today_label.setFont(QFont("SimHei", 12, QFont.Bold))
-        today_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(today_label)
-        
-        # 创建课程列表
-        course_layout = QVBoxLayout()
-        course_layout.setSpacing(5)
-        
-        # 过滤今天的课程并按时间排序
-        today_courses = [c for c in self.courses if c.day == today]
-        today_courses.sort(key=lambda x: x.start_section)
-        
-        # 如果没有课程，显示提示信息
-        if not today_courses:
-            no_course_label = QLabel("今天没有课程")
-            no_course_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_course_label.setStyleSheet("color: #666;")
-            course_layout.addWidget(no_course_label)
-        else:
-            # 创建课程项
-            for course in today_courses:
-                course_item = QWidget()
-                course_item.setStyleSheet(f"background-color: {course.color}80; border-radius: 5px; padding: 5px;")
-                
-                course_item_layout = QVBoxLayout(course_item)
-                course_item_layout.setContentsMargins(5, 5, 5, 5)
-                
-                course_name = QLabel(f"{course.start_section}-{course.end_section}节: {course.name}")
-                course_name.setFont(QFont("SimHei", 10, QFont.Bold))
-                course_name.setAlignment(Qt.AlignmentFlag.AlignLeft)
-                
-                course_info = QLabel(f"{course.teacher} | {course.classroom}")
-                course_info.setFont(QFont("SimHei", 9))
-                course_info.setAlignment(Qt.AlignmentFlag.AlignLeft)
-                
-                course_item_layout.addWidget(course_name)
-                course_item_layout.addWidget(course_info)
-                course_layout.addWidget(course_item)
-        
-        layout.addLayout(course_layout)
-        self.setLayout(layout)
-        
-        # 初始化时立即更新一次时间信息
-        self.update_time_info()
-        
-    def mousePressEvent(self, event):
-        # 记录鼠标按下的位置，用于窗口拖动
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        # 拖动窗口
-        if event.buttons() == Qt.MouseButton.LeftButton:
-            self.move(event.globalPos() - self.drag_position)
-            event.accept()
-    
-    def mouseDoubleClickEvent(self, event):
-        # 双击关闭窗口
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.close()
-    
-    def update_time_info(self):
-        """更新时间信息，包括当前时间、倒计时和下节课信息。"""
-        try:
-            now = datetime.now()
-            
-            # 更新当前时间
-            current_time_str = now.strftime("%Y年%m月%d日 %H:%M:%S")
-            self.current_time_label.setText(current_time_str)
-            
-            # 获取今天的课程
-            today = now.weekday()
-            today_courses = [c for c in self.courses if c.day == today]
-            today_courses.sort(key=lambda x: x.start_section)
-            
-            countdown_text = ""
-            next_course_text = ""
-            
-            # 计算当前是否有课程正在进行或即将开始
-            has_current_course = False
-            next_course = None
-            
-            # 确保配置项存在
-            section_duration = getattr(config, 'SECTION_DURATION', 45)  # 默认45分钟一节课
-            break_duration = getattr(config, 'BREAK_DURATION', 10)     # 默认10分钟课间
-            
-            for course in today_courses:
-                # 计算课程开始和结束时间
-                try:
-                    start_time = datetime(now.year, now.month, now.day, 8, 0)
-                    start_time += timedelta(minutes=(course.start_section - 1) * (section_duration + break_duration))
-                    end_time = start_time + timedelta(minutes=section_duration)
-                except Exception as e:
-                    continue
-                
-                # 检查当前是否在上课中
-                if start_time <= now < end_time:
-                    has_current_course = True
-                    # 计算离下课还有多长时间
-                    remaining_minutes = int((end_time - now).total_seconds() / 60)
-                    countdown_text = f"离下课还有: {remaining_minutes} 分钟"
-                    break
-                
-                # 检查是否是即将开始的下一节课
-                if not next_course and start_time > now:
-                    next_course = course
-                    # 计算离下节课还有多长时间
-                    remaining_minutes = int((start_time - now).total_seconds() / 60)
-                    countdown_text = f"离下节课还有: {remaining_minutes} 分钟"
-                    next_course_text = f"下节课: {course.name} ({course.teacher})"
-            
-            # 如果没有当前课程也没有下节课
-            if not has_current_course and not next_course:
-                countdown_text = "今天没有课程了"
-            
-            self.countdown_label.setText(countdown_text)
-            self.next_course_label.setText(next_course_text)
-        except Exception as e:
-            # 错误处理，确保界面不会空白
-            self.countdown_label.setText("加载课程信息失败")
-            self.next_course_label.setText("请检查课程数据")
-        
-    def closeEvent(self, event):
-        """当悬浮窗口关闭时发送关闭信号。"""
-        # 停止定时器
-        self.timer.stop()
-        # 发送关闭信号
-        self.closed.emit()
-        event.accept()
-
-# 课程类
-class Course:
-    def __init__(self, name="", teacher="", classroom="", day=0, start_section=1, end_section=1, color="#4CAF50"):
-        """初始化课程对象。"""
-        self.name = name
-        self.teacher = teacher
-        self.classroom = classroom
-        self.day = day  # 0-4 对应周一到周五
-        self.start_section = start_section
-        self.end_section = end_section
-        self.color = color
-        self.reminder = False  # 是否设置提醒
-        self.reminder_minutes = config.DEFAULT_REMINDER_MINUTES  # 提前多少分钟提醒
-        # 生成随机ID：8位字母数字组合
-        self.id = ''.join(random.choices(string.ascii_letters + string.digits, k=8))  # 唯一标识符
-        # 打印生成的随机ID
-        print(f"创建新课程，生成的随机ID: {self.id}")
-
-    def to_dict(self):
-        """将课程对象转换为字典格式，用于保存到文件。"""
-        return {
-            'name': self.name,
-            'teacher': self.teacher,
-            'classroom': self.classroom,
-            'day': self.day,
-            'start_section': self.start_section,
-            'end_section': self.end_section,
-            'color': self.color,
-            'reminder': self.reminder,
-            'reminder_minutes': self.reminder_minutes,
-            'id': self.id
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        """从字典数据创建课程对象，用于从文件加载。"""
-        course = cls(
-            data['name'],
-            data['teacher'],
-            data['classroom'],
-            data['day'],
-            data['start_section'],
-            data['end_section'],
-            data['color']
-        )
-        course.reminder = data.get('reminder', False)
-        course.reminder_minutes = data.get('reminder_minutes', config.DEFAULT_REMINDER_MINUTES)
-        # 如果提供了ID则使用，否则生成随机ID
-        if 'id' in data:
-            course.id = data['id']
-            print(f"从字典加载课程，使用提供的ID: {course.id}")
-        else:
-            # 生成随机ID：8位字母数字组合
-            course.id = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-            print(f"从字典加载课程，生成的随机ID: {course.id}")
-        return course
-
-# 添加/编辑课程对话框
-class AddCourseDialog(QDialog):
-    def __init__(self, parent=None, course=None, day_names=None):
-        """初始化添加/编辑课程对话框。"""
-        super().__init__(parent)
-        self.setWindowTitle("添加课程" if course is None else "编辑课程")
-        self.setGeometry(300, 300, 400, 350)
-        self.course = course
-        self.day_names = day_names or ["周一", "周二", "周三", "周四", "周五"]
-        self.init_ui()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # 课程名称
-        name_layout = QHBoxLayout()
-        name_layout.addWidget(QLabel("课程名称:"))
-        self.name_edit = QLineEdit()
-        name_layout.addWidget(self.name_edit)
-        layout.addLayout(name_layout)
-
-        # 教师
-        teacher_layout = QHBoxLayout()
-        teacher_layout.addWidget(QLabel("教师姓名:"))
-        self.teacher_edit = QLineEdit()
-        teacher_layout.addWidget(self.teacher_edit)
-        layout.addLayout(teacher_layout)
-
-        # 教室
-        classroom_layout = QHBoxLayout()
-        classroom_layout.addWidget(QLabel("教室地点:"))
-        self.classroom_edit = QLineEdit()
-        classroom_layout.addWidget(self.classroom_edit)
-        layout.addLayout(classroom_layout)
-
-        # 星期几
-        day_layout = QHBoxLayout()
-        day_layout.addWidget(QLabel("星期几:"))
-        self.day_combo = QComboBox()
-        self.day_combo.addItems(self.day_names)
-        day_layout.addWidget(self.day_combo)
-        layout.addLayout(day_layout)
-
-        # 开始节次
-        start_layout = QHBoxLayout()
-        start_layout.addWidget(QLabel("开始节次:"))
-        self.start_spin = QSpinBox()
-        self.start_spin.setRange(1, config.MAX_DAILY_SECTIONS)
-        self.start_spin.setValue(1)
-        start_layout.addWidget(self.start_spin)
-        layout.addLayout(start_layout)
-
-        # 结束节次
-        end_layout = QHBoxLayout()
-        end_layout.addWidget(QLabel("结束节次:"))
-        self.end_spin = QSpinBox()
-        self.end_spin.setRange(1, config.MAX_DAILY_SECTIONS)
-        self.end_spin.setValue(1)
-        end_layout.addWidget(self.end_spin)
-        layout.addLayout(end_layout)
-
-        # 颜色选择
-        color_layout = QHBoxLayout()
-        color_layout.addWidget(QLabel("课程颜色:"))
-        self.color_button = QPushButton()
-        self.color_button.setFixedSize(30, 30)
-        self.color_button.setStyleSheet("background-color: #4CAF50")
-        self.color_button.clicked.connect(self.choose_color)
-        color_layout.addWidget(self.color_button)
-        layout.addLayout(color_layout)
-
-        # 提醒设置
-        reminder_layout = QHBoxLayout()
-        self.reminder_check = QPushButton("设置提醒")
-        self.reminder_check.setCheckable(True)
-        self.reminder_minutes = QSpinBox()
-        self.reminder_minutes.setRange(1, 60)
-        self.reminder_minutes.setValue(config.DEFAULT_REMINDER_MINUTES)
-        self.reminder_minutes.setEnabled(False)
-        self.reminder_check.clicked.connect(self.toggle_reminder)
-        reminder_layout.addWidget(self.reminder_check)
-        reminder_layout.addWidget(QLabel("提前"))
-        reminder_layout.addWidget(self.reminder_minutes)
-        reminder_layout.addWidget(QLabel("分钟"))
-        layout.addLayout(reminder_layout)
-
-        # 按钮
-        btn_layout = QHBoxLayout()
-        self.ok_btn = QPushButton("确定")
-        self.cancel_btn = QPushButton("取消")
-        self.ok_btn.clicked.connect(self.accept)
-        self.cancel_btn.clicked.connect(self.reject)
-        btn_layout.addWidget(self.ok_btn)
-        btn_layout.addWidget(self.cancel_btn)
-        layout.addLayout(btn_layout)
-
-        self.setLayout(layout)
-
-        # 如果是编辑模式，填充现有数据
-        if self.course:
-            self.name_edit.setText(self.course.name)
-            self.teacher_edit.setText(self.course.teacher)
-            self.classroom_edit.setText(self.course.classroom)
-            self.day_combo.setCurrentIndex(self.course.day)
-            self.start_spin.setValue(self.course.start_section)
-            self.end_spin.setValue(self.course.end_section)
-            self.color_button.setStyleSheet(f"background-color: {self.course.color}")
-            self.reminder_check.setChecked(self.course.reminder)
-            self.reminder_minutes.setValue(self.course.reminder_minutes)
-            self.reminder_minutes.setEnabled(self.course.reminder)
-
-        # 确保结束节次不小于开始节次
-        self.start_spin.valueChanged.connect(self.update_end_spin)
-
-    def update_end_spin(self):
-        """根据开始节次更新结束节次的可选范围。"""
-        start = self.start_spin.value()
-        if self.end_spin.value() < start:
-            self.end_spin.setValue(start)
-        self.end_spin.setMinimum(start)
-
-    def choose_color(self):
-        """打开颜色选择对话框，让用户选择课程颜色。"""
-        # 创建颜色对话框实例
-        color_dialog = QColorDialog(self)
-        
-        # 设置对话框标题为中文
-        color_dialog.setWindowTitle("选择课程颜色")
-        
-        # 尝试设置中文显示选项
-        color_dialog.setOptions(QColorDialog.ShowAlphaChannel | QColorDialog.DontUseNativeDialog)
-        
-        # 获取当前按钮的背景颜色作为初始颜色
-        current_color = QColor()
-        stylesheet = self.color_button.styleSheet()
-        if stylesheet.startswith("background-color:"):
-            color_name = stylesheet[len("background-color:"):].strip()
-            current_color = QColor(color_name)
-        
-        # 如果当前颜色有效，则设置为初始颜色
-        if current_color.isValid():
-            color_dialog.setCurrentColor(current_color)
-        
-        # 显示对话框并获取用户选择的颜色
-        if color_dialog.exec_() == QColorDialog.Accepted:
-            color = color_dialog.selectedColor()
-            if color.isValid():
-                self.color_button.setStyleSheet(f"background-color: {color.name()}")
-
-    def toggle_reminder(self):
-        """切换课程提醒功能的开关状态。"""
-        self.reminder_minutes.setEnabled(self.reminder_check.isChecked())
-
-    def get_course_data(self):
-        """获取用户在对话框中输入的课程数据，创建并返回课程对象。"""
-        course = Course(
-            self.name_edit.text(),
-            self.teacher_edit.text(),
-            self.classroom_edit.text(),
-            self.day_combo.currentIndex(),
-            self.start_spin.value(),
-            self.end_spin.value(),
-            self.color_button.styleSheet().split(':')[-1].strip()
-        )
-        course.reminder = self.reminder_check.isChecked()
-        course.reminder_minutes = self.reminder_minutes.value()
-        return course
-
-# 课程表单元格组件
-class ClassCell(QWidget):
-    def __init__(self, course=None, parent=None):
-        """初始化课程单元格组件。"""
-        super().__init__(parent)
-        self.course = course
-        self.init_ui()
-
-    def init_ui(self):
-        self.setAutoFillBackground(True)
-        layout = QVBoxLayout()
-        layout.setContentsMargins(2, 2, 2, 2)
-        
-        if self.course:
-            # 设置背景颜色
-            palette = self.palette()
-            palette.setColor(self.backgroundRole(), QColor(self.course.color))
-            self.setPalette(palette)
-            
-            # 添加课程信息
-            name_label = QLabel(self.course.name)
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            name_label.setWordWrap(True)
-            name_font = QFont()
-            name_font.setBold(True)
-            name_label.setFont(name_font)
-            
-            teacher_label = QLabel(f"{self.course.teacher}")
-            teacher_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            teacher_label.setWordWrap(True)
-            
-            classroom_label = QLabel(f"{self.course.classroom}")
-            classroom_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            classroom_label.setWordWrap(True)
-            
-            layout.addWidget(name_label)
-            layout.addWidget(teacher_label)
-            layout.addWidget(classroom_label)
-        
-        self.setLayout(layout)
-
-    def set_course(self, course):
-        """设置课程单元格显示的课程信息。"""
-        self.course = course
-        self.init_ui()
-
-# 课程表主窗口
-class ClassTableApp(QMainWindow):
-    def __init__(self):
-        """初始化课程表应用程序的主窗口。"""
-        super().__init__()
-        self.courses = []
-        self.day_names = ["周一", "周二", "周三", "周四", "周五"]
-        self.week_names = [f"第{i+1}周" for i in range(config.TOTAL_WEEKS)]
-        self.current_week = config.START_WEEK - 1
-        self.schedule_file = config.SCHEDULE_FILE_PATH
-        self.floating_window = None
-        self.tray_icon = None
-        self.init_ui()
-        self.load_schedule()
-        self.setup_reminders()
-        self.init_system_tray()
-
-    def init_ui(self):
-        self.setWindowTitle(f"{config.APP_NAME} - 版本 {config.VERSION}")
-        self.setGeometry(100, 100, config.MAIN_WINDOW_WIDTH, config.MAIN_WINDOW_HEIGHT)
-        
-        # 创建菜单栏
-        self.create_menu_bar()
-        
-        # 创建工具栏
-        self.create_tool_bar()
-        
-        # 创建状态栏
-        self.setStatusBar(QStatusBar())
-        self.statusBar().showMessage("欢迎使用智能课程表")
-        
-        # 创建中央部件
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        
-        main_layout = QVBoxLayout(central_widget)
-        
-        # 顶部控制区域
-        control_layout = QHBoxLayout()
-        
-        # 当前周显示和切换
-        week_layout = QHBoxLayout()
-        self.prev_week_btn = QPushButton("上一周")
-        self.prev_week_btn.clicked.connect(self.prev_week)
-        self.week_label = QLabel(f"当前周: {self.week_names[self.current_week]}")
-        self.next_week_btn = QPushButton("下一周")
-        self.next_week_btn.clicked.connect(self.next_week)
-        
-        week_layout.addWidget(self.prev_week_btn)
-        week_layout.addWidget(self.week_label)
-        week_layout.addWidget(self.next_week_btn)
-        
-        # 添加课程按钮
-        self.add_course_btn = QPushButton("添加课程")
-        self.add_course_btn.clicked.connect(self.add_course)
-        
-        # 日历组件
-        self.calendar = QCalendarWidget()
-        self.calendar.setMaximumHeight(200)
-        self.calendar.clicked[QDate].connect(self.on_date_selected)
-        
-        # 设置当前日期为选中状态
-        self.calendar.setSelectedDate(QDate.currentDate())
-        
-        # 将组件添加到控制布局
-        control_layout.addLayout(week_layout)
-        control_layout.addWidget(self.add_course_btn)
-        control_layout.addWidget(self.calendar)
-        control_layout.addStretch()
-        
-        main_layout.addLayout(control_layout)
-        
-        # 创建选项卡
-        self.tab_widget = QTabWidget()
-        
-        # 创建课程表视图
-        self.schedule_widget = QWidget()
-        self.schedule_layout = QGridLayout(self.schedule_widget)
-        self.tab_widget.addTab(self.schedule_widget, "课程表视图")
-        
-        # 创建课程列表视图
-        self.course_list_widget = QListWidget()
-        self.tab_widget.addTab(self.course_list_widget, "课程列表")
-        
-        # 创建统计视图
-        self.statistics_widget = QWidget()
-        self.statistics_layout = QVBoxLayout(self.statistics_widget)
-        self.tab_widget.addTab(self.statistics_widget, "课程统计")
-        
-        main_layout.addWidget(self.tab_widget)
-        
-        # 初始化课程表网格
-        self.init_schedule_grid()
-        
-        # 连接选项卡切换信号
-        self.tab_widget.currentChanged.connect(self.on_tab_changed)
-
-    def create_menu_bar(self):
-        """创建应用程序的菜单栏。"""
-        menubar = self.menuBar()
-        
-        # 文件菜单
-        file_menu = menubar.addMenu("文件")
-        
-        save_action = QAction("保存课程表", self)
-        save_action.triggered.connect(self.save_schedule)
-        file_menu.addAction(save_action)
-        
-        load_action = QAction("加载课程表", self)
-        load_action.triggered.connect(self.load_schedule)
-        file_menu.addAction(load_action)
-        
-        file_menu.addSeparator()
-        
-        import_action = QAction("导入课程表", self)
-        import_action.triggered.connect(self.import_schedule)
-        file_menu.addAction(import_action)
-        
-        export_action = QAction("导出课程表", self)
-        export_action.triggered.connect(self.export_schedule)
-        file_menu.addAction(export_action)
-        
-        file_menu.addSeparator()
-        
-        load_example_action = QAction("加载示例课程表", self)
-        load_example_action.triggered.connect(self.load_example_schedule)
-        file_menu.addAction(load_example_action)
-        
-        file_menu.addSeparator()
-        
-        print_action = QAction("打印课程表", self)
-        print_action.triggered.connect(self.print_schedule)
-        file_menu.addAction(print_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction("退出", self)
-        exit_action.triggered.connect(lambda: self.close())
-        file_menu.addAction(exit_action)
-        
-        # 编辑菜单
-        edit_menu = menubar.addMenu("编辑")
-        
-        add_action = QAction("添加课程", self)
-        add_action.triggered.connect(self.add_course)
-        edit_menu.addAction(add_action)
-        
-        edit_action = QAction("编辑课程", self)
-        edit_action.triggered.connect(self.edit_selected_course)
-        edit_menu.addAction(edit_action)
-        
-        delete_action = QAction("删除课程", self)
-        delete_action.triggered.connect(self.delete_selected_course)
-        edit_menu.addAction(delete_action)
-        
-        # 视图菜单
-        view_menu = menubar.addMenu("视图")
-        
-        for i, week_name in enumerate(self.week_names):
-            week_action = QAction(week_name, self)
-            week_action.setCheckable(True)
-            if i == self.current_week:
-                week_action.setChecked(True)
-            week_action.triggered.connect(lambda checked, idx=i: self.set_week(idx))
-            view_menu.addAction(week_action)
-        
-        # 帮助菜单
-        help_menu = menubar.addMenu("帮助")
-        
-        about_action = QAction("关于", self)
-        about_action.triggered.connect(self.show_about)
-        help_menu.addAction(about_action)
-        
-        update_log_action = QAction("更新日志", self)
-        update_log_action.triggered.connect(self.show_update_log)
-        help_menu.addAction(update_log_action)
-
-    def create_tool_bar(self):
-        """创建应用程序的工具栏。"""
-        toolbar = QToolBar("工具栏")
-        self.addToolBar(toolbar)
-        
-        add_action = QAction("添加课程", self)
-        add_action.triggered.connect(self.add_course)
-        toolbar.addAction(add_action)
-        
-        edit_action = QAction("编辑课程", self)
-        edit_action.triggered.connect(self.edit_selected_course)
-        toolbar.addAction(edit_action)
-        
-        delete_action = QAction("删除课程", self)
-        delete_action.triggered.connect(self.delete_selected_course)
-        toolbar.addAction(delete_action)
-        
-        toolbar.addSeparator()
-        
-        save_action = QAction("保存", self)
-        save_action.triggered.connect(self.save_schedule)
-        toolbar.addAction(save_action)
-        
-        load_action = QAction("加载", self)
-        load_action.triggered.connect(self.load_schedule)
-        toolbar.addAction(load_action)
-        
-        toolbar.addSeparator()
-        
-        # 搜索框
-        self.search_label = QLabel("搜索:")
-        toolbar.addWidget(self.search_label)
-        self.search_edit = QLineEdit()
-        self.search_edit.setPlaceholderText("按课程名、教师、教室搜索...")
-        self.search_edit.textChanged.connect(self.search_courses)
-        toolbar.addWidget(self.search_edit)
-        
-        # 默认隐藏搜索框
-        self.search_label.hide()
-        self.search_edit.hide()
-
-    def init_schedule_grid(self):
-        """初始化课程表网格布局。"""
-        # 清空现有内容
-        for i in reversed(range(self.schedule_layout.count())):
-            widget = self.schedule_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)  # 传入None移除父对象
-                widget.deleteLater()
-        
-        # 添加表头
-        header_font = QFont()
-        header_font.setBold(True)
-        
-        # 左上角空白
-        empty_label = QLabel("")
-        self.schedule_layout.addWidget(empty_label, 0, 0)
-        
-        # 星期表头
-        for day_idx, day_name in enumerate(self.day_names[:config.WEEKLY_CLASS_DAYS]):
-            day_label = QLabel(day_name)
-            day_label.setFont(header_font)
-            day_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            day_label.setStyleSheet("background-color: #f0f0f0; border: 1px solid #ccc;")
-            self.schedule_layout.addWidget(day_label, 0, day_idx + 1)
-        
-        # 节次和课程单元格
-        for section in range(1, config.MAX_DAILY_SECTIONS + 1):
-            # 节次标签
-            section_label = QLabel(f"第{section}节")
-            section_label.setFont(header_font)
-            section_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            section_label.setStyleSheet("background-color: #f0f0f0; border: 1px solid #ccc;")
-            self.schedule_layout.addWidget(section_label, section, 0)
-            
-            # 每天的课程单元格
-            for day_idx in range(config.WEEKLY_CLASS_DAYS):
-                # 查找是否有课程
-                course = None
-                for c in self.courses:
-                    if c.day == day_idx and c.start_section <= section <= c.end_section:
-                        # 只在开始节次创建课程单元格
-                        if section == c.start_section:
-                            course = c
-                        break
-                
-                if course:
-                    # 创建课程单元格并跨越多行
-                    cell = ClassCell(course)
-                    cell.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-                    cell.customContextMenuRequested.connect(lambda pos, c=course: self.show_course_context_menu(pos, c))
-                    # 为每个单元格创建独立的双击事件处理函数
-                    """创建课程单元格的双击事件处理函数。"""
-                    def create_double_click_handler(c):
-                        def double_click_event(event):
-                            self.edit_course(c)
-                        return double_click_event
-                    cell.mouseDoubleClickEvent = create_double_click_handler(course)
-                    rowspan = course.end_section - course.start_section + 1
-                    self.schedule_layout.addWidget(cell, section, day_idx + 1, rowspan, 1)
-
-    def update_course_list(self):
-        """更新课程列表视图。"""
-        self.course_list_widget.clear()
-        
-        # 获取搜索文本
-        search_text = self.search_edit.text().lower() if hasattr(self, 'search_edit') else ""
-        
-        for course in self.courses:
-            # 搜索过滤
-            if search_text and not (
-                search_text in course.name.lower() or 
-                search_text in course.teacher.lower() or 
-                search_text in course.classroom.lower()
-            ):
-                continue
-                
-            item = QListWidgetItem(f"{self.day_names[course.day]} {course.start_section}-{course.end_section}节: {course.name} - {course.teacher} ({course.classroom})")
-            item.setData(Qt.ItemDataRole.UserRole, course)
-            # 设置背景颜色
-            brush = QBrush(QColor(course.color))
-            item.setBackground(brush)
-            self.course_list_widget.addItem(item)
-        
-        # 连接双击事件
-        self.course_list_widget.itemDoubleClicked.connect(lambda item: self.edit_course(item.data(Qt.ItemDataRole.UserRole)))
-        # 设置右键菜单
-        self.course_list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.course_list_widget.customContextMenuRequested.connect(self.show_list_context_menu)
-
-    def add_course(self):
-        """添加新课程到课程表中。"""
-        dialog = AddCourseDialog(self, day_names=self.day_names)
-        if dialog.exec_():
-            course = dialog.get_course_data()
-            
-            # 检查课程冲突
-            if self.check_course_conflict(course):
-                reply = QMessageBox.question(
-                    self, "课程冲突", "该时间段已有课程安排，是否继续添加？",
-                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-                )
-                if reply == QMessageBox.No:
-                    return
-            
-            self.courses.append(course)
-            self.save_schedule()
-            self.update_ui()
-            self.statusBar().showMessage(f"已添加课程: {course.name}")
-
-    def edit_course(self, course):
-        """编辑选中的课程信息。"""
-        dialog = AddCourseDialog(self, course, self.day_names)
-        if dialog.exec_():
-            new_course = dialog.get_course_data()
-            
-            # 检查课程冲突（排除当前正在编辑的课程）
-            if self.check_course_conflict(new_course, exclude_id=course.id):
-                reply = QMessageBox.question(
-                    self, "课程冲突", "该时间段已有课程安排，是否继续修改？",
-                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-                )
-                if reply == QMessageBox.No:
-                    return
-            
-            # 替换课程
-            index = self.courses.index(course)
-            self.courses[index] = new_course
-            self.save_schedule()
-            self.update_ui()
-            self.statusBar().showMessage(f"已更新课程: {new_course.name}")
-
-    def delete_course(self, course):
-        """从课程表中删除选中的课程。"""
-        reply = QMessageBox.question(
-            self, "确认删除", f"确定要删除课程 '{course.name}' 吗？",
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        if reply == QMessageBox.Yes:
-            self.courses.remove(course)
-            self.save_schedule()
-            self.update_ui()
-            self.statusBar().showMessage(f"已删除课程: {course.name}")
-
-    def check_course_conflict(self, new_course, exclude_id=None):
-        """检查新课程是否与现有课程冲突。"""
-        """参数:
-            new_course: 要检查的新课程对象
-            exclude_id: 要排除的课程ID（用于编辑课程时）"""
-        for course in self.courses:
-            # 排除当前正在编辑的课程
-            if course.id == exclude_id:
-                continue
-            
-            # 检查是否在同一天
-            if course.day != new_course.day:
-                continue
-            
-            # 检查时间冲突
-            if not (new_course.end_section < course.start_section or new_course.start_section > course.end_section):
-                return True
-        return False
-
-    def show_course_context_menu(self, position, course):
-        """显示课程的右键菜单。"""
-        menu = QMenu()
-        edit_action = menu.addAction("编辑课程")
-        delete_action = menu.addAction("删除课程")
-        
-        action = menu.exec_(self.sender().mapToGlobal(position))
-        
-        if action == edit_action:
-            self.edit_course(course)
-        elif action == delete_action:
-            self.delete_course(course)
-
-    def show_list_context_menu(self, position):
-        """显示课程列表的右键菜单。"""
-        item = self.course_list_widget.itemAt(position)
-        if item:
-            course = item.data(Qt.ItemDataRole.UserRole)
-            menu = QMenu()
-            edit_action = menu.addAction("编辑课程")
-            delete_action = menu.addAction("删除课程")
-            
-            action = menu.exec_(self.course_list_widget.mapToGlobal(position))
-            
-            if action == edit_action:
-                self.edit_course(course)
-            elif action == delete_action:
-                self.delete_course(course)
-
-    def edit_selected_course(self):
-        """编辑选中的课程。"""
-        if self.tab_widget.currentIndex() == 0:  # 课程表视图
-            # 在课程表视图中，需要获取选中的单元格
-            # 这里简化处理，直接提示用户双击课程进行编辑
-            QMessageBox.information(self, "提示", "请在课程表视图中双击要编辑的课程，或在课程列表中选择要编辑的课程。")
-        else:  # 课程列表视图
-            selected_items = self.course_list_widget.selectedItems()
-            if selected_items:
-                course = selected_items[0].data(Qt.ItemDataRole.UserRole)
-                self.edit_course(course)
-            else:
-                QMessageBox.information(self, "提示", "请先选择要编辑的课程。")
-
-    def delete_selected_course(self):
-        """删除选中的课程。"""
-        if self.tab_widget.currentIndex() == 0:  # 课程表视图
-            QMessageBox.information(self, "提示", "请在课程表视图中右键点击要删除的课程，或在课程列表中选择要删除的课程。")
-        else:  # 课程列表视图
-            selected_items = self.course_list_widget.selectedItems()
-            if selected_items:
-                course = selected_items[0].data(Qt.ItemDataRole.UserRole)
-                self.delete_course(course)
-            else:
-                QMessageBox.information(self, "提示", "请先选择要删除的课程。")
-
-    def prev_week(self):
-        """切换到上一周的课程表。"""
-        if self.current_week > 0:
-            self.current_week -= 1
-            self.week_label.setText(f"当前周: {self.week_names[self.current_week]}")
-            self.update_ui()
-
-    def next_week(self):
-        """切换到下一周的课程表。"""
-        if self.current_week < len(self.week_names) - 1:
-            self.current_week += 1
-            self.week_label.setText(f"当前周: {self.week_names[self.current_week]}")
-            self.update_ui()
-
-    def set_week(self, week_idx):
-        """设置当前显示的周数。"""
-        if 0 <= week_idx < len(self.week_names):
-            self.current_week = week_idx
-            self.week_label.setText(f"当前周: {self.week_names[self.current_week]}")
-            self.update_ui()
-
-    def on_date_selected(self, date):
-        """当用户在日历中选择日期时的处理函数。"""
-        # 获取选中日期是星期几（周一=1，周二=2，...，周日=7）
-        day_of_week = date.dayOfWeek() - 1  # 转换为0-6
-        
-        if 0 <= day_of_week < len(self.day_names):  # 只处理周一到周五
-            # 这里可以添加跳转到对应日期的课程视图的功能
-            self.statusBar().showMessage(f"已选择 {date.toString('yyyy年MM月dd日')} {self.day_names[day_of_week]}")
-
-    def on_tab_changed(self, index):
-        """当用户切换选项卡时的处理函数。"""
-        if index == 1:  # 切换到课程列表视图
-            self.update_course_list()
-            # 显示搜索框
-            self.search_label.show()
-            self.search_edit.show()
-        else:  # 切换到其他视图
-            # 隐藏搜索框
-            self.search_label.hide()
-            self.search_edit.hide()
-            
-        if index == 2:  # 切换到统计视图
-            self.update_statistics()
-    
-    def search_courses(self):
-        """根据搜索文本过滤课程列表。"""
-        self.update_course_list()
-    
-    def import_schedule(self):
-        """导入课程表数据从JSON文件。"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "导入课程表", ".", "JSON Files (*.json);;All Files (*)"
-        )
-        
-        if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 清除当前课程
-                self.courses.clear()
-                
-                # 导入新课程
-                for course_data in data.get('courses', []):
-                    course = Course.from_dict(course_data)
-                    self.courses.append(course)
-                
-                # 更新视图
-                self.update_ui()
-                self.update_course_list()
-                
-                self.statusBar().showMessage(f"成功从 {file_path} 导入课程表")
-            except Exception as e:
-                QMessageBox.critical(self, "导入失败", f"导入课程表时发生错误: {str(e)}")
-    
-    def export_schedule(self):
-        """导出课程表数据到JSON文件。"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "导出课程表", ".", "JSON Files (*.json);;All Files (*)"
-        )
-        
-        if file_path:
-            try:
-                data = {
-                    'version': config.VERSION,
-                    'export_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'courses': [course.to_dict() for course in self.courses]
-                }
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                
-                self.statusBar().showMessage(f"成功导出课程表到 {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "导出失败", f"导出课程表时发生错误: {str(e)}")
-    
-    def update_statistics(self):
-        """更新课程统计信息。"""
-        # 清空统计视图
-        for i in reversed(range(self.statistics_layout.count())):
-            widget = self.statistics_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-        
-        # 计算统计数据
-        total_courses = len(self.courses)
-        
-        # 计算总学时（每节课按45分钟计算）
-        total_class_hours = 0
-        total_credits = 0
-        unique_courses = set()
-        
-        for course in self.courses:
-            # 计算课时
-            hours = (course.end_section - course.start_section + 1) * 0.75  # 45分钟/节课
-            total_class_hours += hours
-            
-            # 假设每门课有2学分
-            # 注意：这里我们根据课程名称去重，因为同一个课程可能在不同时间重复出现
-            course_key = f"{course.name}_{course.teacher}"
-            if course_key not in unique_courses:
-                unique_courses.add(course_key)
-                total_credits += getattr(course, 'credits', 2)  # 如果没有学分属性，默认为2
-        
-        avg_credits = total_credits / len(unique_courses) if unique_courses else 0
-        
-        # 创建统计信息标签
-        stats_group = QGroupBox("课程统计信息")
-        stats_layout = QVBoxLayout()
-        
-        # 添加统计项
-        stats_layout.addWidget(QLabel(f"总课程数: {total_courses}"))
-        stats_layout.addWidget(QLabel(f"独立课程数: {len(unique_courses)}"))
-        stats_layout.addWidget(QLabel(f"总学时: {total_class_hours:.1f} 小时"))
-        stats_layout.addWidget(QLabel(f"总学分: {total_credits:.1f}"))
-        stats_layout.addWidget(QLabel(f"平均学分: {avg_credits:.2f}"))
-        
-        # 添加更详细的统计
-        stats_layout.addSpacing(10)
-        stats_layout.addWidget(QLabel("课程分布:"))
-        
-        # 按星期统计课程数量
-        day_counts = {day: 0 for day in self.day_names}
-        for course in self.courses:
-            if 0 <= course.day < len(self.day_names):
-                day_name = self.day_names[course.day]
-                day_counts[day_name] += 1
-        
-        for day, count in day_counts.items():
-            stats_layout.addWidget(QLabel(f"{day}: {count} 门课程"))
-        
-        stats_group.setLayout(stats_layout)
-        self.statistics_layout.addWidget(stats_group)
-        
-        # 添加导出统计按钮
-        export_stats_btn = QPushButton("导出统计结果")
-        export_stats_btn.clicked.connect(self.export_statistics)
-        self.statistics_layout.addWidget(export_stats_btn)
-        
-        self.statistics_layout.addStretch()
-    
-    def export_statistics(self):
-        """导出课程统计结果。"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "导出统计结果", ".", "文本文件 (*.txt);;所有文件 (*)"
-        )
-        
-        if file_path:
-            try:
-                # 重新计算统计数据
-                total_courses = len(self.courses)
-                total_class_hours = 0
-                total_credits = 0
-                unique_courses = set()
-                
-                for course in self.courses:
-                    # 计算课时
-                    hours = (course.end_section - course.start_section + 1) * 0.75  # 45分钟/节课
-                    total_class_hours += hours
-                    
-                    # 统计独立课程和学分
-                    course_key = f"{course.name}_{course.teacher}"
-                    if course_key not in unique_courses:
-                        unique_courses.add(course_key)
-                        total_credits += getattr(course, 'credits', 2)
-                
-                avg_credits = total_credits / len(unique_courses) if unique_courses else 0
-                
-                # 按星期统计
-                day_counts = {day: 0 for day in self.day_names}
-                for course in self.courses:
-                    if 0 <= course.day < len(self.day_names):
-                        day_name = self.day_names[course.day]
-                        day_counts[day_name] += 1
-                
-                # 写入文件
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"课程表统计结果\n")
-                    f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"软件版本: {config.VERSION}\n")
-                    f.write("="*40 + "\n\n")
-                    
-                    f.write(f"总课程数: {total_courses}\n")
-                    f.write(f"独立课程数: {len(unique_courses)}\n")
-                    f.write(f"总学时: {total_class_hours:.1f} 小时\n")
-                    f.write(f"总学分: {total_credits:.1f}\n")
-                    f.write(f"平均学分: {avg_credits:.2f}\n\n")
-                    
-                    f.write("按星期分布:\n")
-                    for day, count in day_counts.items():
-                        f.write(f"{day}: {count} 门课程\n")
-                
-                self.statusBar().showMessage(f"成功导出统计结果到 {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "导出失败", f"导出统计结果时发生错误: {str(e)}")
-
-    def update_ui(self):
-        """更新用户界面，刷新课程表显示和课程列表。"""
-        self.init_schedule_grid()
-        if self.tab_widget.currentIndex() == 1:
-            self.update_course_list()
-
-    def save_schedule(self):
-        """保存当前课程表数据到文件中。"""
-        try:
-            with open(self.schedule_file, 'w', encoding='utf-8') as f:
-                json.dump([course.to_dict() for course in self.courses], f, ensure_ascii=False, indent=2)
-            self.statusBar().showMessage("课程表已保存")
-        except Exception as e:
-            QMessageBox.critical(self, "保存失败", f"无法保存课程表: {str(e)}")
-
-    def load_schedule(self):
-        """从文件加载课程表数据。"""
-        try:
-            if os.path.exists(self.schedule_file):
-                with open(self.schedule_file, 'r', encoding='utf-8') as f:
-                    courses_data = json.load(f)
-                    self.courses = [Course.from_dict(data) for data in courses_data]
-                self.update_ui()
-                self.statusBar().showMessage("课程表已加载")
-        except Exception as e:
-            QMessageBox.critical(self, "加载失败", f"无法加载课程表: {str(e)}")
-
-    def load_example_schedule(self):
-        """加载示例课程表数据，将覆盖当前所有课程。"""
-        reply = QMessageBox.question(
-            self, "确认加载示例", 
-            "加载示例课程表将覆盖当前的所有课程，确定要继续吗？",
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        if reply == QMessageBox.Yes:
-            try:
-                if os.path.exists(config.EXAMPLE_SCHEDULE_FILE_PATH):
-                    with open(config.EXAMPLE_SCHEDULE_FILE_PATH, 'r', encoding='utf-8') as f:
-                        courses_data = json.load(f)
-                        self.courses = [Course.from_dict(data) for data in courses_data]
-                    self.update_ui()
-                    self.statusBar().showMessage("示例课程表已加载")
-                else:
-                    QMessageBox.warning(self, "文件不存在", f"示例课程表文件不存在: {config.EXAMPLE_SCHEDULE_FILE_PATH}")
-            except Exception as e:
-                QMessageBox.critical(self, "加载失败", f"无法加载示例课程表: {str(e)}")
-
-    def print_schedule(self):
-        """打印当前课程表。"""
-        printer = QPrinter(QPrinter.HighResolution)
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec_() == QPrintDialog.Accepted:
-            # 创建打印预览对话框
-            preview_dialog = QPrintPreviewDialog(printer, self)
-            preview_dialog.paintRequested.connect(lambda p: self.print_document(p))
-            preview_dialog.exec_()
-            
-    def print_document(self, printer):
-        """绘制要打印的文档内容。"""
-        painter = QPainter(printer)
-        paper_rect = printer.pageRect()
-        
-        # 添加边距，确保内容不紧贴页面边缘
-        margin = 20
-        content_rect = QRectF(
-            paper_rect.left() + margin,
-            paper_rect.top() + margin,
-            paper_rect.width() - 2 * margin,
-            paper_rect.height() - 2 * margin
-        )
-        
-        # 设置字体
-        font = QFont(config.DEFAULT_FONT)
-        font.setPointSize(12)
-        painter.setFont(font)
-        
-        # 绘制标题
-        title = f"{config.APP_NAME} - {self.week_names[self.current_week]}"
-        title_rect = QRectF(content_rect)
-        title_rect.setHeight(40)
-        painter.drawText(title_rect, Qt.AlignmentFlag.AlignCenter, title)
-        
-        # 绘制日期
-        date_str = QDate.currentDate().toString("yyyy年MM月dd日")
-        date_rect = QRectF(content_rect)
-        date_rect.setTop(content_rect.top() + 40)
-        date_rect.setHeight(20)
-        painter.drawText(date_rect, Qt.AlignmentFlag.AlignCenter, date_str)
-        
-        # 创建课程表网格
-        table_rect = QRectF(content_rect)
-        table_rect.setTop(content_rect.top() + 70)
-        table_rect.setBottom(content_rect.bottom() - 30)
-        
-        # 计算单元格大小
-        cell_width = table_rect.width() / (config.WEEKLY_CLASS_DAYS + 1)
-        cell_height = table_rect.height() / (config.MAX_DAILY_SECTIONS + 1)
-        
-        # 绘制表头和网格
-        # 左上角空白
-        header_font = QFont(config.DEFAULT_FONT)
-        header_font.setBold(True)
-        painter.setFont(header_font)
-        
-        # 星期表头
-        for day_idx, day_name in enumerate(self.day_names[:config.WEEKLY_CLASS_DAYS]):
-            rect = QRectF(table_rect.left() + cell_width * (day_idx + 1), table_rect.top(), cell_width, cell_height)
-            painter.drawRect(rect)
-            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, day_name)
-        
-        # 节次和课程单元格
-        normal_font = QFont(config.DEFAULT_FONT)
-        normal_font.setPointSize(50)  # 增大字体大小以提高可读性
-        painter.setFont(normal_font)
-        
-        for section in range(1, config.MAX_DAILY_SECTIONS + 1):
-            # 节次标签
-            painter.setFont(header_font)
-            rect = QRectF(table_rect.left(), table_rect.top() + cell_height * section, cell_width, cell_height)
-            painter.drawRect(rect)
-            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, f"第{section}节")
-            painter.setFont(normal_font)
-            
-            # 每天的课程单元格
-            for day_idx in range(config.WEEKLY_CLASS_DAYS):
-                # 查找是否有课程
-                course = None
-                for c in self.courses:
-                    if c.day == day_idx and c.start_section <= section <= c.end_section:
-                        # 只在开始节次创建课程单元格
-                        if section == c.start_section:
-                            course = c
-                        break
-                
-                rect = QRectF(table_rect.left() + cell_width * (day_idx + 1), table_rect.top() + cell_height * section, cell_width, cell_height)
-                painter.drawRect(rect)
-                
-                if course:
-                    # 计算课程单元格的实际大小
-                    rowspan = course.end_section - course.start_section + 1
-                    course_rect = QRectF(
-                        table_rect.left() + cell_width * (day_idx + 1), 
-                        table_rect.top() + cell_height * section, 
-                        cell_width, 
-                        cell_height * rowspan
-                    )
-                    
-                    # 绘制课程背景
-                    painter.save()
-                    painter.setBrush(QBrush(QColor(course.color)))
-                    painter.setOpacity(0.7)
-                    painter.drawRect(course_rect)
-                    painter.restore()
-                    
-                    # 绘制课程信息
-                    text_rect = course_rect.adjusted(5, 5, -5, -5)
-                    text_options = QTextOption()
-                    text_options.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    
-                    # 设置文本宽度
-                    document = QTextDocument()
-                    document.setPageSize(QSizeF(text_rect.width(), 0))
-                    document.setDefaultFont(normal_font)
-                    document.setHtml(f"<div style='text-align: center;'>{course.name}<br>{course.teacher}<br>{course.classroom}</div>")
-                    
-                    # 保存当前画家状态并移动到正确位置
-                    painter.save()
-                    painter.translate(text_rect.topLeft())
-                    document.drawContents(painter)
-                    painter.restore()
-                    
-                    # 绘制课程边框
-                    painter.drawRect(course_rect)
-        
-        # 绘制页脚
-        footer_font = QFont(config.DEFAULT_FONT)
-        footer_font.setPointSize(8)
-        painter.setFont(footer_font)
-        footer_rect = QRectF(paper_rect)
-        footer_rect.setTop(paper_rect.bottom() - 30)
-        footer_rect.setHeight(20)
-        painter.drawText(footer_rect, Qt.AlignmentFlag.AlignRight, f"{config.APP_NAME} 版本 {config.VERSION}")
-        
-        painter.end()
-        
-    def setup_reminders(self):
-        """设置课程提醒定时器，每分钟检查一次是否有即将开始的课程。"""
-        # 设置定时器，每分钟检查一次是否有即将开始的课程
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_reminders)
-        self.timer.start(60000)  # 60000毫秒 = 1分钟
-
-    def check_reminders(self):
-        """检查是否有即将开始的课程，如果有则显示提醒。"""
-        now = datetime.now()
-        
-        for course in self.courses:
-            if course.reminder and config.ENABLE_POPUP_REMINDER:
-                # 计算课程开始时间（假设课程从早上8点开始，每节课45分钟，课间休息10分钟）
-                # 这里使用简化的时间计算，实际应用中可以根据学校的作息时间表进行调整
-                try:
-                    start_time = datetime(now.year, now.month, now.day, 8, 0)
-                    start_time += timedelta(minutes=(course.start_section - 1) * 55)  # 45分钟课程 + 10分钟休息
-                except Exception as e:
-                    # 如果时间计算出错，跳过本次提醒
-                    continue
-                
-                # 计算提前提醒的时间
-                reminder_time = start_time - timedelta(minutes=course.reminder_minutes)
-                
-                # 检查是否需要提醒
-                if now >= reminder_time and now < start_time:
-                    # 计算剩余时间
-                    remaining_minutes = int((start_time - now).total_seconds() / 60)
-                    
-                    # 显示提醒
-                    QMessageBox.information(
-                        self, "课程提醒",
-                        f"{course.name} 将在 {remaining_minutes} 分钟后开始！\n"+
-                        f"教师: {course.teacher}\n"+
-                        f"教室: {course.classroom}\n"+
-                        f"时间: {start_time.strftime('%H:%M')}"
-                    )
-                    
-                    # 如果启用了声音提醒，可以在这里添加播放声音的代码
-                    if config.ENABLE_SOUND_REMINDER:
-                        pass  # 实际应用中可以添加播放提示音的代码
-
-    def show_about(self):
-        """显示关于对话框，包含软件版本、作者等信息。"""
-        QMessageBox.about(
-            self, "关于智能课程表",
-            f"{config.APP_NAME} v{config.VERSION}\n\n"+
-            "一个美观、功能多样的课程表管理软件\n\n"+
-            "功能特点:\n"+
-            "- 可视化课程表视图\n"+
-            "- 课程列表管理\n"+
-            "- 课程添加、编辑、删除\n"+
-            "- 课程冲突检查\n"+
-            "- 自定义课程颜色\n"+
-            "- 课程提醒功能\n"+
-            "- 多周课程表支持\n"+
-            "- 课程表保存与加载\n"+
-            "- 系统托盘支持\n"+
-            "- 悬浮课程表功能\n"+
-            "联系我们:qzrobotboar@gmail.com\n"+
-            f"作者: {config.AUTHOR}\n"+
-            f"版本: {config.VERSION}\n"+
-            f"日期: {config.RELEASE_DATE}"
-        )
-    
-    def show_update_log(self):
-        """显示更新日志对话框。"""
-        update_log_dialog = UpdateLogDialog(self)
-        update_log_dialog.exec_()
-        
-    def init_system_tray(self):
-        """初始化系统托盘图标和相关功能。"""
-        if not QSystemTrayIcon.isSystemTrayAvailable():
-            QMessageBox.information(self, "提示", "您的系统不支持系统托盘功能")
-            return
-        
-        self.tray_icon = QSystemTrayIcon(self)
-        
-        # 创建一个简单的图标（使用文字作为图标）
-        pixmap = QPixmap(32, 32)
-        pixmap.fill(QColor(76, 175, 80))  # 使用绿色背景
-        painter = QPainter(pixmap)
-        painter.setPen(Qt.white)
-        painter.setFont(QFont("SimHei", 12, QFont.Bold))
-        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "课")
-        painter.end()
-        self.tray_icon.setIcon(QIcon(pixmap))
-        
-        self.tray_icon.setToolTip("智能课程表")
-        
-        # 创建托盘菜单
-        tray_menu = QMenu()
-        
-        # 显示主窗口动作
-        show_action = tray_menu.addAction("显示主窗口")
-        show_action.triggered.connect(self.show_main_window)
-        
-        # 显示悬浮课程表动作
-        float_action = tray_menu.addAction("显示悬浮课程表")
-        float_action.triggered.connect(self.toggle_floating_window)
-        
-        # 退出动作
-        tray_menu.addSeparator()
-        quit_action = tray_menu.addAction("退出")
-        quit_action.triggered.connect(self.quit_application)
-        
-        self.tray_icon.setContextMenu(tray_menu)
-        self.tray_icon.activated.connect(self.on_tray_icon_activated)
-        self.tray_icon.show()
-        
-    def on_tray_icon_activated(self, reason):
-        """当系统托盘图标被点击时的处理函数。"""
-        if reason == QSystemTrayIcon.ActivationReason.Trigger:  # 单击
-            self.toggle_floating_window()
-        elif reason == QSystemTrayIcon.ActivationReason.DoubleClick:  # 双击
-            self.show_main_window()
-            
-    def show_main_window(self):
-        """显示主窗口。"""
-        self.showNormal()
-        self.activateWindow()
-        
-    def toggle_floating_window(self):
-        """切换悬浮窗口的显示/隐藏状态。"""
-        if self.floating_window is None:
-            self.create_floating_window()
-        else:
-            self.close_floating_window()
-            
-    def create_floating_window(self):
-        """创建悬浮窗口。"""
-        if hasattr(self, 'courses'):
-            self.floating_window = FloatingScheduleWindow(self.courses, self.day_names)
-            self.floating_window.closed.connect(self.on_floating_window_closed)
-            self.floating_window.show()
-            self.statusBar().showMessage("已显示悬浮课程表")
-            
-    def close_floating_window(self):
-        """关闭悬浮窗口。"""
-        if self.floating_window:
-            self.floating_window.close()
-            self.floating_window = None
-            self.statusBar().showMessage("已关闭悬浮课程表")
-            
-    def on_floating_window_closed(self):
-        """当悬浮窗口关闭时的处理函数。"""
-        self.floating_window = None
-        
-    def quit_application(self):
-        """退出应用程序。"""
-        if self.floating_window:
-            self.floating_window.close()
-        QApplication.quit()
-        
-    def closeEvent(self, event):
-        """当主窗口关闭时的事件处理函数。"""
-        if self.tray_icon and self.tray_icon.isVisible():
-            # 询问用户是最小化到托盘还是退出
-            reply = QMessageBox.question(
-                self, "退出确认",
-                "确定要退出智能课程表吗？\n选择'否'将最小化到系统托盘。",
-                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-            )
-            
-            if reply == QMessageBox.No:
-                self.hide()
-                event.ignore()
-                self.statusBar().showMessage("应用程序已最小化到系统托盘")
-            else:
-                if self.floating_window:
-                    self.floating_window.close()
-                event.accept()
-        else:
-            if self.floating_window:
-                self.floating_window.close()
-            event.accept()
-
-# 启动画面类
-class SplashScreen(QWidget):
-    def __init__(self):
-        """初始化启动画面。"""
-        super().__init__()
-        self.setWindowFlags(Qt.SplashScreen | Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
-        self.setFixedSize(config.SPLASH_SCREEN_WIDTH, config.SPLASH_SCREEN_HEIGHT)
-        self.setStyleSheet(f"background-color: {config.PRIMARY_COLOR};")
-        self.init_ui()
-        
-    def init_ui(self):
-        layout = QVBoxLayout()
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # 软件标题
-        title_label = QLabel(config.APP_NAME)
-        title_label.setFont(QFont(config.DEFAULT_FONT, config.TITLE_FONT_SIZE, QFont.Bold))
-        title_label.setStyleSheet("color: white;")
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # 版本号
-        version_label = QLabel(f"版本: {config.VERSION}")
-        version_label.setFont(QFont(config.DEFAULT_FONT, config.HEADER_FONT_SIZE))
-        version_label.setStyleSheet("color: white;")
-        version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # 日期
-        date_label = QLabel(f"日期: {config.RELEASE_DATE}")
-        date_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE))
-        date_label.setStyleSheet("color: white;")
-        date_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        layout.addWidget(title_label)
-        layout.addWidget(version_label)
-        layout.addWidget(date_label)
-        
-        self.setLayout(layout)
-        # 居中显示
-        self.move(QApplication.desktop().screen().rect().center() - self.rect().center())
-
-# 更新日志对话框类
-class UpdateLogDialog(QDialog):
-    def __init__(self, parent=None):
-        """初始化更新日志对话框。"""
-        super().__init__(parent)
-        self.setWindowTitle("更新日志")
-        self.resize(600, 400)
-        self.init_ui()
-        
-    def init_ui(self):
-        """初始化更新日志对话框的用户界面。"""
-        layout = QVBoxLayout(self)
-        
-        # 创建滚动区域
-        scroll_area = QWidget()
-        scroll_area.setStyleSheet(f"background-color: {config.BACKGROUND_COLOR};")
-        scroll_layout = QVBoxLayout(scroll_area)
-        scroll_layout.setContentsMargins(20, 20, 20, 20)
-        
-        # 添加标题
-        title_label = QLabel(f"{config.APP_NAME} 更新日志")
-        title_label.setFont(QFont(config.DEFAULT_FONT, config.HEADER_FONT_SIZE, QFont.Bold))
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title_label.setStyleSheet(f"color: {config.PRIMARY_COLOR};")
-        scroll_layout.addWidget(title_label)
-        
-        scroll_layout.addSpacing(20)
-        
-        # 遍历更新日志，按版本号降序排列
-        versions = sorted(config.UPDATE_LOGS.keys(), key=lambda x: [int(part) for part in x.split('.')], reverse=True)
-        
-        # 标记是否已经添加了当前版本
-        current_version_added = False
-        
-        # 添加所有版本的更新日志
-        for version in versions:
-            log_info = config.UPDATE_LOGS[version]
-            
-            # 版本标签
-            version_label = QLabel(f"版本 {version} ({log_info['date']})")
-            
-            if version == config.VERSION and not current_version_added:
-                # 当前版本样式
-                version_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE + 2, QFont.Bold))
-                version_label.setStyleSheet(f"color: {config.SECONDARY_COLOR};")
-                
-                # 添加历史版本标题（仅在第一次添加非当前版本时）
-                current_version_added = True
-                
-                # 历史版本标题
-                history_label_added = False
-            else:
-                # 历史版本样式
-                version_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE, QFont.Bold))
-                
-                # 第一次添加历史版本时，添加历史版本标题
-                if not history_label_added:
-                    scroll_layout.addSpacing(30)
-                    history_version_label = QLabel("历史版本更新日志")
-                    history_version_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE + 2, QFont.Bold))
-                    history_version_label.setStyleSheet(f"color: {config.SECONDARY_COLOR};")
-                    scroll_layout.addWidget(history_version_label)
-                    history_label_added = True
-                
-                # 添加版本间距
-                scroll_layout.addSpacing(20)
-            
-            scroll_layout.addWidget(version_label)
-            
-            # 更新日志内容
-            log_text = QLabel(log_info['content'].strip())
-            log_text.setWordWrap(True)
-            log_text.setStyleSheet(f"color: {config.TEXT_COLOR};")
-            scroll_layout.addWidget(log_text)
-        
-        scroll_layout.addStretch()
-        
-        # 创建滚动区域并添加到主布局
-        scroll_area_widget = QScrollArea()
-        scroll_area_widget.setWidgetResizable(True)
-        scroll_area_widget.setWidget(scroll_area)
-        layout.addWidget(scroll_area_widget)
-        
-        # 添加关闭按钮
-        button_layout = QHBoxLayout()
-        close_button = QPushButton("关闭")
-        close_button.clicked.connect(self.accept)
-        button_layout.addWidget(close_button)
-        
-        layout.addLayout(button_layout)
-
-# 主函数
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")  # 使用Fusion风格，提供更现代的界面
-    
-    # 设置中文显示
-    import locale
-    locale.setlocale(locale.LC_ALL, 'zh_CN.UTF-8')
-    
-    # 设置Qt应用程序的语言环境
-    from PyQt5.QtCore import QLocale
-    QLocale.setDefault(QLocale(QLocale.Chinese, QLocale.China))
-    
-    # 显示启动画面
-    splash = SplashScreen()
-    splash.show()
-    
-    # 等待1秒钟后隐藏启动画面
-    app.processEvents()
-    QTimer.singleShot(1000, splash.close)
-    
-    # 设置全局字体
-    font = QFont(config.DEFAULT_FONT, config.FONT_SIZE)
-    app.setFont(font)
-    
-    # 设置应用程序样式表，使界面更美观
-    app.setStyleSheet(f"""QMainWindow {{background-color: {config.BACKGROUND_COLOR};}}
-        QPushButton {{background-color: {config.PRIMARY_COLOR}; color: white; border-radius: 4px; padding: 6px;}}
-        QPushButton:hover {{background-color: {config.SECONDARY_COLOR};}}
-        QTabWidget::pane {{border: 1px solid #ccc; background-color: white;}}
-        QTabBar::tab {{background-color: #f0f0f0; border: 1px solid #ccc; padding: 8px;}}
-        QTabBar::tab:selected {{background-color: white; border-bottom-color: white;}}
-        QCalendarWidget {{background-color: white;}}
-        QStatusBar {{background-color: #f0f0f0;}}
-        * {{color: {config.TEXT_COLOR};}}
-    """)
-    
-    # 创建并显示主窗口
-    window = ClassTableApp()
-    QTimer.singleShot(1000, window.show)
-    
+import sys
+import argparse
+import bisect
+import json
+import codecs
+import csv
+import heapq
+import io
+import itertools
+import logging
+import logging.handlers
+import math
+import os
+import queue
+import random
+import string
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+try:
+    import numpy as np
+except ImportError:  # 课程分析功能需要NumPy，未安装时不可用
+    np = None
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QDialog, QLineEdit, QComboBox, QSpinBox, QColorDialog,QMessageBox, QCalendarWidget, QTabWidget, QInputDialog, QListView,QMenu, QProgressDialog, QAction, QToolBar, QStatusBar, QSystemTrayIcon, QScrollArea, QGroupBox, QFileDialog, QTableView, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QStyledItemDelegate, QStyle
+from PyQt5.QtGui import QGuiApplication, QFont, QFontInfo, QColor, QIcon, QImage, QPainter, QPaintEngine, QBrush, QPixmap, QPageSize, QPdfWriter, QStaticText, QTextOption, QTransform
+from PyQt5.QtCore import Qt, QObject, QAbstractTableModel, QAbstractListModel, QSortFilterProxyModel, QModelIndex, QPointF, QSize, QSizeF, QDate, QTime, QTimer, pyqtSignal, QRectF
+from PyQt5.QtPrintSupport import QPrinter, QPrintPreviewDialog
+
+# 导入配置信息
+import config
+
+# 应用程序日志记录器
+logger = logging.getLogger("classtable")
+
+# 课程表显示的星期名称
+DAY_NAMES = ["周一", "周二", "周三", "周四", "周五"]
+
+# 日志限流过滤器类
+class RateLimitFilter(logging.Filter):
+    """限制同类日志每秒的写入条数，超出部分只计数，并在下一条放行的日志中注明省略条数。"""
+    # 只有带rate_limit_key属性（通过extra传入）的日志参与限流
+
+    def __init__(self, rate=config.LOG_RATE_LIMIT_PER_SECOND):
+        """初始化日志限流过滤器。"""
+        super().__init__()
+        self.rate = rate
+        self._windows = {}  # 限流键 -> [时间窗口, 已放行条数, 已省略条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'rate_limit_key', None)
+        if key is None:
+            return True
+        window = int(time.monotonic())
+        with self._lock:
+            state = self._windows.setdefault(key, [window, 0, 0])
+            if state[0] != window:
+                state[0], state[1] = window, 0
+            if state[1] >= self.rate:
+                state[2] += 1
+                return False
+            state[1] += 1
+            dropped, state[2] = state[2], 0
+        if dropped:
+            record.msg = f"{record.msg}（此前省略了 {dropped} 条同类日志）"
+        return True
+
+def setup_logging(log_file=config.LOG_FILE_PATH, level=config.LOG_LEVEL):
+    """配置应用程序日志：日志先进入队列，由后台线程写入日志文件，记录日志时不阻塞在文件I/O上。"""
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # 在入队前限流，被省略的日志不占用队列和写入线程
+    queue_handler.addFilter(RateLimitFilter())
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+# 悬浮课程表窗口类
+class FloatingScheduleWindow(QWidget):
+    closed = pyqtSignal()  # 定义关闭信号
+    
+    def __init__(self, courses, day_names, parent=None):
+        """初始化悬浮课程表窗口，courses为CourseStore，课程变化时只刷新今天的课程列表。"""
+        super().__init__(parent)
+        self.courses = courses
+        self.day_names = day_names
+        self.setWindowTitle("悬浮课程表")
+        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.Window)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.resize(config.FLOATING_WINDOW_WIDTH, config.FLOATING_WINDOW_HEIGHT + 100)  # 增加高度以容纳时间信息
+        
+        # 今天的课程时间线，日期变化或课程变化时重新计算
+        self._timeline = []  # 按上课时间排序的（上课分钟, 下课分钟, 课程）
+        self._timeline_date = None
+        self._cursor = 0  # 时间线中第一门还没下课的课程
+        self._cursor_minute = 0
+        self._shown_texts = None  # 标签上当前显示的文字
+        
+        # 今天的课程列表，按课程ID原地更新对应的课程项
+        self._list_date = None  # 课程列表显示的日期，过了午夜自动切换到新的一天
+        self._items = {}  # 课程ID -> 课程项
+        self._item_keys = []  # 按（开始节次, 课程ID）排序，与布局中课程项的顺序一致
+        
+        # 设置定时器，每分钟开始时更新一次时间信息
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.update_time_info)
+        
+        self.init_ui()
+        
+        # 订阅课程变化通知
+        self.subscribe_course_changes(True)
+        
+    def init_ui(self):
+        """初始化悬浮窗口的用户界面。"""
+        layout = QVBoxLayout()
+        layout.setContentsMargins(10, 10, 10, 10)
+        
+        # 创建时间信息区域
+        time_info_widget = QWidget()
+        time_info_widget.setStyleSheet("background-color: rgba(255, 255, 255, 220); border-radius: 8px; padding: 10px;")
+        time_info_layout = QVBoxLayout(time_info_widget)
+        
+        # 当前时间显示 - 增大字体并增强对比度
+        self.current_time_label = QLabel("加载中...")
+        self.current_time_label.setFont(QFont("SimHei", 16, QFont.Bold))
+        self.current_time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.current_time_label.setStyleSheet("color: #000000;")
+        time_info_layout.addWidget(self.current_time_label)
+        
+        # 倒计时信息显示 - 增大字体并增强对比度
+        self.countdown_label = QLabel("加载中...")
+        self.countdown_label.setFont(QFont("SimHei", 14, QFont.Bold))
+        self.countdown_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.countdown_label.setStyleSheet("color: #000000;")
+        time_info_layout.addWidget(self.countdown_label)
+        
+        # 下节课信息显示 - 增大字体并增强对比度
+        self.next_course_label = QLabel("加载中...")
+        self.next_course_label.setFont(QFont("SimHei", 12))
+        self.next_course_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.next_course_label.setStyleSheet("color: #000000;")
+        self.next_course_label.setWordWrap(True)  # 启用自动换行
+        time_info_layout.addWidget(self.next_course_label)
+        
+        # 添加时间信息区域到主布局
+        layout.addWidget(time_info_widget)
+        
+        # 创建今天的课程标题，文字在显示课程列表时设置
+        self.today_label = QLabel()
+        self.today_label.setFont(QFont("SimHei", 12, QFont.Bold))
+        self.today_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.today_label)
+        
+        # 没有课程时的提示信息
+        self.no_course_label = QLabel("今天没有课程")
+        self.no_course_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.no_course_label.setStyleSheet("color: #666;")
+        layout.addWidget(self.no_course_label)
+        
+        # 创建课程列表
+        self.course_layout = QVBoxLayout()
+        self.course_layout.setSpacing(5)
+        self.show_day(datetime.now().date())
+        
+        layout.addLayout(self.course_layout)
+        self.setLayout(layout)
+        
+        # 初始化时立即更新一次时间信息
+        self.update_time_info()
+        
+    def show_day(self, date):
+        """切换到指定日期，更新标题并重新创建这一天的课程列表。"""
+        self._list_date = date
+        weekday = date.weekday()  # 0=周一, 6=周日
+        if 0 <= weekday < len(self.day_names):
+            self.today_label.setText(f"{self.day_names[weekday]}的课程")
+        else:
+            # 对于周六和周日，使用通用标题
+            week_day_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+            self.today_label.setText(f"{week_day_names[weekday]}的课程")
+        self.populate_today_courses()
+        
+    def populate_today_courses(self):
+        """重新创建今天的课程列表。"""
+        for item in self._items.values():
+            self.course_layout.removeWidget(item)
+            item.deleteLater()
+        self._items = {}
+        self._item_keys = []
+        
+        # 过滤今天的课程并按时间排序
+        today = self._list_date.weekday()
+        for course in sorted((c for c in self.courses if c.day == today), key=lambda c: c.start_section):
+            self.insert_course_item(course)
+        self.no_course_label.setVisible(not self._items)
+    
+    def create_course_item(self):
+        """创建一个空的课程项，文字和颜色由update_course_item设置。"""
+        course_item = QWidget()
+        course_item_layout = QVBoxLayout(course_item)
+        course_item_layout.setContentsMargins(5, 5, 5, 5)
+        
+        course_item.name_label = QLabel()
+        course_item.name_label.setFont(render_resources.font("SimHei", 10, bold=True))
+        course_item.name_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        
+        course_item.info_label = QLabel()
+        course_item.info_label.setFont(render_resources.font("SimHei", 9))
+        course_item.info_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        
+        course_item_layout.addWidget(course_item.name_label)
+        course_item_layout.addWidget(course_item.info_label)
+        return course_item
+    
+    def update_course_item(self, course_item, course):
+        """把课程信息写入课程项。"""
+        course_item.setStyleSheet(f"background-color: {course.color}80; border-radius: 5px; padding: 5px;")
+        course_item.name_label.setText(f"{course.start_section}-{course.end_section}节: {course.name}")
+        course_item.info_label.setText(f"{course.teacher} | {course.classroom}")
+    
+    def insert_course_item(self, course, course_item=None):
+        """按开始节次把课程项插入到课程列表中的对应位置，course_item为空时新建。"""
+        if course_item is None:
+            course_item = self.create_course_item()
+        self.update_course_item(course_item, course)
+        key = (course.start_section, course.id)
+        position = bisect.bisect_left(self._item_keys, key)
+        self._item_keys.insert(position, key)
+        course_item.sort_key = key
+        self._items[course.id] = course_item
+        self.course_layout.insertWidget(position, course_item)
+    
+    def take_course_item(self, course):
+        """从课程列表中取出课程对应的课程项，课程不在列表中时返回None。"""
+        course_item = self._items.pop(course.id, None)
+        if course_item is not None:
+            self._item_keys.remove(course_item.sort_key)
+            self.course_layout.removeWidget(course_item)
+        return course_item
+    
+    def subscribe_course_changes(self, subscribe):
+        """订阅或取消订阅课程数据容器的变化通知。"""
+        if subscribe == getattr(self, '_subscribed', False):
+            return
+        self._subscribed = subscribe
+        handlers = [
+            (self.courses.course_added, self.on_course_added),
+            (self.courses.course_changed, self.on_course_changed),
+            (self.courses.course_removed, self.on_course_removed),
+            (self.courses.courses_reset, self.on_courses_reset),
+        ]
+        for signal, handler in handlers:
+            if subscribe:
+                signal.connect(handler)
+            else:
+                signal.disconnect(handler)
+    
+    def on_course_added(self, course):
+        """新增的课程在今天时插入对应的课程项并刷新时间线。"""
+        if course.day == self._list_date.weekday():
+            self.insert_course_item(course)
+            self.no_course_label.setVisible(False)
+            self.invalidate_timeline()
+    
+    def on_course_changed(self, old_course, new_course):
+        """修改前或修改后的课程在今天时原地更新、移动、插入或删除对应的课程项。"""
+        today = self._list_date.weekday()
+        if old_course.day != today and new_course.day != today:
+            return
+        course_item = self.take_course_item(old_course) if old_course.day == today else None
+        if new_course.day == today:
+            self.insert_course_item(new_course, course_item)
+        elif course_item is not None:
+            course_item.deleteLater()
+        self.no_course_label.setVisible(not self._items)
+        self.invalidate_timeline()
+    
+    def on_course_removed(self, course):
+        """删除的课程在今天时删除对应的课程项并刷新时间线。"""
+        course_item = self.take_course_item(course)
+        if course_item is not None:
+            course_item.deleteLater()
+            self.no_course_label.setVisible(not self._items)
+            self.invalidate_timeline()
+    
+    def on_courses_reset(self):
+        """全部课程被替换时刷新课程列表和时间线。"""
+        self.populate_today_courses()
+        self.invalidate_timeline()
+    
+    def build_today_timeline(self, today):
+        """预先计算指定日期按上课时间排序的（上课分钟, 下课分钟, 课程）时间线。"""
+        day = today.weekday()
+        timeline = [
+            bell_schedule.section_range(course.start_section, course.end_section, day) + (course,)
+            for course in self.courses if course.day == day
+        ]
+        timeline.sort(key=lambda entry: entry[0])
+        self._timeline = timeline
+        self._timeline_date = today
+        self._cursor = 0
+        self._cursor_minute = 0
+    
+    def invalidate_timeline(self):
+        """课程变化后丢弃时间线，并立即更新时间信息。"""
+        self._timeline_date = None
+        self.update_time_info()
+        
+    def mousePressEvent(self, event):
+        # 记录鼠标按下的位置，用于窗口拖动
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
+            event.accept()
+    
+    def mouseMoveEvent(self, event):
+        # 拖动窗口
+        if event.buttons() == Qt.MouseButton.LeftButton:
+            self.move(event.globalPos() - self.drag_position)
+            event.accept()
+    
+    def mouseDoubleClickEvent(self, event):
+        # 双击关闭窗口
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.close()
+    
+    def update_time_info(self):
+        """更新时间信息，包括当前时间、倒计时和下节课信息，只在显示的文字变化时修改标签。"""
+        now = datetime.now()
+        current_time_str = now.strftime("%Y年%m月%d日 %H:%M")
+        try:
+            # 过了午夜时切换到新一天的课程列表，日期变化时重新计算今天的时间线
+            if self._list_date != now.date():
+                self.show_day(now.date())
+            if self._timeline_date != now.date():
+                self.build_today_timeline(now.date())
+            
+            # 时间线游标只向后移动，跳过已经下课的课程；系统时间被调回时从头开始
+            minute_of_day = now.hour * 60 + now.minute + now.second / 60
+            if minute_of_day < self._cursor_minute:
+                self._cursor = 0
+            self._cursor_minute = minute_of_day
+            timeline = self._timeline
+            while self._cursor < len(timeline) and timeline[self._cursor][1] <= minute_of_day:
+                self._cursor += 1
+            
+            next_course_text = ""
+            if self._cursor == len(timeline):
+                # 没有当前课程也没有下节课
+                countdown_text = "今天没有课程了"
+            else:
+                start_minute, end_minute, course = timeline[self._cursor]
+                if start_minute <= minute_of_day:
+                    # 计算离下课还有多长时间
+                    countdown_text = f"离下课还有: {int(end_minute - minute_of_day)} 分钟"
+                else:
+                    # 计算离下节课还有多长时间
+                    countdown_text = f"离下节课还有: {int(start_minute - minute_of_day)} 分钟"
+                    next_course_text = f"下节课: {course.name} ({course.teacher})"
+            texts = (current_time_str, countdown_text, next_course_text)
+        except Exception as e:
+            # 错误处理，确保界面不会空白
+            texts = (current_time_str, "加载课程信息失败", "请检查课程数据")
+        
+        if texts != self._shown_texts:
+            self._shown_texts = texts
+            labels = (self.current_time_label, self.countdown_label, self.next_course_label)
+            for label, text in zip(labels, texts):
+                label.setText(text)
+        
+        # 在下一分钟开始时再更新，多等50毫秒避免定时器提前触发
+        elapsed_ms = now.second * 1000 + now.microsecond // 1000
+        self.timer.start(60000 - elapsed_ms + 50)
+        
+    def closeEvent(self, event):
+        """当悬浮窗口关闭时发送关闭信号。"""
+        # 停止定时器
+        self.timer.stop()
+        # 取消订阅课程变化通知
+        self.subscribe_course_changes(False)
+        # 发送关闭信号
+        self.closed.emit()
+        event.accept()
+
+# 课程类
+class Course:
+    # 使用__slots__去掉每个实例的__dict__，大批量加载课程时显著减少内存占用
+    __slots__ = ('name', 'teacher', 'classroom', 'day', 'start_section', 'end_section',
+                 'color', 'reminder', 'reminder_minutes', 'weeks', 'id')
+
+    # 上课周次类型：每周、单周、双周
+    WEEK_ALL = 0
+    WEEK_ODD = 1
+    WEEK_EVEN = 2
+    WEEK_PATTERN_NAMES = ["每周", "单周", "双周"]
+
+    # 覆盖全部周次的位图，第i位对应第i+1周
+    ALL_WEEKS = (1 << config.TOTAL_WEEKS) - 1
+
+    def __init__(self, name="", teacher="", classroom="", day=0, start_section=1, end_section=1, color="#4CAF50", course_id=None):
+        """初始化课程对象，未提供ID时生成随机ID。"""
+        # 课程名称、教师、教室和颜色在大课表中大量重复，驻留后同值字符串只保存一份
+        # 文件中的null或非字符串值先转换为字符串，避免驻留时出错
+        self.name = sys.intern(str(name or ""))
+        self.teacher = sys.intern(str(teacher or ""))
+        self.classroom = sys.intern(str(classroom or ""))
+        self.day = day  # 0-4 对应周一到周五
+        self.start_section = start_section
+        self.end_section = end_section
+        self.color = sys.intern(str(color or "#4CAF50"))
+        self.reminder = False  # 是否设置提醒
+        self.reminder_minutes = config.DEFAULT_REMINDER_MINUTES  # 提前多少分钟提醒
+        self.weeks = Course.ALL_WEEKS  # 上课周次位图，默认每周都上课
+        if course_id:
+            self.id = course_id  # 唯一标识符
+        else:
+            self.id = Course.generate_id()
+            # 大批量创建课程时调试日志会被限流
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("创建新课程，生成的随机ID: %s", self.id, extra={'rate_limit_key': 'course_created'})
+
+    @staticmethod
+    def generate_id():
+        """生成随机ID：8位字母数字组合。"""
+        return ''.join(random.choices(string.ascii_letters + string.digits, k=8))
+
+    @staticmethod
+    def make_week_mask(start_week, end_week, pattern=0):
+        """根据起止周（从1开始）和单双周类型生成上课周次位图。"""
+        mask = 0
+        for week in range(max(start_week, 1), min(end_week, config.TOTAL_WEEKS) + 1):
+            if pattern == Course.WEEK_ODD and week % 2 == 0:
+                continue
+            if pattern == Course.WEEK_EVEN and week % 2 == 1:
+                continue
+            mask |= 1 << (week - 1)
+        return mask
+
+    @property
+    def active_weeks(self):
+        """返回本学期范围内的上课周次位图。
+        
+        weeks中保留文件里的原始位图，总周数改小时超出的周次只是不生效，不会被丢弃。
+        """
+        return self.weeks & Course.ALL_WEEKS
+
+    def week_range(self):
+        """返回课程的起始周、结束周（从1开始）和单双周类型。"""
+        weeks = self.active_weeks
+        if not weeks:
+            return 1, config.TOTAL_WEEKS, Course.WEEK_ALL
+        start_week = (weeks & -weeks).bit_length()
+        end_week = weeks.bit_length()
+        for pattern in (Course.WEEK_ODD, Course.WEEK_EVEN):
+            if weeks == Course.make_week_mask(start_week, end_week, pattern):
+                return start_week, end_week, pattern
+        return start_week, end_week, Course.WEEK_ALL
+
+    def is_week_range(self):
+        """检查上课周次能否用起止周和单双周类型完整表示。"""
+        return self.active_weeks == Course.make_week_mask(*self.week_range())
+
+    def in_week(self, week_idx):
+        """检查课程在指定周（从0开始）是否上课。"""
+        return 0 <= week_idx < config.TOTAL_WEEKS and bool(self.weeks >> week_idx & 1)
+
+    def weeks_text(self):
+        """返回课程上课周次的文字描述，例如“第1-16周(单周)”或“第1-3,5,8周”。"""
+        if not self.is_week_range():
+            # 不连续的周次逐段列出
+            parts = []
+            weeks = [week + 1 for week in range(config.TOTAL_WEEKS) if self.in_week(week)]
+            for _, group in itertools.groupby(enumerate(weeks), lambda item: item[1] - item[0]):
+                group = [week for _, week in group]
+                parts.append(str(group[0]) if len(group) == 1 else f"{group[0]}-{group[-1]}")
+            return f"第{','.join(parts)}周"
+        start_week, end_week, pattern = self.week_range()
+        text = f"第{start_week}-{end_week}周"
+        if pattern != Course.WEEK_ALL:
+            text += f"({Course.WEEK_PATTERN_NAMES[pattern]})"
+        return text
+
+    def to_dict(self):
+        """将课程对象转换为字典格式，用于保存到文件。"""
+        return {
+            'name': self.name,
+            'teacher': self.teacher,
+            'classroom': self.classroom,
+            'day': self.day,
+            'start_section': self.start_section,
+            'end_section': self.end_section,
+            'color': self.color,
+            'reminder': self.reminder,
+            'reminder_minutes': self.reminder_minutes,
+            'weeks': self.weeks,
+            'id': self.id
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """从字典数据创建课程对象，用于从文件加载。"""
+        course = cls(
+            data['name'],
+            data['teacher'],
+            data['classroom'],
+            data['day'],
+            data['start_section'],
+            data['end_section'],
+            data['color'],
+            # 如果提供了ID则使用，否则生成随机ID
+            data.get('id')
+        )
+        course.reminder = data.get('reminder', False)
+        course.reminder_minutes = data.get('reminder_minutes', config.DEFAULT_REMINDER_MINUTES)
+        weeks = data.get('weeks')
+        course.weeks = Course.ALL_WEEKS if weeks is None else int(weeks)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("从字典加载课程，ID: %s", course.id, extra={'rate_limit_key': 'course_loaded'})
+        return course
+
+# 课程占用索引类
+class ScheduleIndex:
+    """按星期和节次维护的课程占用索引，用于冲突检查和课程表网格的快速查找。"""
+
+    # 索引覆盖一周七天，超出课程表显示范围的课程也能参与冲突检查
+    DAYS_PER_WEEK = 7
+
+    def __init__(self, sections=config.MAX_DAILY_SECTIONS):
+        """初始化课程占用索引。"""
+        self.sections = sections
+        self.clear()
+
+    def clear(self):
+        """清空索引中的所有课程。"""
+        # cells[day][section] 保存占用该格子的课程ID列表，按加入顺序排列
+        self.cells = [[[] for _ in range(self.sections + 1)] for _ in range(self.DAYS_PER_WEEK)]
+        # 每天的占用位图，第n位为1表示第n节有课
+        self.day_bits = [0] * self.DAYS_PER_WEEK
+        self.courses = {}
+
+    def rebuild(self, courses):
+        """根据课程列表重新构建索引。"""
+        self.clear()
+        for course in courses:
+            self.add(course)
+
+    def _section_range(self, course):
+        """返回课程在索引范围内占用的节次。"""
+        start = max(course.start_section, 1)
+        end = min(course.end_section, self.sections)
+        return range(start, end + 1)
+
+    def _span_bits(self, course):
+        """返回课程在索引范围内占用节次的位图，节次范围为空时返回0。"""
+        sections = self._section_range(course)
+        if not sections:
+            return 0
+        return ((1 << len(sections)) - 1) << sections.start
+
+    def add(self, course):
+        """将课程加入索引。"""
+        if not 0 <= course.day < self.DAYS_PER_WEEK:
+            return
+        self.courses[course.id] = course
+        day_cells = self.cells[course.day]
+        for section in self._section_range(course):
+            day_cells[section].append(course.id)
+            self.day_bits[course.day] |= 1 << section
+
+    def remove(self, course):
+        """将课程从索引中移除。"""
+        if self.courses.pop(course.id, None) is None:
+            return
+        day_cells = self.cells[course.day]
+        for section in self._section_range(course):
+            cell = day_cells[section]
+            if course.id in cell:
+                cell.remove(course.id)
+            if not cell:
+                self.day_bits[course.day] &= ~(1 << section)
+
+    def course_at(self, day, section, week=None):
+        """返回指定周从该格子开始的课程，该格子未被占用或不是课程的开始节次时返回None。"""
+        if not (0 <= day < self.DAYS_PER_WEEK and 1 <= section <= self.sections):
+            return None
+        # 与网格显示保持一致：格子由该周最先加入的课程占用
+        for course_id in self.cells[day][section]:
+            course = self.courses[course_id]
+            if week is None or course.in_week(week):
+                return course if course.start_section == section else None
+        return None
+
+    def has_conflict(self, course, exclude_id=None):
+        """检查课程是否与索引中的课程时间冲突。"""
+        if not 0 <= course.day < self.DAYS_PER_WEEK:
+            return False
+        if not self.day_bits[course.day] & self._span_bits(course):
+            return False
+        day_cells = self.cells[course.day]
+        for section in self._section_range(course):
+            for course_id in day_cells[section]:
+                # 上课周次不重叠的课程（如单双周交替）不算冲突
+                if course_id != exclude_id and self.courses[course_id].active_weeks & course.active_weeks:
+                    return True
+        return False
+
+# 课程搜索索引类
+class SearchIndex:
+    """课程名称、教师和教室的n-gram倒排索引，按字符切分，适用于中文名称的子串搜索。"""
+
+    # 索引的n-gram长度，查询不超过该长度时直接命中倒排表
+    MAX_GRAM = 3
+
+    def __init__(self):
+        """初始化搜索索引。"""
+        self.clear()
+
+    def clear(self):
+        """清空索引中的所有课程。"""
+        self.postings = {}  # n-gram -> 课程ID集合
+        self.texts = {}  # 课程ID -> 小写的（名称, 教师, 教室）
+
+    @staticmethod
+    def course_texts(course):
+        """返回课程参与搜索的小写字段。"""
+        return (course.name.lower(), course.teacher.lower(), course.classroom.lower())
+
+    @classmethod
+    def grams(cls, texts):
+        """返回各字段中长度为1到MAX_GRAM的所有子串，n-gram不跨越字段。"""
+        grams = set()
+        for text in texts:
+            for n in range(1, cls.MAX_GRAM + 1):
+                for i in range(len(text) - n + 1):
+                    grams.add(text[i:i + n])
+        return grams
+
+    def add(self, course):
+        """将课程加入索引。"""
+        texts = self.course_texts(course)
+        self.texts[course.id] = texts
+        for gram in self.grams(texts):
+            self.postings.setdefault(gram, set()).add(course.id)
+
+    def remove(self, course):
+        """将课程从索引中移除。"""
+        texts = self.texts.pop(course.id, None)
+        if texts is None:
+            return
+        for gram in self.grams(texts):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(course.id)
+                if not ids:
+                    del self.postings[gram]
+
+    def search(self, search_text):
+        """返回名称、教师或教室包含搜索文本的课程ID集合。"""
+        search_text = search_text.lower()
+        if not search_text:
+            return set(self.texts)
+        if len(search_text) <= self.MAX_GRAM:
+            return set(self.postings.get(search_text, ()))
+        # 较长的查询先求各n-gram倒排表的交集，从最短的倒排表开始，再逐个确认子串匹配
+        n = self.MAX_GRAM
+        posting_lists = sorted(
+            (self.postings.get(search_text[i:i + n], ()) for i in range(len(search_text) - n + 1)),
+            key=len
+        )
+        candidates = set(posting_lists[0])
+        for ids in posting_lists[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+        return {
+            course_id for course_id in candidates
+            if any(search_text in text for text in self.texts[course_id])
+        }
+
+# 汉字拼音表缓存，首次使用时从随程序发布的拼音表文件加载
+_pinyin_table = None
+
+def load_pinyin_table(file_path=config.PINYIN_TABLE_PATH):
+    """返回汉字到无声调拼音的映射表，拼音表文件缺失时返回空表。"""
+    global _pinyin_table
+    if _pinyin_table is None:
+        _pinyin_table = {}
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                # 文件按拼音分组保存：拼音 -> 该读音的所有汉字
+                for syllable, characters in json.load(f).items():
+                    for character in characters:
+                        _pinyin_table.setdefault(character, syllable)
+        except (OSError, ValueError) as e:
+            logger.warning("加载拼音表失败，拼音搜索不可用: %s", e)
+    return _pinyin_table
+
+def bounded_substring_distance(pattern, text, max_distance):
+    """返回pattern与text中任意子串的最小编辑距离，超过max_distance时返回None。"""
+    # 近似子串匹配：首行全为0，匹配可以从text的任意位置开始
+    previous = list(range(len(pattern) + 1))
+    best = previous[-1]
+    for character in text:
+        current = [0]
+        for i, pattern_character in enumerate(pattern, 1):
+            current.append(min(
+                previous[i] + 1,
+                current[i - 1] + 1,
+                previous[i - 1] + (pattern_character != character)
+            ))
+        best = min(best, current[-1])
+        previous = current
+    return best if best <= max_distance else None
+
+# 拼音和模糊搜索索引类
+class PhoneticIndex:
+    """预计算课程名称、教师和教室的拼音全拼及首字母，支持拼音、首字母和容错的模糊搜索。
+    
+    大课表中的名称、教师和教室大量重复，索引按不同的字段文本保存拼音键，每个文本只匹配一次，
+    再把分数分给使用该文本的课程；模糊匹配只针对课程名称和教师。
+    """
+
+    # 搜索结果的排序分数，越小越靠前
+    SCORE_TEXT = 0  # 原文包含搜索文本
+    SCORE_PREFIX = 1  # 全拼或首字母以搜索文本开头
+    SCORE_PINYIN = 2  # 全拼或首字母包含搜索文本
+    SCORE_FUZZY = 3  # 模糊匹配，分数再加上编辑距离
+
+    def __init__(self, pinyin_table=None, max_results=config.FUZZY_SEARCH_MAX_RESULTS):
+        """初始化拼音搜索索引。"""
+        self.pinyin_table = load_pinyin_table() if pinyin_table is None else pinyin_table
+        self.max_results = max_results
+        self.clear()
+
+    def clear(self):
+        """清空索引中的所有课程。"""
+        self.courses = {}  # 课程ID -> 该课程的（名称, 教师, 教室）
+        # (字段文本, 是否参与模糊匹配) -> 使用该文本的课程ID集合
+        self.entries = {}
+        self.keys = {}  # 字段文本 -> （小写原文, 全拼, 首字母）
+        self.bigrams = {}  # 参与模糊匹配的拼音键中的二元组 -> 字段文本集合，用于筛选候选文本
+
+    def pinyin_keys(self, text):
+        """返回文本的全拼和首字母，非汉字字符原样保留。"""
+        full = []
+        initials = []
+        for character in text.lower():
+            if character.isspace():
+                continue
+            syllable = self.pinyin_table.get(character, character)
+            full.append(syllable)
+            initials.append(syllable[0])
+        return ''.join(full), ''.join(initials)
+
+    def text_keys(self, text):
+        """返回字段文本参与拼音搜索的键：小写原文、全拼和首字母。"""
+        return (text.lower(),) + self.pinyin_keys(text)
+
+    @staticmethod
+    def course_fields(course):
+        """返回课程的（字段文本, 是否参与模糊匹配），教室只按原文和拼音匹配。"""
+        return ((course.name, True), (course.teacher, True), (course.classroom, False))
+
+    @staticmethod
+    def key_bigrams(keys):
+        """返回各个键中的所有二元组。"""
+        return {key[i:i + 2] for key in keys for i in range(len(key) - 1)}
+
+    def add(self, course):
+        """将课程加入索引。"""
+        self.courses[course.id] = (course.name, course.teacher, course.classroom)
+        for entry in self.course_fields(course):
+            ids = self.entries.get(entry)
+            if ids is None:
+                ids = self.entries[entry] = set()
+                text, fuzzy = entry
+                keys = self.keys.get(text)
+                if keys is None:
+                    keys = self.keys[text] = self.text_keys(text)
+                if fuzzy:
+                    for bigram in self.key_bigrams(keys):
+                        self.bigrams.setdefault(bigram, set()).add(text)
+            ids.add(course.id)
+
+    def remove(self, course):
+        """将课程从索引中移除。"""
+        fields = self.courses.pop(course.id, None)
+        if fields is None:
+            return
+        name, teacher, classroom = fields
+        for entry in ((name, True), (teacher, True), (classroom, False)):
+            ids = self.entries.get(entry)
+            if ids is None:
+                continue
+            ids.discard(course.id)
+            if ids:
+                continue
+            del self.entries[entry]
+            text, fuzzy = entry
+            if fuzzy:
+                for bigram in self.key_bigrams(self.keys[text]):
+                    texts = self.bigrams.get(bigram)
+                    if texts is not None:
+                        texts.discard(text)
+                        if not texts:
+                            del self.bigrams[bigram]
+            if (text, not fuzzy) not in self.entries:
+                del self.keys[text]
+
+    @staticmethod
+    def max_distance(search_text):
+        """返回搜索文本允许的最大编辑距离，短文本不做容错。"""
+        return min(config.FUZZY_SEARCH_MAX_DISTANCE, len(search_text) // 3)
+
+    def text_score(self, keys, search_text):
+        """返回字段文本与搜索文本的原文或拼音匹配分数，不匹配时返回None。"""
+        text, full, initials = keys
+        if search_text in text:
+            return self.SCORE_TEXT
+        if full.startswith(search_text) or initials.startswith(search_text):
+            return self.SCORE_PREFIX
+        if search_text in full or search_text in initials:
+            return self.SCORE_PINYIN
+        return None
+
+    def fuzzy_score(self, keys, search_text, max_distance):
+        """返回字段文本与搜索文本的模糊匹配分数，不匹配时返回None。"""
+        distances = [
+            distance for distance in (
+                bounded_substring_distance(search_text, key, max_distance) for key in keys
+            ) if distance is not None
+        ]
+        return self.SCORE_FUZZY + min(distances) if distances else None
+
+    def score(self, course_id, search_text, max_distance=None):
+        """返回课程与搜索文本的匹配分数，不匹配时返回None。"""
+        fields = self.courses.get(course_id)
+        if fields is None or not search_text:
+            return None
+        scores = [self.text_score(self.keys[text], search_text) for text in fields]
+        scores = [score for score in scores if score is not None]
+        if scores:
+            return min(scores)
+        if max_distance is None:
+            max_distance = self.max_distance(search_text)
+        if not max_distance:
+            return None
+        scores = [self.fuzzy_score(self.keys[text], search_text, max_distance) for text in fields[:2]]
+        scores = [score for score in scores if score is not None]
+        return min(scores) if scores else None
+
+    def candidates(self, search_text, max_distance):
+        """按二元组筛选可能模糊匹配的字段文本，共有的二元组多的排在前面：每处编辑最多破坏两个二元组。"""
+        bigrams = {search_text[i:i + 2] for i in range(len(search_text) - 1)}
+        # 去重后的二元组数量可能少于len-1，阈值按相同比例放宽
+        required = len(bigrams) - 2 * max_distance
+        counts = Counter()
+        for bigram in bigrams:
+            counts.update(self.bigrams.get(bigram, ()))
+        if required <= 0:
+            # 过短的搜索文本无法用二元组筛选，只考虑至少共有一个二元组的文本
+            required = 1
+        return [text for text, count in counts.most_common() if count >= required]
+
+    def search(self, search_text):
+        """返回匹配课程的ID到排序分数的映射，模糊匹配的课程最多补足到max_results门。"""
+        search_text = ''.join(search_text.lower().split())
+        if not search_text:
+            return {}
+        scores = {}
+        # 每个不同的字段文本只匹配一次
+        for (text, _), ids in self.entries.items():
+            score = self.text_score(self.keys[text], search_text)
+            if score is not None:
+                for course_id in ids:
+                    if scores.get(course_id, score + 1) > score:
+                        scores[course_id] = score
+        # 原文和拼音匹配的课程已经足够多时不再做模糊匹配
+        max_distance = self.max_distance(search_text)
+        if not max_distance or len(scores) >= self.max_results:
+            return scores
+        # 模糊匹配从共有二元组最多的文本开始，达到数量上限后停止
+        for text in self.candidates(search_text, max_distance):
+            ids = [course_id for course_id in self.entries.get((text, True), ()) if course_id not in scores]
+            if not ids:
+                continue
+            score = self.fuzzy_score(self.keys[text], search_text, max_distance)
+            if score is None:
+                continue
+            for course_id in ids[:self.max_results - len(scores)]:
+                scores[course_id] = score
+            if len(scores) >= self.max_results:
+                break
+        return scores
+
+# 课程统计聚合类
+class StatisticsAggregator:
+    """随课程增删改增量维护的统计数据：独立课程、学分、学时以及按星期和节次的分布。"""
+
+    # 每节课的学时（45分钟/节课）
+    HOURS_PER_SECTION = 0.75
+    # 没有学分信息的课程默认为2学分
+    DEFAULT_CREDITS = 2
+
+    def __init__(self):
+        """初始化课程统计聚合器。"""
+        self.clear()
+
+    def clear(self):
+        """清空所有统计数据。"""
+        self.total_courses = 0
+        self.total_sections = 0
+        self.total_credits = 0
+        # 同一门课可能在不同时间重复出现，按（名称, 教师）计数去重
+        self.unique_keys = Counter()
+        self.key_credits = {}  # （名称, 教师） -> 该课程的学分
+        self.day_counts = Counter()  # 星期 -> 课程数
+        self.section_counts = Counter()  # 节次 -> 占用该节次的课程数
+
+    def add(self, course):
+        """将课程计入统计。"""
+        key = (course.name, course.teacher)
+        if not self.unique_keys[key]:
+            credits = getattr(course, 'credits', self.DEFAULT_CREDITS)
+            self.key_credits[key] = credits
+            self.total_credits += credits
+        self.unique_keys[key] += 1
+        self.total_courses += 1
+        self.total_sections += course.end_section - course.start_section + 1
+        self.day_counts[course.day] += 1
+        for section in range(course.start_section, course.end_section + 1):
+            self.section_counts[section] += 1
+
+    def remove(self, course):
+        """将课程从统计中扣除。"""
+        key = (course.name, course.teacher)
+        self.unique_keys[key] -= 1
+        if not self.unique_keys[key]:
+            del self.unique_keys[key]
+            self.total_credits -= self.key_credits.pop(key)
+        self.total_courses -= 1
+        self.total_sections -= course.end_section - course.start_section + 1
+        self.day_counts[course.day] -= 1
+        for section in range(course.start_section, course.end_section + 1):
+            self.section_counts[section] -= 1
+
+    @property
+    def unique_courses(self):
+        """独立课程数。"""
+        return len(self.unique_keys)
+
+    @property
+    def total_class_hours(self):
+        """总学时。"""
+        return self.total_sections * self.HOURS_PER_SECTION
+
+    @property
+    def average_credits(self):
+        """平均每门独立课程的学分。"""
+        return self.total_credits / self.unique_courses if self.unique_courses else 0
+
+    def report_lines(self, day_names):
+        """返回统计结果的文本行，统计视图和导出文件共用。"""
+        lines = [
+            f"总课程数: {self.total_courses}",
+            f"独立课程数: {self.unique_courses}",
+            f"总学时: {self.total_class_hours:.1f} 小时",
+            f"总学分: {self.total_credits:.1f}",
+            f"平均学分: {self.average_credits:.2f}",
+            "",
+            "按星期分布:",
+        ]
+        for day_idx, day in enumerate(day_names):
+            lines.append(f"{day}: {self.day_counts[day_idx]} 门课程")
+        lines.append("")
+        lines.append("按节次分布:")
+        for section in range(1, config.MAX_DAILY_SECTIONS + 1):
+            lines.append(f"第{section}节: {self.section_counts[section]} 门课程")
+        return lines
+
+# 课程分析类
+class CourseAnalytics:
+    """用NumPy数组维护的课程分析：教师每周课时负荷、教室在星期×节次×周次上的利用率和高峰时段，随课程增删增量更新。"""
+
+    def __init__(self, courses=(), days=ScheduleIndex.DAYS_PER_WEEK, sections=config.MAX_DAILY_SECTIONS,
+                 weeks=config.TOTAL_WEEKS, class_days=config.WEEKLY_CLASS_DAYS):
+        """初始化课程分析并加入给定的课程，需要安装NumPy。"""
+        if np is None:
+            raise RuntimeError("课程分析需要安装NumPy")
+        self.days = days
+        self.sections = sections
+        self.weeks = weeks
+        self.class_days = class_days
+        self.clear()
+        self.add_all(courses)
+
+    def clear(self):
+        """清空所有分析数据。"""
+        # 教师和教室按首次出现的顺序编号，数组的行数按需成倍扩大
+        self._teacher_codes = {}
+        self._teacher_names = []
+        self._teacher_courses = []  # 编号 -> 课程数，为0的教师不显示
+        self._classroom_codes = {}
+        self._classroom_names = []
+        self._classroom_courses = []
+        # 教师每周的课时（节数）：_teacher_load[t, w]
+        self._teacher_load = np.zeros((0, self.weeks), dtype=np.int64)
+        # 每个教室在星期×节次×周次上同时安排的课程数：_occupancy[r, d, s, w]
+        self._occupancy = np.zeros((0, self.days, self.sections, self.weeks), dtype=np.int32)
+        # 每个星期×节次×周次同时上课的课程数，包括没有填写教室的课程
+        self._concurrency = np.zeros((self.days, self.sections, self.weeks), dtype=np.int32)
+
+    @staticmethod
+    def _code(name, codes, names, counts):
+        """返回名称的编号，新名称分配新的编号。"""
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+            counts.append(0)
+        return code
+
+    @staticmethod
+    def _reserve(array, rows):
+        """保证数组至少有rows行，不够时成倍扩大。"""
+        if rows <= len(array):
+            return array
+        grown = np.zeros((max(rows, 2 * len(array), 8),) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _week_bits(self, week_masks):
+        """把上课周次位图展开为（课程数, 周数）的0/1矩阵。"""
+        size = max(1, (self.weeks + 7) // 8, (Course.ALL_WEEKS.bit_length() + 7) // 8)
+        data = b"".join(weeks.to_bytes(size, 'little') for weeks in week_masks)
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(-1, size), axis=1, bitorder='little')
+        return bits[:, :self.weeks].astype(np.int64)
+
+    @staticmethod
+    def _group_sum(keys, values):
+        """按keys分组对values的第一维求和，返回（不同的键, 各组的和）。"""
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return keys[starts], np.add.reduceat(values[order], starts, axis=0)
+
+    def _codes(self, names, codes, names_list, counts):
+        """返回每个名称的编号数组，只对不同的名称按首次出现的顺序分配编号，并累加各编号的课程数。"""
+        unique_names, first_index, inverse, unique_counts = np.unique(
+            names, return_index=True, return_inverse=True, return_counts=True)
+        unique_codes = np.zeros(len(unique_names), dtype=np.int64)
+        for position in np.argsort(first_index).tolist():
+            code = self._code(unique_names[position], codes, names_list, counts)
+            unique_codes[position] = code
+            counts[code] += int(unique_counts[position])
+        return unique_codes[inverse.reshape(-1)]
+
+    def add_all(self, courses, chunk_size=8192):
+        """把大量课程一次计入分析数据，每批课程用数组运算汇总，用于加载和整体替换课程。"""
+        courses = [course for course in courses if 0 <= course.day < self.days]
+        for chunk_start in range(0, len(courses), chunk_size):
+            self._add_chunk(courses[chunk_start:chunk_start + chunk_size])
+
+    def _add_chunk(self, courses):
+        """用数组运算把一批课程计入分析数据。"""
+        count = len(courses)
+        if not count:
+            return
+        days = np.fromiter((course.day for course in courses), dtype=np.int64, count=count)
+        first = np.maximum(np.fromiter((course.start_section for course in courses), dtype=np.int64, count=count), 1)
+        last = np.minimum(np.fromiter((course.end_section for course in courses), dtype=np.int64, count=count), self.sections)
+        in_week = self._week_bits(course.active_weeks for course in courses)
+        sections = np.arange(1, self.sections + 1)
+        in_section = ((sections >= first[:, None]) & (sections <= last[:, None])).astype(np.int32)
+        # 每门课程在节次×周次上的占用：slots[c, s, w]
+        slots = in_section[:, :, None] * in_week[:, None, :].astype(np.int32)
+        keys, sums = self._group_sum(days, slots)
+        self._concurrency[keys] += sums
+        teachers = np.array([course.teacher for course in courses], dtype=object)
+        has_teacher = teachers != ""
+        if has_teacher.any():
+            codes = self._codes(teachers[has_teacher], self._teacher_codes, self._teacher_names, self._teacher_courses)
+            self._teacher_load = self._reserve(self._teacher_load, len(self._teacher_names))
+            load = np.maximum(0, last - first + 1)[:, None] * in_week
+            keys, sums = self._group_sum(codes, load[has_teacher])
+            self._teacher_load[keys] += sums
+        classrooms = np.array([course.classroom for course in courses], dtype=object)
+        has_classroom = classrooms != ""
+        if has_classroom.any():
+            codes = self._codes(classrooms[has_classroom], self._classroom_codes, self._classroom_names,
+                                self._classroom_courses)
+            self._occupancy = self._reserve(self._occupancy, len(self._classroom_names))
+            keys, sums = self._group_sum(codes * self.days + days[has_classroom], slots[has_classroom])
+            self._occupancy[keys // self.days, keys % self.days] += sums
+
+    def _update(self, course, sign):
+        """把单个课程计入（sign为1）或移出（sign为-1）分析数据，教师或教室为空的课程不计入对应的统计。"""
+        if not 0 <= course.day < self.days:
+            return
+        first = max(course.start_section, 1)
+        last = min(course.end_section, self.sections)
+        in_week = self._week_bits([course.active_weeks])[0]
+        if first <= last:
+            self._concurrency[course.day, first - 1:last] += (sign * in_week).astype(np.int32)
+        if course.teacher:
+            code = self._code(course.teacher, self._teacher_codes, self._teacher_names, self._teacher_courses)
+            self._teacher_courses[code] += sign
+            self._teacher_load = self._reserve(self._teacher_load, code + 1)
+            self._teacher_load[code] += sign * max(0, last - first + 1) * in_week
+        if course.classroom:
+            code = self._code(course.classroom, self._classroom_codes, self._classroom_names, self._classroom_courses)
+            self._classroom_courses[code] += sign
+            self._occupancy = self._reserve(self._occupancy, code + 1)
+            if first <= last:
+                self._occupancy[code, course.day, first - 1:last] += (sign * in_week).astype(np.int32)
+
+    def add(self, course):
+        """把课程计入分析数据。"""
+        self._update(course, 1)
+
+    def remove(self, course):
+        """把课程移出分析数据。"""
+        self._update(course, -1)
+
+    @property
+    def teachers(self):
+        """还有课程的教师名称数组。"""
+        return np.array(self._teacher_names, dtype=object)[self._active(self._teacher_courses)]
+
+    @property
+    def teacher_load(self):
+        """还有课程的教师每周的课时：teacher_load[t, w]。"""
+        return self._teacher_load[self._active(self._teacher_courses)]
+
+    @property
+    def classrooms(self):
+        """还有课程的教室名称数组。"""
+        return np.array(self._classroom_names, dtype=object)[self._active(self._classroom_courses)]
+
+    @property
+    def occupancy(self):
+        """还有课程的教室在星期×节次×周次上同时安排的课程数：occupancy[r, d, s, w]。"""
+        return self._occupancy[self._active(self._classroom_courses)]
+
+    @staticmethod
+    def _active(counts):
+        """返回课程数大于0的编号。"""
+        return np.flatnonzero(np.array(counts, dtype=np.int64) > 0)
+
+    def teacher_load_rows(self):
+        """返回按总课时从高到低排列的（教师, 总节数, 周均节数, 最高周节数, 最忙的周），总课时相同时按名称排列。"""
+        teachers = self.teachers
+        teacher_load = self.teacher_load
+        totals = teacher_load.sum(axis=1)
+        means = totals / self.weeks if self.weeks else totals
+        peaks = teacher_load.max(axis=1) if self.weeks else totals
+        peak_weeks = teacher_load.argmax(axis=1) + 1 if self.weeks else totals
+        order = sorted(range(len(teachers)), key=lambda i: (-totals[i], teachers[i]))
+        return [
+            (str(teachers[i]), int(totals[i]), float(means[i]), int(peaks[i]), int(peak_weeks[i]))
+            for i in order
+        ]
+
+    def classroom_utilization(self):
+        """返回每个教室在上课日所有节次和周次中被占用的比例。"""
+        slots = self.class_days * self.sections * self.weeks
+        occupied = (self.occupancy[:, :self.class_days] > 0).sum(axis=(1, 2, 3))
+        return occupied / slots if slots else occupied.astype(float)
+
+    def classroom_utilization_rows(self):
+        """返回按利用率从高到低排列的（教室, 占用的节次数, 利用率），利用率相同时按名称排列。"""
+        classrooms = self.classrooms
+        occupied = (self.occupancy[:, :self.class_days] > 0).sum(axis=(1, 2, 3))
+        utilization = self.classroom_utilization()
+        order = sorted(range(len(classrooms)), key=lambda i: (-utilization[i], classrooms[i]))
+        return [(str(classrooms[i]), int(occupied[i]), float(utilization[i])) for i in order]
+
+    def utilization_heatmap(self):
+        """返回星期×节次的教室平均利用率，行对应上课日，列对应节次。"""
+        occupancy = self.occupancy
+        if not len(occupancy) or not self.weeks:
+            return np.zeros((self.class_days, self.sections))
+        return (occupancy[:, :self.class_days] > 0).mean(axis=(0, 3))
+
+    def concurrency(self):
+        """返回每个星期×节次×周次同时上课的课程数。"""
+        return self._concurrency
+
+    def peak_slots(self, count=config.ANALYTICS_PEAK_SLOTS):
+        """返回同时上课课程最多的时段（星期, 节次, 周次, 课程数），星期、节次和周次从0开始。"""
+        concurrency = self.concurrency()
+        flat = concurrency.ravel()
+        count = min(count, int(np.count_nonzero(flat)))
+        if not count:
+            return []
+        top = np.argpartition(-flat, count - 1)[:count]
+        top = top[np.argsort(-flat[top], kind='stable')]
+        days, sections, weeks = np.unravel_index(top, concurrency.shape)
+        return list(zip(days.tolist(), sections.tolist(), weeks.tolist(), flat[top].tolist()))
+
+    def csv_tables(self, day_names):
+        """返回导出为CSV的各张表：文件名 -> 行列表（第一行为表头）。"""
+        heatmap = self.utilization_heatmap()
+        return {
+            "teacher_load.csv": [["教师", "总节数", "周均节数", "最高周节数", "最忙的周"]] + [
+                [teacher, total, f"{mean:.2f}", peak, f"第{week}周"]
+                for teacher, total, mean, peak, week in self.teacher_load_rows()
+            ],
+            "classroom_utilization.csv": [["教室", "占用节次", "利用率"]] + [
+                [classroom, occupied, f"{utilization:.2%}"]
+                for classroom, occupied, utilization in self.classroom_utilization_rows()
+            ],
+            "utilization_heatmap.csv": [["节次"] + list(day_names[:self.class_days])] + [
+                [f"第{section + 1}节"] + [f"{value:.2%}" for value in heatmap[:, section]]
+                for section in range(self.sections)
+            ],
+            "peak_slots.csv": [["星期", "节次", "周次", "同时上课的课程数"]] + [
+                [day_names[day] if day < len(day_names) else day, f"第{section + 1}节", f"第{week + 1}周", courses]
+                for day, section, week, courses in self.peak_slots()
+            ],
+        }
+
+# 把行列表转为CSV文本
+def csv_text(rows):
+    """返回行列表对应的CSV文本。"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+# 单周课程视图类
+class WeekView:
+    """某一周课程表的预计算视图，记录每个格子从该节次开始的课程。"""
+    __slots__ = ('week', 'cells', '_content_key')
+
+    def __init__(self, week, index):
+        """根据课程占用索引构建指定周（从0开始）的视图。"""
+        self.week = week
+        self._content_key = None
+        self.cells = {}  # (星期, 节次) -> 课程
+        for day in range(index.DAYS_PER_WEEK):
+            if not index.day_bits[day]:
+                continue
+            for section in range(1, index.sections + 1):
+                course = index.course_at(day, section, week)
+                if course:
+                    self.cells[(day, section)] = course
+
+    def course_at(self, day, section):
+        """返回从指定星期和节次开始的课程。"""
+        return self.cells.get((day, section))
+
+    def content_key(self):
+        """返回决定这一周网格外观的内容，修改其他周的课程时不变。"""
+        if self._content_key is None:
+            self._content_key = tuple(sorted(
+                (cell, course.end_section) + RenderResources.content_key(course)
+                for cell, course in self.cells.items()
+            ))
+        return self._content_key
+
+# 课程数据容器类
+class CourseStore(QObject):
+    """课程数据容器，按ID索引所有课程，同步维护课程占用索引、搜索索引、统计数据和课程分析，并在课程变化时发出通知。"""
+    course_added = pyqtSignal(object)  # 新增的课程
+    course_changed = pyqtSignal(object, object)  # 修改前和修改后的课程
+    course_removed = pyqtSignal(object)  # 被删除的课程
+    courses_reset = pyqtSignal()  # 全部课程被替换
+
+    def __init__(self, courses=None, parent=None):
+        """初始化课程数据容器。"""
+        super().__init__(parent)
+        self._courses = {}  # 课程ID -> 课程对象，保持加入顺序
+        self.index = ScheduleIndex()
+        self.search_index = SearchIndex()
+        self.phonetic_index = PhoneticIndex()
+        self.statistics = StatisticsAggregator()
+        self.analytics = CourseAnalytics() if np is not None else None  # 没有NumPy时不做课程分析
+        self._week_views = {}  # 周次 -> 缓存的WeekView
+        if courses is not None:
+            self.replace_all(courses)
+
+    def __len__(self):
+        return len(self._courses)
+
+    def __iter__(self):
+        return iter(self._courses.values())
+
+    def __contains__(self, course_id):
+        return course_id in self._courses
+
+    def get(self, course_id):
+        """按ID查找课程，不存在时返回None。"""
+        return self._courses.get(course_id)
+
+    def add(self, course):
+        """添加课程，ID与已有课程重复时重新生成ID。"""
+        self._add(course)
+        self.course_added.emit(course)
+        return course
+
+    def _add(self, course, analytics=True):
+        """添加课程但不发出通知，analytics为False时由调用者批量更新课程分析。"""
+        while course.id in self._courses:
+            course.id = Course.generate_id()
+        self._courses[course.id] = course
+        self.index.add(course)
+        self.search_index.add(course)
+        self.phonetic_index.add(course)
+        self.statistics.add(course)
+        if analytics and self.analytics is not None:
+            self.analytics.add(course)
+        self._invalidate_weeks(course.weeks)
+
+    def update(self, course_id, new_course):
+        """用新课程替换指定ID的课程，保留原ID和原有顺序，返回被替换的课程。"""
+        old_course = self._courses[course_id]
+        new_course.id = course_id
+        self.index.remove(old_course)
+        self.search_index.remove(old_course)
+        self.phonetic_index.remove(old_course)
+        self.statistics.remove(old_course)
+        self._courses[course_id] = new_course
+        self.index.add(new_course)
+        self.search_index.add(new_course)
+        self.phonetic_index.add(new_course)
+        self.statistics.add(new_course)
+        if self.analytics is not None:
+            self.analytics.remove(old_course)
+            self.analytics.add(new_course)
+        self._invalidate_weeks(old_course.weeks | new_course.weeks)
+        self.course_changed.emit(old_course, new_course)
+        return old_course
+
+    def remove(self, course_id):
+        """删除指定ID的课程，返回被删除的课程。"""
+        course = self._courses.pop(course_id)
+        self.index.remove(course)
+        self.search_index.remove(course)
+        self.phonetic_index.remove(course)
+        self.statistics.remove(course)
+        if self.analytics is not None:
+            self.analytics.remove(course)
+        self._invalidate_weeks(course.weeks)
+        self.course_removed.emit(course)
+        return course
+
+    def clear(self):
+        """清空所有课程。"""
+        self._clear()
+        self.courses_reset.emit()
+
+    def _clear(self):
+        """清空所有课程但不发出通知。"""
+        self._courses.clear()
+        self.index.clear()
+        self.search_index.clear()
+        self.phonetic_index.clear()
+        self.statistics.clear()
+        if self.analytics is not None:
+            self.analytics.clear()
+        self._week_views.clear()
+
+    def replace_all(self, courses):
+        """用给定的课程替换容器中的全部课程，完成后只发出一次重置通知。"""
+        # 先完整构建新课程列表，构建失败时保留原有课程
+        courses = list(courses)
+        self._clear()
+        for course in courses:
+            self._add(course, analytics=False)
+        # 课程分析按批用数组运算汇总，不逐个课程更新
+        if self.analytics is not None:
+            self.analytics.add_all(self._courses.values())
+        self.courses_reset.emit()
+
+    def _invalidate_weeks(self, weeks):
+        """丢弃受影响周次的缓存视图。"""
+        for week in list(self._week_views):
+            if weeks >> week & 1:
+                del self._week_views[week]
+
+    def week_view(self, week):
+        """返回指定周（从0开始）的课程视图，未变化的周直接复用缓存。"""
+        view = self._week_views.get(week)
+        if view is None:
+            view = WeekView(week, self.index)
+            self._week_views[week] = view
+        return view
+
+    def course_at(self, day, section, week=None):
+        """返回指定周从该星期和节次开始的课程。"""
+        if week is None:
+            return self.index.course_at(day, section)
+        return self.week_view(week).course_at(day, section)
+
+    def has_conflict(self, course, exclude_id=None):
+        """检查课程是否与容器中的其他课程时间冲突。"""
+        return self.index.has_conflict(course, exclude_id)
+
+    def search(self, search_text):
+        """返回名称、教师或教室包含搜索文本的课程ID集合。"""
+        return self.search_index.search(search_text)
+
+    def fuzzy_search(self, search_text):
+        """按原文、拼音、首字母和模糊匹配搜索课程，返回课程ID到排序分数的映射。"""
+        return self.phonetic_index.search(search_text)
+
+# 原子写入文本文件：先写入临时文件，再整体替换目标文件，写入中途崩溃不会损坏原文件
+def atomic_write_text(file_path, text):
+    """将文本原子地写入文件。"""
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, file_path)
+
+def atomic_write_json(file_path, data, indent=2):
+    """将数据以JSON格式原子地写入文件。"""
+    atomic_write_text(file_path, json.dumps(data, ensure_ascii=False, indent=indent))
+
+# 作息时间表类
+class BellSchedule:
+    """作息时间表：每节课的上下课时间（距当天0点的分钟数）编译为按时间排序的数组，用二分查找定位当前节次。"""
+
+    def __init__(self, sections=None, overrides=None):
+        """根据"时:分-时:分"格式的每节课时间创建作息时间表，sections为空时按config中的时长推算。"""
+        self._default = self.compile(sections if sections is not None else config.BELL_SCHEDULE)
+        self._by_day = {}  # 星期 -> 该天单独的（上课时间数组, 下课时间数组）
+        overrides = config.BELL_SCHEDULE_OVERRIDES if overrides is None else overrides
+        for day, day_sections in overrides.items():
+            self._by_day[int(day)] = self.compile(day_sections)
+
+    @staticmethod
+    def parse_time(text):
+        """把"时:分"转换为距当天0点的分钟数。"""
+        hour, minute = text.split(":")
+        return int(hour) * 60 + int(minute)
+
+    @classmethod
+    def default_sections(cls):
+        """按第一节课时间、每节课时长、课间时长和下午开始时间推算每节课的上下课时间。"""
+        period = config.SECTION_DURATION + config.BREAK_DURATION
+        sections = []
+        start = cls.parse_time(config.FIRST_SECTION_START)
+        for section in range(1, config.MAX_DAILY_SECTIONS + 1):
+            if section == config.AFTERNOON_FIRST_SECTION and section > 1:
+                # 午休之后从下午的上课时间重新开始
+                start = max(start, cls.parse_time(config.AFTERNOON_START))
+            sections.append((start, start + config.SECTION_DURATION))
+            start += period
+        return sections
+
+    @classmethod
+    def compile(cls, section_specs):
+        """把每节课的时间编译为按顺序排列的上课和下课时间数组，不足的节次按课间时长顺延。"""
+        if not section_specs:
+            sections = cls.default_sections()
+        else:
+            sections = []
+            for spec in section_specs:
+                start, end = spec.split("-")
+                sections.append((cls.parse_time(start), cls.parse_time(end)))
+            for (start, end), (next_start, _) in zip(sections, sections[1:] + [(None, None)]):
+                if end <= start or (next_start is not None and next_start < end):
+                    raise ValueError(f"作息时间表的节次时间重叠或顺序错误: {section_specs}")
+            while len(sections) < config.MAX_DAILY_SECTIONS:
+                last_start, last_end = sections[-1]
+                start = last_end + config.BREAK_DURATION
+                sections.append((start, start + (last_end - last_start)))
+        return [start for start, _ in sections], [end for _, end in sections]
+
+    def _table(self, day):
+        """返回指定星期使用的时间数组。"""
+        return self._by_day.get(day, self._default)
+
+    def section_count(self, day=None):
+        """返回作息时间表中的节次数。"""
+        return len(self._table(day)[0])
+
+    def section_start(self, section, day=None):
+        """返回第section节（从1开始）的上课时间。"""
+        starts, _ = self._table(day)
+        return starts[min(max(section, 1), len(starts)) - 1]
+
+    def section_end(self, section, day=None):
+        """返回第section节（从1开始）的下课时间。"""
+        _, ends = self._table(day)
+        return ends[min(max(section, 1), len(ends)) - 1]
+
+    def section_range(self, start_section, end_section, day=None):
+        """返回从第start_section节上课到第end_section节下课的时间。"""
+        return self.section_start(start_section, day), self.section_end(end_section, day)
+
+    def started_sections(self, minute, day=None):
+        """返回到指定时刻为止已经开始的节次数，即最近开始的节次（第一节课之前为0）。"""
+        starts, _ = self._table(day)
+        return bisect.bisect_right(starts, minute)
+
+    def section_at(self, minute, day=None):
+        """返回指定时刻正在上的节次，课间或不在上课时间内时返回None。"""
+        section = self.started_sections(minute, day)
+        if section and minute < self._table(day)[1][section - 1]:
+            return section
+        return None
+
+# 全局共享的作息时间表，配置有误时退回按时长推算的时间
+try:
+    bell_schedule = BellSchedule()
+except ValueError as e:
+    logger.warning("作息时间表配置有误，使用按时长推算的时间: %s", e)
+    bell_schedule = BellSchedule([], {})
+
+# 计算节次的上下课时间
+def section_time_range(start_section, end_section, day=None):
+    """返回从第start_section节上课到第end_section节下课的时间（距当天0点的timedelta）。"""
+    start, end = bell_schedule.section_range(start_section, end_section, day)
+    return timedelta(minutes=start), timedelta(minutes=end)
+
+# 学期第一周的周一
+def semester_start_monday(start_date=config.SEMESTER_START_DATE):
+    """返回学期开始日期所在周的周一。"""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    return start - timedelta(days=start.weekday())
+
+# 展开课程在整个学期中的每一次上课
+def iter_course_occurrences(course, semester_start=None):
+    """逐个产出课程每次上课的（周次（从0开始）, 上课时间, 下课时间）。"""
+    if semester_start is None:
+        semester_start = semester_start_monday()
+    start, end = section_time_range(course.start_section, course.end_section, course.day)
+    for week in range(config.TOTAL_WEEKS):
+        if course.in_week(week):
+            day = semester_start + timedelta(weeks=week, days=course.day)
+            yield week, day + start, day + end
+
+# 查找课程的下一次上课时间
+def next_course_occurrence(course, after, semester_start=None):
+    """返回课程在after之后的第一次上课时间，找不到时返回None。
+    
+    在学期范围内只在课程的上课周提醒；日期超出学期范围时（例如未设置本学期的开始日期）按星期提醒。
+    """
+    if semester_start is None:
+        semester_start = semester_start_monday()
+    start, _ = section_time_range(course.start_section, course.end_section, course.day)
+    day = datetime(after.year, after.month, after.day) + timedelta(days=(course.day - after.weekday()) % 7)
+    # 最多向后找一个学期，加一周余量
+    for _ in range(config.TOTAL_WEEKS + 1):
+        occurrence = day + start
+        week = (day - semester_start).days // 7
+        in_semester = 0 <= week < config.TOTAL_WEEKS
+        if occurrence > after and (not in_semester or course.in_week(week)):
+            return occurrence
+        day += timedelta(weeks=1)
+    return None
+
+# iCalendar文本转义
+def ics_escape(text):
+    """按RFC 5545转义文本属性值中的特殊字符，各种换行符都转为\\n，不会在内容行中留下裸的回车。"""
+    text = text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    return text.replace("\r\n", "\\n").replace("\r", "\\n").replace("\n", "\\n")
+
+# iCalendar长行折叠
+def ics_fold(line):
+    """按RFC 5545把超过75个字节的内容行折叠为多行，不拆开多字节字符。"""
+    if len(line.encode('utf-8')) <= 75:
+        return line
+    parts = []
+    current = ""
+    current_size = 0
+    limit = 75
+    for character in line:
+        size = len(character.encode('utf-8'))
+        if current_size + size > limit:
+            parts.append(current)
+            # 续行以一个空格开头，空格也占用一个字节
+            current = ""
+            current_size = 0
+            limit = 74
+        current += character
+        current_size += size
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+# 逐行产出iCalendar文件内容
+def iter_ics_lines(courses, semester_start=None, calendar_name=config.APP_NAME):
+    """把课程展开为学期中每一次上课的事件，逐行产出iCalendar文件内容，不在内存中保存整个文件。"""
+    if semester_start is None:
+        semester_start = semester_start_monday()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield f"PRODID:-//{config.AUTHOR}//{config.APP_NAME} {config.VERSION}//ZH"
+    yield "CALSCALE:GREGORIAN"
+    yield ics_fold(f"X-WR-CALNAME:{ics_escape(calendar_name)}")
+    for course in courses:
+        description = ics_escape(f"教师: {course.teacher}\n第{course.start_section}-{course.end_section}节")
+        for week, start, end in iter_course_occurrences(course, semester_start):
+            yield "BEGIN:VEVENT"
+            yield ics_fold(f"UID:{ics_escape(course.id)}-{week + 1}@classtable")
+            yield f"DTSTAMP:{stamp}"
+            yield f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}"
+            yield f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}"
+            yield ics_fold(f"SUMMARY:{ics_escape(course.name)}")
+            yield ics_fold(f"LOCATION:{ics_escape(course.classroom)}")
+            yield ics_fold(f"DESCRIPTION:{description}")
+            if course.reminder:
+                yield "BEGIN:VALARM"
+                yield "ACTION:DISPLAY"
+                yield ics_fold(f"DESCRIPTION:{ics_escape(course.name)}")
+                yield f"TRIGGER:-PT{course.reminder_minutes}M"
+                yield "END:VALARM"
+            yield "END:VEVENT"
+    yield "END:VCALENDAR"
+
+# 把课程导出为iCalendar文件
+def write_ics(file_path, courses, semester_start=None, calendar_name=config.APP_NAME):
+    """流式写入iCalendar文件：先写入临时文件，完成后再替换目标文件。"""
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+        for line in iter_ics_lines(courses, semester_start, calendar_name):
+            f.write(line)
+            f.write("\r\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, file_path)
+
+# 课程修改日志类
+class ScheduleJournal:
+    """课程修改日志，追加记录课程的增删改操作，加载时在快照之上回放，过大时合并为新快照。"""
+    # 所有写操作都由PersistenceWorker在同一个后台线程中按提交顺序执行
+
+    def __init__(self, snapshot_path, threshold=config.JOURNAL_COMPACT_THRESHOLD):
+        """初始化课程修改日志。"""
+        self.snapshot_path = snapshot_path
+        self.path = snapshot_path + config.SCHEDULE_JOURNAL_SUFFIX
+        self.threshold = threshold
+        self._tail_checked = False  # 是否已经检查过日志末尾的不完整记录
+
+    def repair_tail(self):
+        """截掉上次写入中途崩溃留下的不完整末行，保证新记录从新的一行开始。"""
+        try:
+            f = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            # 从文件末尾向前按块查找最后一个换行符
+            while position > 0:
+                size = min(4096, position)
+                f.seek(position - size)
+                newline = f.read(size).rfind(b"\n")
+                if newline >= 0:
+                    position = position - size + newline + 1
+                    break
+                position -= size
+            if position < end:
+                logger.warning("课程修改日志末尾有不完整的记录，已截掉 %d 字节", end - position)
+                f.truncate(position)
+
+    def append(self, op, course):
+        """追加一条修改记录，op为add、update或delete。"""
+        record = {'op': op, 'id': course.id}
+        if op != 'delete':
+            record['course'] = course.to_dict()
+        if not self._tail_checked:
+            self.repair_tail()
+            self._tail_checked = True
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def size(self):
+        """返回当前日志文件的大小（字节）。"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self):
+        """检查日志是否超过合并阈值。"""
+        return self.size() > self.threshold
+
+    def exists(self):
+        """检查快照或日志文件是否存在。"""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.path)
+
+    def load(self):
+        """读取快照并回放日志，返回课程字典列表。"""
+        courses_by_id = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                for data in json.load(f):
+                    courses_by_id[data.get('id') or Course.generate_id()] = data
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 写入中途崩溃留下的不完整记录，忽略
+                        continue
+                    if not self.valid_record(record):
+                        logger.warning("忽略课程修改日志中格式错误的记录: %s", line.strip()[:200])
+                        continue
+                    if record['op'] == 'delete':
+                        courses_by_id.pop(record['id'], None)
+                    else:
+                        courses_by_id[record['id']] = record['course']
+        return list(courses_by_id.values())
+
+    @staticmethod
+    def valid_record(record):
+        """检查日志记录是否包含回放所需的字段。"""
+        if not isinstance(record, dict) or not isinstance(record.get('id'), str):
+            return False
+        if record.get('op') == 'delete':
+            return True
+        return record.get('op') in ('add', 'update') and isinstance(record.get('course'), dict)
+
+    def write_snapshot(self, course_dicts):
+        """原子地写入完整快照，并删除已被快照包含的日志。"""
+        atomic_write_json(self.snapshot_path, course_dicts)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# SQLite课程存储类
+class SqliteScheduleStorage:
+    """SQLite课程存储，与ScheduleJournal提供相同的加载和保存接口，修改以单行写入完成，并提供基于索引的查询。"""
+    # 界面中的冲突检查和搜索使用内存中的CourseStore索引，不在GUI线程中等待后台写入；
+    # 这里的索引查询读取已经提交的数据，供多个班级共用的数据库和批量处理使用
+
+    COLUMNS = ('id', 'name', 'teacher', 'classroom', 'day', 'start_section', 'end_section',
+               'color', 'reminder', 'reminder_minutes', 'weeks')
+
+    def __init__(self, db_path=config.SQLITE_DB_PATH, legacy_json_path=config.SCHEDULE_FILE_PATH):
+        """打开数据库并创建课程表和索引。"""
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        # 写入在后台持久化线程中进行，加载在GUI线程中进行，用锁串行访问同一个连接
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS courses ("
+                "id TEXT PRIMARY KEY, name TEXT NOT NULL, teacher TEXT NOT NULL, classroom TEXT NOT NULL, "
+                "day INTEGER NOT NULL, start_section INTEGER NOT NULL, end_section INTEGER NOT NULL, "
+                "color TEXT NOT NULL, reminder INTEGER NOT NULL, reminder_minutes INTEGER NOT NULL, "
+                "weeks INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_courses_day_start ON courses (day, start_section)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_courses_teacher ON courses (teacher)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_courses_classroom ON courses (classroom)")
+
+    def _row(self, data):
+        """把课程字典转换为数据库行。"""
+        return (
+            data['id'], data['name'], data['teacher'], data['classroom'], data['day'],
+            data['start_section'], data['end_section'], data['color'],
+            int(data.get('reminder', False)),
+            data.get('reminder_minutes', config.DEFAULT_REMINDER_MINUTES),
+            data.get('weeks', Course.ALL_WEEKS)
+        )
+
+    def _upsert_sql(self):
+        """返回按ID插入或更新单行的SQL语句，更新时保留原行的顺序。"""
+        columns = ", ".join(self.COLUMNS)
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in self.COLUMNS[1:])
+        return f"INSERT INTO courses ({columns}) VALUES ({placeholders}) ON CONFLICT(id) DO UPDATE SET {updates}"
+
+    def append(self, op, course):
+        """记录单个课程的修改，op为add、update或delete。"""
+        with self._lock, self._conn:
+            if op == 'delete':
+                self._conn.execute("DELETE FROM courses WHERE id = ?", (course.id,))
+            else:
+                self._conn.execute(self._upsert_sql(), self._row(course.to_dict()))
+
+    def needs_compaction(self):
+        """数据库按行更新，不需要合并。"""
+        return False
+
+    def exists(self):
+        """检查数据库中或旧版JSON文件中是否有课程数据。"""
+        with self._lock:
+            has_rows = self._conn.execute("SELECT 1 FROM courses LIMIT 1").fetchone() is not None
+        return has_rows or ScheduleJournal(self.legacy_json_path).exists()
+
+    def load(self):
+        """读取所有课程，返回课程字典列表。数据库为空时从旧版JSON文件迁移。"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM courses ORDER BY rowid").fetchall()
+        if not rows:
+            legacy = ScheduleJournal(self.legacy_json_path)
+            if legacy.exists():
+                course_dicts = legacy.load()
+                self.write_snapshot(course_dicts)
+                return course_dicts
+        return self._course_dicts(rows)
+
+    @classmethod
+    def _course_dicts(cls, rows):
+        """把数据库行转换为课程字典列表。"""
+        course_dicts = []
+        for row in rows:
+            data = dict(zip(cls.COLUMNS, row))
+            data['reminder'] = bool(data['reminder'])
+            course_dicts.append(data)
+        return course_dicts
+
+    def write_snapshot(self, course_dicts):
+        """在一个事务中把数据库同步为给定的课程：只写入新增或有变化的行，并删除已不存在的课程。"""
+        rows = [self._row(data) for data in course_dicts]
+        with self._lock, self._conn:
+            existing = {row[0]: row for row in self._conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM courses")}
+            self._conn.executemany(self._upsert_sql(), (row for row in rows if existing.get(row[0]) != row))
+            removed = existing.keys() - {row[0] for row in rows}
+            self._conn.executemany("DELETE FROM courses WHERE id = ?", ((course_id,) for course_id in removed))
+
+    def _query(self, sql, parameters=()):
+        """执行查询并返回课程字典列表。"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM courses WHERE {sql} ORDER BY rowid",
+                                      parameters).fetchall()
+        return self._course_dicts(rows)
+
+    def has_conflict(self, course, exclude_id=None):
+        """通过(day, start_section)索引检查课程是否与数据库中的课程时间冲突。"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM courses WHERE day = ? AND start_section <= ? AND end_section >= ? "
+                "AND id != ? AND (weeks & ?) != 0 LIMIT 1",
+                (course.day, course.end_section, course.start_section, exclude_id or "", course.active_weeks)
+            ).fetchone()
+        return row is not None
+
+    def courses_at(self, day, start_section=None, end_section=None):
+        """通过(day, start_section)索引返回某天在指定节次范围内开始的课程。"""
+        start_section = 1 if start_section is None else start_section
+        end_section = config.MAX_DAILY_SECTIONS if end_section is None else end_section
+        return self._query("day = ? AND start_section BETWEEN ? AND ?", (day, start_section, end_section))
+
+    def courses_by_teacher(self, teacher):
+        """通过教师索引返回该教师的所有课程。"""
+        return self._query("teacher = ?", (teacher,))
+
+    def courses_by_classroom(self, classroom):
+        """通过教室索引返回安排在该教室的所有课程。"""
+        return self._query("classroom = ?", (classroom,))
+
+    def course_counts(self, column):
+        """按教师或教室分组统计课程数和每周节数，返回（名称, 课程数, 节数）列表，空名称不计入。"""
+        if column not in ('teacher', 'classroom'):
+            raise ValueError(f"不支持按 {column} 统计")
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {column}, COUNT(*), SUM(end_section - start_section + 1) FROM courses "
+                f"WHERE {column} != '' GROUP BY {column} ORDER BY {column}"
+            ).fetchall()
+
+    def close(self):
+        """关闭数据库连接。"""
+        with self._lock:
+            self._conn.close()
+
+# 根据配置创建课程存储
+def create_schedule_storage(schedule_file=config.SCHEDULE_FILE_PATH, backend=None):
+    """根据config.STORAGE_BACKEND创建课程存储，支持json和sqlite两种后端。"""
+    backend = backend or config.STORAGE_BACKEND
+    if backend == "sqlite":
+        return SqliteScheduleStorage(legacy_json_path=schedule_file)
+    return ScheduleJournal(schedule_file)
+
+# 流式课程文件读取器类
+class StreamingCourseReader:
+    """增量解析课程JSON文件，逐个产出课程数组中的元素，不把整个文件读入内存。"""
+    # 文件顶层可以是课程数组（课程表数据文件），也可以是包含课程数组的对象（导出文件）
+
+    WHITESPACE = " \t\r\n"
+
+    def __init__(self, f, key='courses', chunk_size=config.IMPORT_CHUNK_SIZE):
+        """初始化读取器，f为以二进制模式打开的文件。"""
+        self.f = f
+        self.key = key
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """读入下一块数据，已到文件末尾时返回False。"""
+        if self._eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        self._eof = not chunk
+        # 已解析的部分超过一块时才裁剪缓冲区，避免每个元素都复制一次缓冲区
+        if self._pos > self.chunk_size:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += self._text_decoder.decode(chunk, final=self._eof)
+        return True
+
+    def _peek(self):
+        """跳过空白并返回下一个字符。"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("课程文件意外结束")
+
+    def _expect(self, char):
+        """跳过空白后读取一个指定字符。"""
+        if self._peek() != char:
+            raise ValueError(f"课程文件格式错误：位置 {self._pos} 处应为 '{char}'")
+        self._pos += 1
+
+    def _value(self):
+        """解析下一个完整的JSON值，数据不完整时继续读入。"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # 出错位置之后已经有超过一块的数据时，说明不是数据被截断而是格式错误，
+                # 立即报错，避免把整个文件读进缓冲区反复重新解析；
+                # 未结束的字符串报告的是字符串的开头，只要缓冲区中还没有结束引号就可能是被截断
+                truncated = e.pos + self.chunk_size >= len(self._buf) or e.msg.startswith("Unterminated string")
+                if not truncated or not self._fill():
+                    raise ValueError(f"课程文件格式错误：{e.msg}（文件第 {self.bytes_read} 字节之前）") from None
+                continue
+            # 数字可能被数据块截断，读到缓冲区末尾时再读一块确认
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _array_items(self):
+        """逐个产出数组中的元素，调用时已读过左方括号。"""
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._peek() == ',':
+                self._pos += 1
+            else:
+                self._expect(']')
+                return
+
+    def __iter__(self):
+        first = self._peek()
+        if first == '[':
+            self._pos += 1
+            yield from self._array_items()
+            return
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            name = self._value()
+            self._expect(':')
+            if name == self.key and self._peek() == '[':
+                self._pos += 1
+                yield from self._array_items()
+                return
+            # 跳过其他字段（版本号、导出时间等）
+            self._value()
+            if self._peek() == ',':
+                self._pos += 1
+            else:
+                self._expect('}')
+                return
+
+# 课程表流式导入任务类
+class StreamingImportTask(QObject):
+    """在后台线程中流式导入课程表文件，分批创建课程并报告进度，可随时取消。"""
+    progress = pyqtSignal(int)  # 导入进度（0-100）
+    finished = pyqtSignal(object)  # 导入的课程列表，取消时为None
+    failed = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, file_path, batch_size=config.IMPORT_BATCH_SIZE, parent=None):
+        """初始化导入任务。"""
+        super().__init__(parent)
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self._cancelled = threading.Event()
+        self._submit = None
+        self._file = None
+        self._reader = None
+        self._items = None
+        self._total_size = 1
+        self._courses = []
+
+    def cancel(self):
+        """请求取消导入，后台线程在处理完当前批次后停止。"""
+        self._cancelled.set()
+
+    def start(self, submit):
+        """开始导入，submit把每一批的读取作为单独的任务提交到后台线程。
+        
+        每批之间其他后台任务（例如保存）可以插队执行，导入大文件时不会长时间阻塞保存。
+        """
+        self._submit = submit
+        self._submit_next(self._open)
+
+    def _submit_next(self, step):
+        """提交下一步，后台线程已关闭时停止导入。"""
+        try:
+            self._submit(step)
+        except RuntimeError:
+            self._close()
+
+    def _open(self):
+        """打开课程文件并开始读取第一批。"""
+        try:
+            self._total_size = max(os.path.getsize(self.file_path), 1)
+            self._file = open(self.file_path, 'rb')
+            self._reader = StreamingCourseReader(self._file)
+            self._items = iter(self._reader)
+        except Exception as e:
+            self._close()
+            self.failed.emit(str(e))
+            return
+        self._submit_next(self._read_batch)
+
+    def _read_batch(self):
+        """读取并创建一批课程，未读完时提交下一批，通过finished或failed信号报告结果。"""
+        if self._cancelled.is_set():
+            self._close()
+            self.finished.emit(None)
+            return
+        try:
+            batch = list(itertools.islice(self._items, self.batch_size))
+            self._courses.extend(Course.from_dict(data) for data in batch)
+        except Exception as e:
+            self._close()
+            self.failed.emit(str(e))
+            return
+        if len(batch) < self.batch_size:
+            self._close()
+            self.progress.emit(100)
+            self.finished.emit(self._courses)
+            return
+        self.progress.emit(self._reader.bytes_read * 100 // self._total_size)
+        self._submit_next(self._read_batch)
+
+    def _close(self):
+        """关闭课程文件。"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+# 课程提醒调度器类
+class ReminderScheduler(QObject):
+    """按提醒时间把每门课程的下一次提醒放入最小堆，只为最早的一次设置单次定时器，课程变化时只重算对应课程。"""
+    reminder_due = pyqtSignal(object, object)  # 需要提醒的课程和这次上课的时间
+
+    def __init__(self, courses, parent=None):
+        """初始化提醒调度器，并为所有课程安排提醒。"""
+        super().__init__(parent)
+        self.courses = courses
+        self._heap = []  # （提醒时间, 序号, 课程ID, 上课时间）
+        self._entries = {}  # 课程ID -> 当前有效的（提醒时间, 上课时间），堆中与之不符的项已失效
+        self._fired = set()  # 已提醒过的（课程ID, 上课时间），同一次上课只提醒一次
+        self._counter = itertools.count()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+        courses.course_added.connect(self.schedule)
+        courses.course_changed.connect(lambda old_course, new_course: self.schedule(new_course))
+        courses.course_removed.connect(lambda course: self.unschedule(course.id))
+        courses.courses_reset.connect(self.rebuild)
+        self.rebuild()
+
+    def rebuild(self):
+        """重新为所有课程安排提醒。"""
+        self._entries = {}
+        now = datetime.now()
+        self._heap = [entry for entry in (self._push(course, now) for course in self.courses) if entry is not None]
+        heapq.heapify(self._heap)
+        self._arm()
+
+    def schedule(self, course):
+        """为新增或修改的课程重新安排提醒。"""
+        self._entries.pop(course.id, None)
+        entry = self._push(course, datetime.now())
+        if entry is not None:
+            heapq.heappush(self._heap, entry)
+        self._arm()
+
+    def unschedule(self, course_id):
+        """取消课程的提醒，堆中的旧项在到达堆顶时丢弃。"""
+        self._entries.pop(course_id, None)
+        self._arm()
+
+    def _push(self, course, after):
+        """计算课程after之后下一次需要提醒的上课，记录并返回堆项（由调用者加入堆）。"""
+        if not (course.reminder and config.ENABLE_POPUP_REMINDER):
+            return None
+        start_time = next_course_occurrence(course, after)
+        while start_time is not None and (course.id, start_time) in self._fired:
+            start_time = next_course_occurrence(course, start_time)
+        if start_time is None:
+            return None
+        fire_time = start_time - timedelta(minutes=course.reminder_minutes)
+        self._entries[course.id] = (fire_time, start_time)
+        return (fire_time, next(self._counter), course.id, start_time)
+
+    def _valid(self, entry):
+        """检查堆项是否仍然有效。"""
+        fire_time, _, course_id, start_time = entry
+        return self._entries.get(course_id) == (fire_time, start_time)
+
+    def _arm(self):
+        """丢弃堆顶的失效项，为最早的一次提醒设置单次定时器。"""
+        while self._heap and not self._valid(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay = (self._heap[0][0] - datetime.now()).total_seconds() * 1000
+        # 长时间等待时分段定时，避免系统休眠或修改时间后错过提醒
+        self._timer.start(int(min(max(delay, 0), config.REMINDER_MAX_WAIT_MS)))
+
+    def _on_timeout(self):
+        """发出所有已到时间的提醒，并为这些课程安排下一次提醒。"""
+        now = datetime.now()
+        reminders = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._valid(entry):
+                continue
+            _, _, course_id, start_time = entry
+            course = self.courses.get(course_id)
+            del self._entries[course_id]
+            # 已经开始上课（例如系统休眠期间错过）的不再提醒
+            if start_time > now and (course_id, start_time) not in self._fired:
+                self._fired.add((course_id, start_time))
+                reminders.append((course, start_time))
+            entry = self._push(course, max(now, start_time))
+            if entry is not None:
+                heapq.heappush(self._heap, entry)
+        # 已经开始的上课不会再提醒，清理记录
+        self._fired = {(course_id, start_time) for course_id, start_time in self._fired if start_time > now}
+        self._arm()
+        # 调度状态更新完成后再发出提醒，处理提醒时修改课程不会影响本次调度
+        for course, start_time in reminders:
+            self.reminder_due.emit(course, start_time)
+
+# 后台持久化工作器类
+class PersistenceWorker(QObject):
+    """在单线程线程池中按提交顺序执行文件读写，并把短时间内的多次保存请求合并为一次写入。"""
+    succeeded = pyqtSignal(str)  # 任务完成的提示信息
+    failed = pyqtSignal(str, str)  # 失败标题和错误信息
+    _result_ready = pyqtSignal(object, object)  # 回调函数和任务结果，在GUI线程中投递
+
+    def __init__(self, parent=None, debounce_ms=config.SAVE_DEBOUNCE_MS):
+        """初始化后台持久化工作器。"""
+        super().__init__(parent)
+        # 只用一个线程，保证日志追加和快照写入按提交顺序执行
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistence")
+        self._closed = False
+        self._pending_save = None
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(debounce_ms)
+        self._save_timer.timeout.connect(self._flush_save)
+        self._result_ready.connect(self._deliver_result)
+
+    def submit(self, task, success_message=None, failure_title="保存失败", on_result=None):
+        """提交一个后台任务，完成后通过信号报告结果，on_result在GUI线程中以任务返回值调用。"""
+        future = self._executor.submit(task)
+        future.add_done_callback(
+            lambda f: self._on_task_done(f, success_message, failure_title, on_result)
+        )
+        return future
+
+    def request_save(self, snapshot_func, write_func, success_message=None):
+        """请求保存：在合并窗口内的多次请求只写入一次，写入的是窗口结束时的最新数据。"""
+        self._pending_save = (snapshot_func, write_func, success_message)
+        # 窗口内的后续请求不重新计时，连续编辑时也能按时写入
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def _flush_save(self):
+        """在GUI线程中获取最新数据快照，然后交给后台线程写入。"""
+        if self._pending_save is None:
+            return
+        snapshot_func, write_func, success_message = self._pending_save
+        self._pending_save = None
+        data = snapshot_func()
+        self.submit(lambda: write_func(data), success_message)
+
+    def flush(self):
+        """立即写入等待中的保存请求，并等待所有后台任务完成。"""
+        if self._closed:
+            return
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+        self._flush_save()
+        self._executor.submit(lambda: None).result()
+
+    def shutdown(self):
+        """写入所有等待中的数据并关闭线程池，重复调用时不做任何事。"""
+        self.flush()
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+
+    def _on_task_done(self, future, success_message, failure_title, on_result):
+        """后台线程中任务完成时调用，通过信号把结果送回GUI线程。"""
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(failure_title, str(error))
+            return
+        if on_result is not None:
+            self._result_ready.emit(on_result, future.result())
+        if success_message:
+            self.succeeded.emit(success_message)
+
+    def _deliver_result(self, callback, result):
+        """在GUI线程中把任务结果交给回调函数。"""
+        callback(result)
+
+# 添加/编辑课程对话框
+class AddCourseDialog(QDialog):
+    def __init__(self, parent=None, course=None, day_names=None):
+        """初始化添加/编辑课程对话框。"""
+        super().__init__(parent)
+        self.setWindowTitle("添加课程" if course is None else "编辑课程")
+        self.setGeometry(300, 300, 400, 350)
+        self.course = course
+        self.day_names = day_names or ["周一", "周二", "周三", "周四", "周五"]
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # 课程名称
+        name_layout = QHBoxLayout()
+        name_layout.addWidget(QLabel("课程名称:"))
+        self.name_edit = QLineEdit()
+        name_layout.addWidget(self.name_edit)
+        layout.addLayout(name_layout)
+
+        # 教师
+        teacher_layout = QHBoxLayout()
+        teacher_layout.addWidget(QLabel("教师姓名:"))
+        self.teacher_edit = QLineEdit()
+        teacher_layout.addWidget(self.teacher_edit)
+        layout.addLayout(teacher_layout)
+
+        # 教室
+        classroom_layout = QHBoxLayout()
+        classroom_layout.addWidget(QLabel("教室地点:"))
+        self.classroom_edit = QLineEdit()
+        classroom_layout.addWidget(self.classroom_edit)
+        layout.addLayout(classroom_layout)
+
+        # 星期几
+        day_layout = QHBoxLayout()
+        day_layout.addWidget(QLabel("星期几:"))
+        self.day_combo = QComboBox()
+        self.day_combo.addItems(self.day_names)
+        day_layout.addWidget(self.day_combo)
+        layout.addLayout(day_layout)
+
+        # 开始节次
+        start_layout = QHBoxLayout()
+        start_layout.addWidget(QLabel("开始节次:"))
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(1, config.MAX_DAILY_SECTIONS)
+        self.start_spin.setValue(1)
+        start_layout.addWidget(self.start_spin)
+        layout.addLayout(start_layout)
+
+        # 结束节次
+        end_layout = QHBoxLayout()
+        end_layout.addWidget(QLabel("结束节次:"))
+        self.end_spin = QSpinBox()
+        self.end_spin.setRange(1, config.MAX_DAILY_SECTIONS)
+        self.end_spin.setValue(1)
+        end_layout.addWidget(self.end_spin)
+        layout.addLayout(end_layout)
+
+        # 上课周次
+        weeks_layout = QHBoxLayout()
+        weeks_layout.addWidget(QLabel("上课周次:"))
+        self.start_week_spin = QSpinBox()
+        self.start_week_spin.setRange(1, config.TOTAL_WEEKS)
+        self.start_week_spin.setValue(1)
+        self.end_week_spin = QSpinBox()
+        self.end_week_spin.setRange(1, config.TOTAL_WEEKS)
+        self.end_week_spin.setValue(config.TOTAL_WEEKS)
+        self.week_pattern_combo = QComboBox()
+        self.week_pattern_combo.addItems(Course.WEEK_PATTERN_NAMES)
+        weeks_layout.addWidget(QLabel("第"))
+        weeks_layout.addWidget(self.start_week_spin)
+        weeks_layout.addWidget(QLabel("至"))
+        weeks_layout.addWidget(self.end_week_spin)
+        weeks_layout.addWidget(QLabel("周"))
+        weeks_layout.addWidget(self.week_pattern_combo)
+        layout.addLayout(weeks_layout)
+
+        # 颜色选择
+        color_layout = QHBoxLayout()
+        color_layout.addWidget(QLabel("课程颜色:"))
+        self.color_button = QPushButton()
+        self.color_button.setFixedSize(30, 30)
+        self.color_button.setStyleSheet("background-color: #4CAF50")
+        self.color_button.clicked.connect(self.choose_color)
+        color_layout.addWidget(self.color_button)
+        layout.addLayout(color_layout)
+
+        # 提醒设置
+        reminder_layout = QHBoxLayout()
+        self.reminder_check = QPushButton("设置提醒")
+        self.reminder_check.setCheckable(True)
+        self.reminder_minutes = QSpinBox()
+        self.reminder_minutes.setRange(1, 60)
+        self.reminder_minutes.setValue(config.DEFAULT_REMINDER_MINUTES)
+        self.reminder_minutes.setEnabled(False)
+        self.reminder_check.clicked.connect(self.toggle_reminder)
+        reminder_layout.addWidget(self.reminder_check)
+        reminder_layout.addWidget(QLabel("提前"))
+        reminder_layout.addWidget(self.reminder_minutes)
+        reminder_layout.addWidget(QLabel("分钟"))
+        layout.addLayout(reminder_layout)
+
+        # 按钮
+        btn_layout = QHBoxLayout()
+        self.ok_btn = QPushButton("确定")
+        self.cancel_btn = QPushButton("取消")
+        self.ok_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.ok_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+        # 如果是编辑模式，填充现有数据
+        if self.course:
+            self.name_edit.setText(self.course.name)
+            self.teacher_edit.setText(self.course.teacher)
+            self.classroom_edit.setText(self.course.classroom)
+            self.day_combo.setCurrentIndex(self.course.day)
+            self.start_spin.setValue(self.course.start_section)
+            self.end_spin.setValue(self.course.end_section)
+            start_week, end_week, pattern = self.course.week_range()
+            self.start_week_spin.setValue(start_week)
+            self.end_week_spin.setValue(end_week)
+            self.week_pattern_combo.setCurrentIndex(pattern)
+            if not self.course.is_week_range():
+                # 不连续的上课周次无法用起止周表示，只显示不修改，保存时保留原来的周次
+                for widget in (self.start_week_spin, self.end_week_spin, self.week_pattern_combo):
+                    widget.setEnabled(False)
+                    widget.setToolTip(f"上课周次: {self.course.weeks_text()}")
+            self.color_button.setStyleSheet(f"background-color: {self.course.color}")
+            self.reminder_check.setChecked(self.course.reminder)
+            self.reminder_minutes.setValue(self.course.reminder_minutes)
+            self.reminder_minutes.setEnabled(self.course.reminder)
+
+        # 确保结束节次不小于开始节次
+        self.start_spin.valueChanged.connect(self.update_end_spin)
+        # 确保结束周不小于起始周
+        self.start_week_spin.valueChanged.connect(self.update_end_week_spin)
+
+    def update_end_spin(self):
+        """根据开始节次更新结束节次的可选范围。"""
+        start = self.start_spin.value()
+        if self.end_spin.value() < start:
+            self.end_spin.setValue(start)
+        self.end_spin.setMinimum(start)
+
+    def update_end_week_spin(self):
+        """根据起始周更新结束周的可选范围。"""
+        start_week = self.start_week_spin.value()
+        if self.end_week_spin.value() < start_week:
+            self.end_week_spin.setValue(start_week)
+        self.end_week_spin.setMinimum(start_week)
+
+    def choose_color(self):
+        """打开颜色选择对话框，让用户选择课程颜色。"""
+        # 创建颜色对话框实例
+        color_dialog = QColorDialog(self)
+        
+        # 设置对话框标题为中文
+        color_dialog.setWindowTitle("选择课程颜色")
+        
+        # 尝试设置中文显示选项
+        color_dialog.setOptions(QColorDialog.ShowAlphaChannel | QColorDialog.DontUseNativeDialog)
+        
+        # 获取当前按钮的背景颜色作为初始颜色
+        current_color = QColor()
+        stylesheet = self.color_button.styleSheet()
+        if stylesheet.startswith("background-color:"):
+            color_name = stylesheet[len("background-color:"):].strip()
+            current_color = QColor(color_name)
+        
+        # 如果当前颜色有效，则设置为初始颜色
+        if current_color.isValid():
+            color_dialog.setCurrentColor(current_color)
+        
+        # 显示对话框并获取用户选择的颜色
+        if color_dialog.exec_() == QColorDialog.Accepted:
+            color = color_dialog.selectedColor()
+            if color.isValid():
+                self.color_button.setStyleSheet(f"background-color: {color.name()}")
+
+    def toggle_reminder(self):
+        """切换课程提醒功能的开关状态。"""
+        self.reminder_minutes.setEnabled(self.reminder_check.isChecked())
+
+    def get_course_data(self):
+        """获取用户在对话框中输入的课程数据，创建并返回课程对象。"""
+        course = Course(
+            self.name_edit.text(),
+            self.teacher_edit.text(),
+            self.classroom_edit.text(),
+            self.day_combo.currentIndex(),
+            self.start_spin.value(),
+            self.end_spin.value(),
+            self.color_button.styleSheet().split(':')[-1].strip()
+        )
+        course.reminder = self.reminder_check.isChecked()
+        course.reminder_minutes = self.reminder_minutes.value()
+        week_values = (self.start_week_spin.value(), self.end_week_spin.value(), self.week_pattern_combo.currentIndex())
+        if self.course and (not self.course.is_week_range() or week_values == self.course.week_range()):
+            # 没有修改上课周次时保留原来的位图，包括超出当前总周数的周次
+            course.weeks = self.course.weeks
+        else:
+            course.weeks = Course.make_week_mask(*week_values)
+        return course
+
+# 课程表网格数据模型类
+class ScheduleTableModel(QAbstractTableModel):
+    """课程表网格的数据模型：行对应节次，列对应星期，格子数据来自当前周的WeekView。"""
+    CourseRole = Qt.ItemDataRole.UserRole  # 取格子中课程对象的数据角色
+
+    def __init__(self, day_names, parent=None):
+        """初始化课程表网格数据模型。"""
+        super().__init__(parent)
+        self.day_names = day_names[:config.WEEKLY_CLASS_DAYS]
+        self.week_view = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else config.MAX_DAILY_SECTIONS
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.day_names)
+
+    def course_at(self, index):
+        """返回从该格子开始的课程。"""
+        if self.week_view is None or not index.isValid():
+            return None
+        return self.week_view.course_at(index.column(), index.row() + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        course = self.course_at(index)
+        if course is None:
+            return None
+        if role == self.CourseRole:
+            return course
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return f"{course.name}\n{course.teacher}\n{course.classroom}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return render_resources.color(course.color)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.day_names[section] if section < len(self.day_names) else None
+        return f"第{section + 1}节"
+
+    def set_week_view(self, week_view):
+        """切换到新的周视图，只为内容变化的格子发出dataChanged，返回变化的格子列表。"""
+        old_cells = self.week_view.cells if self.week_view is not None else {}
+        self.week_view = week_view
+        changed = [
+            cell for cell in old_cells.keys() | week_view.cells.keys()
+            if old_cells.get(cell) is not week_view.cells.get(cell)
+        ]
+        for day, section in changed:
+            if day < len(self.day_names) and section <= config.MAX_DAILY_SECTIONS:
+                index = self.index(section - 1, day)
+                self.dataChanged.emit(index, index)
+        return changed
+
+# 绘制资源缓存类
+class RenderResources:
+    """课程格子绘制共享的资源缓存：复用颜色、画刷和字体对象，以及排好版的文字和绘制好的格子图像。"""
+
+    def __init__(self, capacity=config.RENDER_CACHE_SIZE):
+        """初始化绘制资源缓存。"""
+        self.capacity = capacity  # 排版文字和格子图像各自最多缓存的数量
+        self._colors = {}
+        self._brushes = {}
+        self._fonts = {}
+        self._static_texts = OrderedDict()
+        self._pixmaps = OrderedDict()
+
+    def clear(self):
+        """清空所有缓存。"""
+        self._colors.clear()
+        self._brushes.clear()
+        self._fonts.clear()
+        self._static_texts.clear()
+        self._pixmaps.clear()
+
+    def _cached(self, cache, key, create):
+        """从按最近使用顺序淘汰的缓存中取值，不存在时创建。"""
+        value = cache.get(key)
+        if value is None:
+            value = create()
+            cache[key] = value
+            if len(cache) > self.capacity:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def color(self, name):
+        """返回颜色名称对应的共享QColor。"""
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QColor(name)
+        return color
+
+    def brush(self, name):
+        """返回颜色名称对应的共享QBrush。"""
+        brush = self._brushes.get(name)
+        if brush is None:
+            brush = self._brushes[name] = QBrush(self.color(name))
+        return brush
+
+    def font(self, family, point_size=None, bold=False):
+        """返回共享的QFont，family可以是字体名称或作为基础的QFont。"""
+        key = (family if isinstance(family, str) else family.key(), point_size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = QFont(family)
+            if point_size is not None:
+                font.setPointSize(point_size)
+            font.setBold(bold)
+            self._fonts[key] = font
+        return font
+
+    def layout_font(self, font):
+        """返回按像素大小固定字号的字体，使排版结果在屏幕、图片和打印机等不同分辨率的设备上大小一致。"""
+        key = ('layout', font.key())
+        layout_font = self._fonts.get(key)
+        if layout_font is None:
+            layout_font = QFont(font)
+            layout_font.setPixelSize(QFontInfo(font).pixelSize())
+            self._fonts[key] = layout_font
+        return layout_font
+
+    def static_text(self, text, width, font):
+        """返回按指定宽度和字体排好版、水平居中并自动换行的QStaticText。"""
+        def create():
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.setTextWidth(width)
+            option = QTextOption(Qt.AlignmentFlag.AlignHCenter)
+            option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+            static_text.setTextOption(option)
+            static_text.prepare(QTransform(), font)
+            return static_text
+        return self._cached(self._static_texts, (text, width, font.key()), create)
+
+    @staticmethod
+    def content_key(course):
+        """返回决定课程格子外观的内容。"""
+        return (course.name, course.teacher, course.classroom, course.color)
+
+    def cell_pixmap(self, course, size, ratio, font, text_color, cache=True):
+        """返回绘制好的课程格子图像，按（课程内容, 格子大小, 设备像素比）复用，cache为False时不放入缓存。"""
+        def create():
+            pixmap = QPixmap(size * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            paint_course_cell(painter, QRectF(0, 0, size.width(), size.height()), course, font, text_color)
+            painter.end()
+            return pixmap
+        if not cache:
+            return create()
+        key = (self.content_key(course), size.width(), size.height(), ratio, font.key(), text_color.rgba())
+        return self._cached(self._pixmaps, key, create)
+
+# 全局共享的绘制资源缓存
+render_resources = RenderResources()
+
+# 后台绘制线程各自使用的绘制资源缓存
+_thread_render_resources = threading.local()
+
+def current_render_resources():
+    """返回当前线程使用的绘制资源缓存：主线程使用全局缓存，后台绘制线程各自使用独立的缓存。"""
+    if threading.current_thread() is threading.main_thread():
+        return render_resources
+    resources = getattr(_thread_render_resources, 'resources', None)
+    if resources is None:
+        resources = _thread_render_resources.resources = RenderResources()
+    return resources
+
+# 绘制课程文字：课程名称（加粗）、教师和教室三行整体垂直居中
+def draw_course_text(painter, rect, course, font):
+    """在painter的rect区域内绘制课程文字，使用缓存的排版结果。"""
+    resources = current_render_resources()
+    width = rect.width()
+    font = resources.layout_font(font)
+    name_font = resources.font(font, bold=True)
+    lines = [
+        (resources.static_text(course.name, width, name_font), name_font),
+        (resources.static_text(course.teacher, width, font), font),
+        (resources.static_text(course.classroom, width, font), font),
+    ]
+    top = rect.top() + max(0, (rect.height() - sum(text.size().height() for text, _ in lines)) / 2)
+    for text, line_font in lines:
+        painter.setFont(line_font)
+        painter.drawStaticText(QPointF(rect.left(), top), text)
+        top += text.size().height()
+
+# 绘制课程格子：背景色和课程文字
+def paint_course_cell(painter, rect, course, font, text_color):
+    """在painter的rect区域内绘制课程格子的内容。"""
+    painter.fillRect(rect, current_render_resources().color(course.color))
+    painter.setPen(text_color)
+    draw_course_text(painter, QRectF(rect).adjusted(2, 2, -2, -2), course, font)
+
+# 单周网格渲染结果类
+class WeekRender:
+    """某一周课程表网格的渲染结果：周视图、合并单元格和已绘制好的课程格子图像。"""
+    __slots__ = ('week_view', 'spans', 'pixmaps')
+
+    def __init__(self, week_view, spans):
+        """初始化单周网格渲染结果。"""
+        self.week_view = week_view
+        self.spans = spans  # (行, 列) -> 合并的行数
+        self.pixmaps = {}  # (行, 列) -> 绘制好的课程格子
+
+# 网格渲染缓存类
+class WeekRenderCache:
+    """按（周次, 该周的内容, 视口大小）缓存最近显示过的周的渲染结果，超出容量时淘汰最久未使用的周。"""
+
+    def __init__(self, capacity=config.WEEK_RENDER_CACHE_SIZE):
+        """初始化网格渲染缓存。"""
+        self.capacity = capacity
+        self._renders = OrderedDict()
+
+    def get(self, key):
+        """返回缓存的渲染结果，不存在时返回None。"""
+        render = self._renders.get(key)
+        if render is not None:
+            self._renders.move_to_end(key)
+        return render
+
+    def put(self, key, render):
+        """缓存渲染结果。"""
+        self._renders[key] = render
+        self._renders.move_to_end(key)
+        while len(self._renders) > self.capacity:
+            self._renders.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._renders
+
+    def clear(self):
+        """清空缓存。"""
+        self._renders.clear()
+
+# 课程格子绘制代理类
+class CourseCellDelegate(QStyledItemDelegate):
+    """直接在课程表网格中绘制课程格子：背景色、课程名称、教师和教室。"""
+
+    def paint(self, painter, option, index):
+        course = index.data(ScheduleTableModel.CourseRole)
+        if course is None:
+            super().paint(painter, option, index)
+            return
+        # 课程格子的内容由视图缓存为图像，翻页回到看过的周时直接复用
+        rect = option.rect
+        pixmap = self.parent().cell_pixmap(index.row(), index.column(), rect.size(), course)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.save()
+            painter.setPen(option.palette.highlight().color())
+            painter.drawRect(rect.adjusted(1, 1, -2, -2))
+            painter.restore()
+
+# 课程表网格视图类
+class ScheduleTableView(QTableView):
+    """课程表网格视图，跨多节的课程用合并单元格显示，最近显示过的周的渲染结果会被缓存。"""
+
+    def __init__(self, model, courses, parent=None):
+        """初始化课程表网格视图。"""
+        super().__init__(parent)
+        self.courses = courses
+        self.setModel(model)
+        self.setItemDelegate(CourseCellDelegate(self))
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        header_font = QFont()
+        header_font.setBold(True)
+        self.horizontalHeader().setFont(header_font)
+        self.verticalHeader().setFont(header_font)
+        self.setStyleSheet("QHeaderView::section {background-color: #f0f0f0; border: 1px solid #ccc;}")
+        self._spans = {}  # (行, 列) -> 合并的行数
+        self.render_cache = WeekRenderCache()
+        self.current_render = None
+        # 空闲时预先渲染相邻的周
+        self._prefetch_weeks = []
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setInterval(0)
+        self._prefetch_timer.timeout.connect(self._prefetch_next)
+        # 拖动窗口大小时等大小稳定后再按新大小重新渲染
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(config.RESIZE_RENDER_DELAY_MS)
+        self._resize_timer.timeout.connect(self._on_resize_settled)
+
+    def render_key(self, week_view):
+        """返回周视图在渲染缓存中的键，修改其他周的课程不会使这一周的缓存失效。"""
+        size = self.viewport().size()
+        return (week_view.week, week_view.content_key(), size.width(), size.height())
+
+    def week_render(self, week):
+        """返回指定周的渲染结果，缓存中没有时新建。"""
+        week_view = self.courses.week_view(week)
+        key = self.render_key(week_view)
+        render = self.render_cache.get(key)
+        if render is None:
+            render = WeekRender(week_view, self._spans_for(week_view))
+            self.render_cache.put(key, render)
+        else:
+            # 内容相同，但格子数据要使用最新的课程对象
+            render.week_view = week_view
+        return render
+
+    def show_week(self, week):
+        """显示指定周（从0开始）的课程表，并在空闲时预先渲染前后两周。"""
+        self._show_render(self.week_render(week))
+        self._prefetch_weeks = [w for w in (week + 1, week - 1) if 0 <= w < config.TOTAL_WEEKS]
+        self._prefetch_timer.start()
+
+    def _show_render(self, render):
+        """切换到新的渲染结果，只更新内容或合并范围发生变化的格子。"""
+        self.current_render = render
+        changed = self.model().set_week_view(render.week_view)
+        if not changed:
+            return
+        new_spans = render.spans
+        # 先取消所有变化了的旧合并，再设置新的合并；新合并可能落在别的格子的旧合并范围内，
+        # 旧合并没有全部取消之前设置会因为重叠被Qt拒绝
+        for (row, column), old_span in self._spans.items():
+            if new_spans.get((row, column), 1) != old_span:
+                self.setSpan(row, column, 1, 1)
+        for (row, column), new_span in new_spans.items():
+            if self._spans.get((row, column), 1) != new_span:
+                self.setSpan(row, column, new_span, 1)
+        self._spans = new_spans
+
+    def cell_pixmap(self, row, column, size, course):
+        """返回当前周指定格子绘制好的图像，大小不符时从共享缓存中重新取得。"""
+        # 与预取使用相同的字体和文字颜色，保证缓存的图像与实时绘制的一致
+        render = self.current_render
+        ratio = self.devicePixelRatioF()
+        pixmap = render.pixmaps.get((row, column)) if render is not None else None
+        if pixmap is None or pixmap.size() != size * ratio:
+            # 正在拖动窗口大小时的中间大小不会再用到，不放入缓存
+            resizing = self._resize_timer.isActive()
+            pixmap = render_resources.cell_pixmap(
+                course, size, ratio, self.font(), self.palette().text().color(), cache=not resizing
+            )
+            if render is not None and not resizing:
+                render.pixmaps[(row, column)] = pixmap
+        return pixmap
+
+    def _prefetch_next(self):
+        """空闲时渲染一个待预取的周：计算合并单元格并绘制所有课程格子。"""
+        if not self._prefetch_weeks:
+            self._prefetch_timer.stop()
+            return
+        week = self._prefetch_weeks.pop(0)
+        if self.render_key(self.courses.week_view(week)) in self.render_cache:
+            return
+        render = self.week_render(week)
+        text_color = self.palette().text().color()
+        ratio = self.devicePixelRatioF()
+        for (day, section), course in render.week_view.cells.items():
+            row = section - 1
+            if day >= self.model().columnCount() or row >= self.model().rowCount():
+                continue
+            span = render.spans.get((row, day), 1)
+            height = sum(self.rowHeight(r) for r in range(row, min(row + span, self.model().rowCount())))
+            size = QSize(self.columnWidth(day), height)
+            render.pixmaps[(row, day)] = render_resources.cell_pixmap(course, size, ratio, self.font(), text_color)
+
+    def resizeEvent(self, event):
+        """视口大小变化后，等大小稳定时当前周再改用新大小对应的渲染结果。"""
+        super().resizeEvent(event)
+        if self.current_render is not None:
+            self._prefetch_timer.stop()
+            self._resize_timer.start()
+
+    def _on_resize_settled(self):
+        """窗口大小稳定后按新大小渲染当前周并重新预取相邻的周。"""
+        if self.current_render is not None:
+            self.show_week(self.current_render.week_view.week)
+
+    def _spans_for(self, week_view):
+        """计算周视图中每门课程的合并单元格，跳过与上方课程重叠的格子。"""
+        spans = {}
+        covered_until = {}  # 列 -> 已被合并覆盖到的行
+        for (day, section) in sorted(week_view.cells, key=lambda cell: (cell[0], cell[1])):
+            if day >= self.model().columnCount():
+                continue
+            course = week_view.cells[(day, section)]
+            row = section - 1
+            if row <= covered_until.get(day, -1):
+                continue
+            end_row = min(course.end_section, config.MAX_DAILY_SECTIONS) - 1
+            covered_until[day] = end_row
+            if end_row > row:
+                spans[(row, day)] = end_row - row + 1
+        return spans
+
+# 课程列表数据模型类
+class CourseListModel(QAbstractListModel):
+    """课程列表的数据模型，直接读取CourseStore，并根据课程变化通知增删改对应的行。"""
+    CourseRole = Qt.ItemDataRole.UserRole  # 取列表项中课程对象的数据角色
+
+    def __init__(self, courses, day_names, parent=None, update_match=None):
+        """初始化课程列表数据模型，update_match在课程新增或修改、发出行变化通知之前以课程调用。"""
+        super().__init__(parent)
+        self.courses = courses
+        self.day_names = day_names
+        self.update_match = update_match
+        self._ids = []  # 行号 -> 课程ID，与CourseStore中的顺序一致
+        self._rows = {}  # 课程ID -> 行号，_stale_from及之后的行号在删除行后尚未更新
+        self._stale_from = 0
+        self._reset_rows()
+        courses.course_added.connect(self.on_course_added)
+        courses.course_changed.connect(self.on_course_changed)
+        courses.course_removed.connect(self.on_course_removed)
+        courses.courses_reset.connect(self.on_courses_reset)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def _reset_rows(self):
+        """按CourseStore中的顺序重建行号。"""
+        self._ids = [course.id for course in self.courses]
+        self._rows = {course_id: row for row, course_id in enumerate(self._ids)}
+        self._stale_from = len(self._ids)
+
+    def row_of(self, course_id):
+        """返回课程所在的行号，删除行之后的行号到下次查找到这些行时才重新编号。"""
+        row = self._rows[course_id]
+        if row < self._stale_from:
+            return row
+        for row in range(self._stale_from, len(self._ids)):
+            self._rows[self._ids[row]] = row
+        self._stale_from = len(self._ids)
+        return self._rows[course_id]
+
+    def course_at_row(self, row):
+        """返回指定行的课程。"""
+        return self.courses.get(self._ids[row])
+
+    def course_at(self, index):
+        """返回指定索引的课程。"""
+        return self.course_at_row(index.row()) if index.isValid() else None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        course = self.course_at_row(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            day_name = self.day_names[course.day] if 0 <= course.day < len(self.day_names) else ""
+            text = f"{day_name} {course.start_section}-{course.end_section}节: {course.name} - {course.teacher} ({course.classroom})"
+            if course.active_weeks != Course.ALL_WEEKS:
+                text += f" [{course.weeks_text()}]"
+            return text
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return render_resources.brush(course.color)
+        if role == self.CourseRole:
+            return course
+        return None
+
+    def on_course_added(self, course):
+        """在末尾插入新课程的行。"""
+        if self.update_match is not None:
+            self.update_match(course)
+        row = len(self._ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(course.id)
+        self._rows[course.id] = row
+        self.endInsertRows()
+
+    def on_course_changed(self, old_course, new_course):
+        """通知视图修改过的课程所在的行需要重绘。"""
+        if self.update_match is not None:
+            self.update_match(new_course)
+        index = self.index(self.row_of(new_course.id))
+        self.dataChanged.emit(index, index)
+
+    def on_course_removed(self, course):
+        """移除被删除课程的行。"""
+        row = self.row_of(course.id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        del self._rows[course.id]
+        self._stale_from = min(self._stale_from, row)
+        self.endRemoveRows()
+
+    def on_courses_reset(self):
+        """全部课程被替换后重置模型。"""
+        self.beginResetModel()
+        self._reset_rows()
+        self.endResetModel()
+
+# 课程列表搜索过滤模型类
+class CourseFilterProxyModel(QSortFilterProxyModel):
+    """按搜索条件过滤课程列表。"""
+
+    def __init__(self, parent=None):
+        """初始化课程列表搜索过滤模型。"""
+        super().__init__(parent)
+        self.search_text = ""
+        self.matched_ids = None  # 搜索得到的匹配课程ID集合，为None时显示全部课程
+        self.ranks = None  # 课程ID -> 排序分数，为None时保持原有顺序
+
+    def set_filter(self, search_text, matched_ids, ranks=None):
+        """设置搜索文本、对应的匹配课程ID集合和可选的排序分数，并重新过滤。"""
+        self.search_text = search_text
+        self.matched_ids = matched_ids if search_text else None
+        self.ranks = ranks if search_text else None
+        # 有排序分数时按分数排序，否则恢复源模型的顺序
+        self.sort(0 if self.ranks is not None else -1)
+        self.invalidate()
+
+    def set_match(self, course_id, rank):
+        """课程新增或修改时更新匹配结果，rank为None表示不匹配，需在源模型发出变化通知之前调用。"""
+        if self.matched_ids is None:
+            return
+        if rank is None:
+            self.matched_ids.discard(course_id)
+            if self.ranks is not None:
+                self.ranks.pop(course_id, None)
+        else:
+            self.matched_ids.add(course_id)
+            if self.ranks is not None:
+                self.ranks[course_id] = rank
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matched_ids is None:
+            return True
+        return self.sourceModel().course_at_row(source_row).id in self.matched_ids
+
+    def lessThan(self, left, right):
+        if self.ranks is None:
+            return left.row() < right.row()
+        source_model = self.sourceModel()
+        left_rank = self.ranks.get(source_model.course_at_row(left.row()).id, 0)
+        right_rank = self.ranks.get(source_model.course_at_row(right.row()).id, 0)
+        # 分数相同的课程保持原有顺序
+        return (left_rank, left.row()) < (right_rank, right.row())
+
+    def course_at(self, index):
+        """返回过滤后列表中指定索引的课程。"""
+        return self.sourceModel().course_at(self.mapToSource(index)) if index.isValid() else None
+
+# 绘制一页课程表：标题、日期、星期×节次网格和页脚，打印和导出共用
+def render_schedule_page(painter, paper_rect, week_view, week_name, day_names=DAY_NAMES):
+    """用painter在paper_rect区域内绘制指定周的课程表。"""
+    # 添加边距，确保内容不紧贴页面边缘
+    margin = 20
+    content_rect = QRectF(
+        paper_rect.left() + margin,
+        paper_rect.top() + margin,
+        paper_rect.width() - 2 * margin,
+        paper_rect.height() - 2 * margin
+    )
+    
+    # 设置字体
+    font = QFont(config.DEFAULT_FONT)
+    font.setPointSize(12)
+    painter.setFont(font)
+    
+    # 绘制标题
+    title = f"{config.APP_NAME} - {week_name}"
+    title_rect = QRectF(content_rect)
+    title_rect.setHeight(40)
+    painter.drawText(title_rect, Qt.AlignmentFlag.AlignCenter, title)
+    
+    # 绘制日期
+    date_str = QDate.currentDate().toString("yyyy年MM月dd日")
+    date_rect = QRectF(content_rect)
+    date_rect.setTop(content_rect.top() + 40)
+    date_rect.setHeight(20)
+    painter.drawText(date_rect, Qt.AlignmentFlag.AlignCenter, date_str)
+    
+    # 创建课程表网格
+    table_rect = QRectF(content_rect)
+    table_rect.setTop(content_rect.top() + 70)
+    table_rect.setBottom(content_rect.bottom() - 30)
+    
+    # 计算单元格大小
+    cell_width = table_rect.width() / (config.WEEKLY_CLASS_DAYS + 1)
+    cell_height = table_rect.height() / (config.MAX_DAILY_SECTIONS + 1)
+    
+    # 绘制表头和网格
+    # 左上角空白
+    header_font = QFont(config.DEFAULT_FONT)
+    header_font.setBold(True)
+    painter.setFont(header_font)
+    
+    # 星期表头
+    for day_idx, day_name in enumerate(day_names[:config.WEEKLY_CLASS_DAYS]):
+        rect = QRectF(table_rect.left() + cell_width * (day_idx + 1), table_rect.top(), cell_width, cell_height)
+        painter.drawRect(rect)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, day_name)
+    
+    # 节次和课程单元格
+    resources = current_render_resources()
+    normal_font = resources.font(config.DEFAULT_FONT, 50)  # 增大字体大小以提高可读性
+    painter.setFont(normal_font)
+    
+    for section in range(1, config.MAX_DAILY_SECTIONS + 1):
+        # 节次标签
+        painter.setFont(header_font)
+        rect = QRectF(table_rect.left(), table_rect.top() + cell_height * section, cell_width, cell_height)
+        painter.drawRect(rect)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, f"第{section}节")
+        painter.setFont(normal_font)
+        
+        # 每天的课程单元格
+        for day_idx in range(config.WEEKLY_CLASS_DAYS):
+            # 从当前周视图中查找从该节次开始的课程
+            course = week_view.course_at(day_idx, section)
+            
+            rect = QRectF(table_rect.left() + cell_width * (day_idx + 1), table_rect.top() + cell_height * section, cell_width, cell_height)
+            painter.drawRect(rect)
+            
+            if course:
+                # 计算课程单元格的实际大小
+                rowspan = course.end_section - course.start_section + 1
+                course_rect = QRectF(
+                    table_rect.left() + cell_width * (day_idx + 1), 
+                    table_rect.top() + cell_height * section, 
+                    cell_width, 
+                    cell_height * rowspan
+                )
+                
+                # 绘制课程背景
+                painter.save()
+                painter.setBrush(resources.brush(course.color))
+                painter.setOpacity(0.7)
+                painter.drawRect(course_rect)
+                painter.restore()
+                
+                # 绘制课程信息，复用缓存的文字排版
+                painter.save()
+                draw_course_text(painter, course_rect.adjusted(5, 5, -5, -5), course, normal_font)
+                painter.restore()
+                
+                # 绘制课程边框
+                painter.drawRect(course_rect)
+    
+    # 绘制页脚
+    footer_font = QFont(config.DEFAULT_FONT)
+    footer_font.setPointSize(8)
+    painter.setFont(footer_font)
+    footer_rect = QRectF(paper_rect)
+    footer_rect.setTop(paper_rect.bottom() - 30)
+    footer_rect.setHeight(20)
+    painter.drawText(footer_rect, Qt.AlignmentFlag.AlignRight, f"{config.APP_NAME} 版本 {config.VERSION}")
+
+# 计算一页上多周课程表的排列方式
+def page_grid(count, width, height):
+    """返回（列数, 行数），使每周所占区域的长宽比最接近页面本身，例如A4纵向每页2周时上下排列。"""
+    page_ratio = max(width, height) / max(min(width, height), 1)
+    best = None
+    for columns in range(1, count + 1):
+        rows = math.ceil(count / columns)
+        cell_width, cell_height = width / columns, height / rows
+        ratio = max(cell_width, cell_height) / max(min(cell_width, cell_height), 1)
+        # 长宽比同样接近时选择空位更少的排列
+        key = (round(abs(math.log(ratio / page_ratio)), 6), columns * rows)
+        if best is None or key < best[0]:
+            best = (key, columns, rows)
+    return best[1], best[2]
+
+# 在一页上绘制一周或几周课程表
+def render_schedule_weeks(painter, page_rect, weeks, day_names=DAY_NAMES):
+    """在page_rect区域内绘制weeks中的（周视图, 周名称），多周时按page_grid排列并等比缩小。"""
+    if len(weeks) == 1:
+        week_view, week_name = weeks[0]
+        render_schedule_page(painter, page_rect, week_view, week_name, day_names)
+        return
+    columns, rows = page_grid(len(weeks), page_rect.width(), page_rect.height())
+    width = page_rect.width() / columns
+    height = page_rect.height() / rows
+    # 按短边缩小，每周的版面仍然是完整的一页，只是方向可能与页面不同
+    scale = min(width, height) / min(page_rect.width(), page_rect.height())
+    for i, (week_view, week_name) in enumerate(weeks):
+        painter.save()
+        painter.translate(page_rect.left() + width * (i % columns), page_rect.top() + height * (i // columns))
+        painter.scale(scale, scale)
+        render_schedule_page(painter, QRectF(0, 0, width / scale, height / scale), week_view, week_name, day_names)
+        painter.restore()
+
+# 把一周或几周课程表绘制为一页图像
+def render_schedule_image(weeks, day_names=DAY_NAMES, dpi=config.EXPORT_DPI):
+    """把weeks中的（周视图, 周名称）绘制为一张A4大小、白色背景的图像。"""
+    image = QImage(QPageSize(QPageSize.A4).sizePixels(dpi), QImage.Format_ARGB32)
+    # 设置图像分辨率，使字体按打印时的比例绘制
+    dots_per_meter = round(dpi / 0.0254)
+    image.setDotsPerMeterX(dots_per_meter)
+    image.setDotsPerMeterY(dots_per_meter)
+    image.fill(Qt.GlobalColor.white)
+    painter = QPainter(image)
+    render_schedule_weeks(painter, QRectF(0, 0, image.width(), image.height()), weeks, day_names)
+    painter.end()
+    return image
+
+# 把课程表用矢量绘制输出到打印机或预览
+def paint_schedule_pages(printer, pages, day_names=DAY_NAMES):
+    """把pages中的每一页直接绘制到printer上，每一项是一页要绘制的（周视图, 周名称）列表。"""
+    painter = QPainter(printer)
+    page_rect = QRectF(0, 0, printer.width(), printer.height())
+    for page, weeks in enumerate(pages):
+        if page:
+            printer.newPage()
+        render_schedule_weeks(painter, page_rect, weeks, day_names)
+    painter.end()
+
+# 把绘制好的页面图像按比例缩放后画到页面上
+def paint_page_image(painter, page_rect, image):
+    """把一页图像保持长宽比缩放到page_rect中，从左上角开始绘制。"""
+    size = QSizeF(image.size())
+    size.scale(page_rect.size(), Qt.AspectRatioMode.KeepAspectRatio)
+    painter.drawImage(QRectF(page_rect.topLeft(), size), image)
+
+# 缩小页面图像用于预览
+def scale_page_image(image, dpi, preview_dpi):
+    """把按dpi绘制的页面图像平滑缩小到preview_dpi，preview_dpi不小于dpi时原样返回。"""
+    if preview_dpi >= dpi:
+        return image
+    return image.scaled(image.size() * (preview_dpi / dpi), Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation)
+
+# 整学期课程表导出任务类
+class SemesterExportTask(QObject):
+    """把整个学期的课程表导出为多页PDF：各页图像在绘制线程池中并行绘制，由专门的写入线程按顺序逐页写入PDF后立即丢弃。"""
+    progress = pyqtSignal(int)  # 已写入的页数
+    finished = pyqtSignal(object)  # 导出的页数，取消时为None
+    failed = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, pages, file_path, executor, day_names=DAY_NAMES, dpi=config.EXPORT_DPI,
+                 max_pending=None, preview_dpi=config.PREVIEW_DPI, parent=None):
+        """初始化导出任务，pages中每一项是一页要绘制的（周视图, 周名称）列表。"""
+        super().__init__(parent)
+        self.pages = pages
+        self.file_path = file_path
+        self.temp_path = f"{file_path}.tmp"  # 先写入临时文件，完成后再替换目标文件
+        self.executor = executor
+        self.day_names = day_names
+        self.dpi = dpi
+        # 最多同时绘制或等待写入的页数，限制内存中的页面图像数量
+        self.max_pending = max_pending or config.RENDER_THREADS or os.cpu_count() or 1
+        self.preview_dpi = preview_dpi
+        self.preview_images = []  # 写入PDF时顺便缩小保存的各页图像，供打印预览直接使用
+        self._cancelled = threading.Event()
+        # 绘制完成的（页码, future），绘制线程的回调只放入队列，不加锁也不操作PDF
+        self._rendered = queue.Queue()
+        self._thread = None
+
+    def cancel(self):
+        """请求取消导出，尚未开始绘制的页面不再绘制。"""
+        self._cancelled.set()
+        self._rendered.put(None)
+
+    def start(self):
+        """开始导出，立即返回，通过finished或failed信号报告结果。"""
+        self._thread = threading.Thread(target=self._run, name="pdf-writer")
+        self._thread.start()
+
+    def _submit_page(self, page):
+        """提交一页的绘制，绘制完成后把结果放入队列。"""
+        future = self.executor.submit(render_schedule_image, self.pages[page], self.day_names, self.dpi)
+        future.add_done_callback(lambda f: self._rendered.put((page, f)))
+
+    def _run(self):
+        """在写入线程中提交各页的绘制，并按页码顺序把绘制好的页面写入PDF。"""
+        writer = None
+        painter = None
+        error = None
+        ready = {}  # 页码 -> 已绘制好、等待按顺序写入的图像
+        next_submit = next_write = 0
+        try:
+            while next_submit < min(self.max_pending, len(self.pages)):
+                self._submit_page(next_submit)
+                next_submit += 1
+            while next_write < len(self.pages) and not self._cancelled.is_set():
+                item = self._rendered.get()
+                if item is None:
+                    continue
+                page, future = item
+                ready[page] = future.result()
+                while next_write in ready:
+                    image = ready.pop(next_write)
+                    if writer is None:
+                        writer = QPdfWriter(self.temp_path)
+                        writer.setPageSize(QPageSize(QPageSize.A4))
+                        writer.setResolution(self.dpi)
+                        writer.setCreator(config.APP_NAME)
+                        painter = QPainter(writer)
+                    else:
+                        writer.newPage()
+                    paint_page_image(painter, QRectF(0, 0, writer.width(), writer.height()), image)
+                    self.preview_images.append(scale_page_image(image, self.dpi, self.preview_dpi))
+                    next_write += 1
+                    self.progress.emit(next_write)
+                    if next_submit < len(self.pages):
+                        self._submit_page(next_submit)
+                        next_submit += 1
+        except Exception as e:
+            error = str(e)
+        finally:
+            if painter is not None:
+                painter.end()
+        self._finish(None if self._cancelled.is_set() else next_write, error)
+
+    def _finish(self, page_count, error=None):
+        """结束导出：完成时替换目标文件，取消或出错时删除临时文件。"""
+        try:
+            if page_count is not None and error is None:
+                if os.path.exists(self.temp_path):
+                    os.replace(self.temp_path, self.file_path)
+            elif os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+        except OSError as e:
+            error = error or str(e)
+        if error is not None:
+            self.preview_images = []
+            self.failed.emit(error)
+        else:
+            if page_count is None:
+                self.preview_images = []
+            self.finished.emit(page_count)
+
+# 提示消息窗口类
+class ToastWidget(QWidget):
+    """屏幕右下角的非模态提示窗口，不抢占焦点，到时间后自动隐藏，点击立即关闭。"""
+    dismissed = pyqtSignal()  # 用户点击关闭了提示窗口
+
+    def __init__(self, parent=None):
+        """初始化提示消息窗口。"""
+        super().__init__(parent, Qt.Tool | Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        # 自定义QWidget子类需要此属性才会绘制样式表中的背景和边框，选择器只匹配窗口本身，不影响其中的标签
+        self.setAttribute(Qt.WA_StyledBackground)
+        self.setStyleSheet(f"ToastWidget {{ background-color: white; border: 2px solid {config.PRIMARY_COLOR}; border-radius: 6px; }}")
+        layout = QVBoxLayout(self)
+        self.title_label = QLabel()
+        self.title_label.setFont(render_resources.font(config.DEFAULT_FONT, config.FONT_SIZE + 1, bold=True))
+        self.message_label = QLabel()
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.message_label)
+        self._hide_timer = QTimer(self)
+        self._hide_timer.setSingleShot(True)
+        self._hide_timer.timeout.connect(self.hide)
+
+    def show_message(self, title, message, duration):
+        """在屏幕右下角显示消息，duration毫秒后自动隐藏。"""
+        self.title_label.setText(title)
+        self.message_label.setText(message)
+        self.adjustSize()
+        screen = QApplication.primaryScreen().availableGeometry()
+        self.move(screen.right() - self.width() - 20, screen.bottom() - self.height() - 20)
+        self.show()
+        self._hide_timer.start(duration)
+
+    def mousePressEvent(self, event):
+        """点击提示窗口时立即关闭，并通知显示队列中的下一条。"""
+        self._hide_timer.stop()
+        self.hide()
+        self.dismissed.emit()
+
+# 通知中心类
+class NotificationCenter(QObject):
+    """非阻塞的通知队列：短时间内的多条通知合并为一条，依次通过系统托盘消息或提示窗口显示，不等待用户确认。"""
+
+    def __init__(self, parent=None):
+        """初始化通知中心。"""
+        super().__init__(parent)
+        self.tray_icon = None
+        self._toast = None
+        self._pending = []  # 合并窗口内收到的（标题, 内容, 摘要）
+        self._queue = deque()  # 等待显示的（标题, 内容）
+        self._showing = False
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(config.NOTIFICATION_COALESCE_MS)
+        self._coalesce_timer.timeout.connect(self._flush_pending)
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.setInterval(config.NOTIFICATION_DURATION_MS)
+        self._display_timer.timeout.connect(self._show_next)
+
+    def set_tray_icon(self, tray_icon):
+        """设置用于显示消息的系统托盘图标。"""
+        self.tray_icon = tray_icon
+
+    def notify(self, title, message, summary=None):
+        """加入一条通知，summary是与其他通知合并显示时使用的一行摘要。"""
+        self._pending.append((title, message, summary or message.split("\n", 1)[0]))
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start()
+
+    def _flush_pending(self):
+        """把合并窗口内收到的通知合并为一条放入显示队列。"""
+        pending, self._pending = self._pending, []
+        if len(pending) == 1:
+            title, message, _ = pending[0]
+        else:
+            title = f"{pending[0][0]}（{len(pending)}条）"
+            message = "\n".join(summary for _, _, summary in pending)
+        self._queue.append((title, message))
+        if not self._showing:
+            self._show_next()
+
+    def _show_next(self):
+        """显示队列中的下一条通知，显示时间结束后再显示后面的通知。"""
+        if not self._queue:
+            self._showing = False
+            return
+        self._showing = True
+        title, message = self._queue.popleft()
+        if self.tray_icon is not None and self.tray_icon.isVisible() and QSystemTrayIcon.supportsMessages():
+            self.tray_icon.showMessage(title, message, QSystemTrayIcon.Information, config.NOTIFICATION_DURATION_MS)
+        else:
+            if self._toast is None:
+                self._toast = ToastWidget()
+                self._toast.dismissed.connect(self._on_toast_dismissed)
+            self._toast.show_message(title, message, config.NOTIFICATION_DURATION_MS)
+        self._display_timer.start()
+
+    def _on_toast_dismissed(self):
+        """提示窗口被点击关闭时不再等待显示时间结束，立即显示下一条通知。"""
+        self._display_timer.stop()
+        self._show_next()
+
+# 课程表主窗口
+class ClassTableApp(QMainWindow):
+    def __init__(self):
+        """初始化课程表应用程序的主窗口。"""
+        super().__init__()
+        self.courses = CourseStore()  # 课程数据容器，与悬浮窗口共享
+        # 订阅课程变化通知，各视图只应用变化的部分
+        self.courses.course_added.connect(self.on_course_added)
+        self.courses.course_changed.connect(self.on_course_changed)
+        self.courses.course_removed.connect(self.on_course_removed)
+        self.courses.courses_reset.connect(self.update_ui)
+        self.day_names = list(DAY_NAMES)
+        self.week_names = [f"第{i+1}周" for i in range(config.TOTAL_WEEKS)]
+        self.current_week = config.START_WEEK - 1
+        self.statistics_dirty = True  # 统计视图需要重新计算
+        self.schedule_file = config.SCHEDULE_FILE_PATH
+        self.storage = create_schedule_storage(self.schedule_file)  # 课程存储（修改日志或SQLite数据库）
+        self.persistence = PersistenceWorker(self)  # 后台持久化工作器
+        self.render_executor = ThreadPoolExecutor(max_workers=config.RENDER_THREADS, thread_name_prefix="render")  # 并行绘制导出页面
+        self.floating_window = None
+        self.tray_icon = None
+        self.notifications = NotificationCenter(self)  # 非阻塞的提醒通知
+        self.init_ui()
+        self.persistence.succeeded.connect(self.statusBar().showMessage)
+        self.persistence.failed.connect(self.on_persistence_failed)
+        self.load_schedule()
+        self.setup_reminders()
+        self.init_system_tray()
+
+    def init_ui(self):
+        self.setWindowTitle(f"{config.APP_NAME} - 版本 {config.VERSION}")
+        self.setGeometry(100, 100, config.MAIN_WINDOW_WIDTH, config.MAIN_WINDOW_HEIGHT)
+        
+        # 创建菜单栏
+        self.create_menu_bar()
+        
+        # 创建工具栏
+        self.create_tool_bar()
+        
+        # 创建状态栏
+        self.setStatusBar(QStatusBar())
+        self.statusBar().showMessage("欢迎使用智能课程表")
+        
+        # 创建中央部件
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        main_layout = QVBoxLayout(central_widget)
+        
+        # 顶部控制区域
+        control_layout = QHBoxLayout()
+        
+        # 当前周显示和切换
+        week_layout = QHBoxLayout()
+        self.prev_week_btn = QPushButton("上一周")
+        self.prev_week_btn.clicked.connect(self.prev_week)
+        self.week_label = QLabel(f"当前周: {self.week_names[self.current_week]}")
+        self.next_week_btn = QPushButton("下一周")
+        self.next_week_btn.clicked.connect(self.next_week)
+        
+        week_layout.addWidget(self.prev_week_btn)
+        week_layout.addWidget(self.week_label)
+        week_layout.addWidget(self.next_week_btn)
+        
+        # 添加课程按钮
+        self.add_course_btn = QPushButton("添加课程")
+        self.add_course_btn.clicked.connect(self.add_course)
+        
+        # 日历组件
+        self.calendar = QCalendarWidget()
+        self.calendar.setMaximumHeight(200)
+        self.calendar.clicked[QDate].connect(self.on_date_selected)
+        
+        # 设置当前日期为选中状态
+        self.calendar.setSelectedDate(QDate.currentDate())
+        
+        # 将组件添加到控制布局
+        control_layout.addLayout(week_layout)
+        control_layout.addWidget(self.add_course_btn)
+        control_layout.addWidget(self.calendar)
+        control_layout.addStretch()
+        
+        main_layout.addLayout(control_layout)
+        
+        # 创建选项卡
+        self.tab_widget = QTabWidget()
+        
+        # 创建课程表视图
+        self.schedule_model = ScheduleTableModel(self.day_names, self)
+        self.schedule_view = ScheduleTableView(self.schedule_model, self.courses)
+        self.schedule_view.doubleClicked.connect(self.on_schedule_cell_double_clicked)
+        self.schedule_view.customContextMenuRequested.connect(self.on_schedule_context_menu)
+        self.tab_widget.addTab(self.schedule_view, "课程表视图")
+        
+        # 创建课程列表视图
+        # 课程列表模型在发出行变化通知之前更新搜索匹配结果，不依赖信号的连接顺序
+        self.course_list_model = CourseListModel(self.courses, self.day_names, self, self.update_search_match)
+        self.course_filter_model = CourseFilterProxyModel(self)
+        self.course_filter_model.setSourceModel(self.course_list_model)
+        self.course_list_view = QListView()
+        self.course_list_view.setModel(self.course_filter_model)
+        # 所有行高度相同，视图只需布局和绘制可见的行
+        self.course_list_view.setUniformItemSizes(True)
+        self.course_list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # 双击和右键菜单只连接一次
+        self.course_list_view.doubleClicked.connect(
+            lambda index: self.edit_course(self.course_filter_model.course_at(index))
+        )
+        self.course_list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.course_list_view.customContextMenuRequested.connect(self.show_list_context_menu)
+        self.tab_widget.addTab(self.course_list_view, "课程列表")
+        
+        # 创建统计视图
+        self.statistics_widget = QWidget()
+        self.statistics_layout = QVBoxLayout(self.statistics_widget)
+        self.init_statistics_tab()
+        self.tab_widget.addTab(self.statistics_widget, "课程统计")
+        
+        main_layout.addWidget(self.tab_widget)
+        
+        # 初始化课程表网格
+        self.init_schedule_grid()
+        
+        # 连接选项卡切换信号
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+
+    def create_menu_bar(self):
+        """创建应用程序的菜单栏。"""
+        menubar = self.menuBar()
+        
+        # 文件菜单
+        file_menu = menubar.addMenu("文件")
+        
+        save_action = QAction("保存课程表", self)
+        save_action.triggered.connect(self.save_schedule)
+        file_menu.addAction(save_action)
+        
+        load_action = QAction("加载课程表", self)
+        load_action.triggered.connect(self.load_schedule)
+        file_menu.addAction(load_action)
+        
+        file_menu.addSeparator()
+        
+        import_action = QAction("导入课程表", self)
+        import_action.triggered.connect(self.import_schedule)
+        file_menu.addAction(import_action)
+        
+        export_action = QAction("导出课程表", self)
+        export_action.triggered.connect(self.export_schedule)
+        file_menu.addAction(export_action)
+        
+        export_ics_action = QAction("导出到日历(ICS)", self)
+        export_ics_action.triggered.connect(self.export_ics)
+        file_menu.addAction(export_ics_action)
+        
+        file_menu.addSeparator()
+        
+        load_example_action = QAction("加载示例课程表", self)
+        load_example_action.triggered.connect(self.load_example_schedule)
+        file_menu.addAction(load_example_action)
+        
+        file_menu.addSeparator()
+        
+        print_action = QAction("打印课程表", self)
+        print_action.triggered.connect(self.print_schedule)
+        file_menu.addAction(print_action)
+        
+        export_semester_action = QAction("导出整个学期(PDF)", self)
+        export_semester_action.triggered.connect(self.export_semester_pdf)
+        file_menu.addAction(export_semester_action)
+        
+        file_menu.addSeparator()
+        
+        exit_action = QAction("退出", self)
+        exit_action.triggered.connect(lambda: self.close())
+        file_menu.addAction(exit_action)
+        
+        # 编辑菜单
+        edit_menu = menubar.addMenu("编辑")
+        
+        add_action = QAction("添加课程", self)
+        add_action.triggered.connect(self.add_course)
+        edit_menu.addAction(add_action)
+        
+        edit_action = QAction("编辑课程", self)
+        edit_action.triggered.connect(self.edit_selected_course)
+        edit_menu.addAction(edit_action)
+        
+        delete_action = QAction("删除课程", self)
+        delete_action.triggered.connect(self.delete_selected_course)
+        edit_menu.addAction(delete_action)
+        
+        # 视图菜单
+        view_menu = menubar.addMenu("视图")
+        
+        for i, week_name in enumerate(self.week_names):
+            week_action = QAction(week_name, self)
+            week_action.setCheckable(True)
+            if i == self.current_week:
+                week_action.setChecked(True)
+            week_action.triggered.connect(lambda checked, idx=i: self.set_week(idx))
+            view_menu.addAction(week_action)
+        
+        # 帮助菜单
+        help_menu = menubar.addMenu("帮助")
+        
+        about_action = QAction("关于", self)
+        about_action.triggered.connect(self.show_about)
+        help_menu.addAction(about_action)
+        
+        update_log_action = QAction("更新日志", self)
+        update_log_action.triggered.connect(self.show_update_log)
+        help_menu.addAction(update_log_action)
+
+    def create_tool_bar(self):
+        """创建应用程序的工具栏。"""
+        toolbar = QToolBar("工具栏")
+        self.addToolBar(toolbar)
+        
+        add_action = QAction("添加课程", self)
+        add_action.triggered.connect(self.add_course)
+        toolbar.addAction(add_action)
+        
+        edit_action = QAction("编辑课程", self)
+        edit_action.triggered.connect(self.edit_selected_course)
+        toolbar.addAction(edit_action)
+        
+        delete_action = QAction("删除课程", self)
+        delete_action.triggered.connect(self.delete_selected_course)
+        toolbar.addAction(delete_action)
+        
+        toolbar.addSeparator()
+        
+        save_action = QAction("保存", self)
+        save_action.triggered.connect(self.save_schedule)
+        toolbar.addAction(save_action)
+        
+        load_action = QAction("加载", self)
+        load_action.triggered.connect(self.load_schedule)
+        toolbar.addAction(load_action)
+        
+        toolbar.addSeparator()
+        
+        # 搜索框
+        self.search_label = QLabel("搜索:")
+        toolbar.addWidget(self.search_label)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("按课程名、教师、教室搜索...")
+        # 输入停顿后再执行搜索，避免每输入一个字符都过滤一次
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(config.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_courses)
+        self.search_edit.textChanged.connect(lambda: self.search_timer.start())
+        toolbar.addWidget(self.search_edit)
+        # 搜索模式：按原文包含匹配，或按拼音、首字母和模糊匹配并排序
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItems(["包含", "拼音/模糊"])
+        self.search_mode_combo.currentIndexChanged.connect(self.search_courses)
+        self.search_mode_action = toolbar.addWidget(self.search_mode_combo)
+        
+        # 默认隐藏搜索框
+        self.search_label.hide()
+        self.search_edit.hide()
+        self.search_mode_action.setVisible(False)
+
+    def init_schedule_grid(self):
+        """刷新课程表网格：显示当前周的渲染结果，看过的周直接从缓存取出，只重绘内容变化的格子。"""
+        self.schedule_view.show_week(self.current_week)
+
+    def on_schedule_cell_double_clicked(self, index):
+        """双击课程表格子时编辑其中的课程。"""
+        course = self.schedule_model.course_at(index)
+        if course:
+            self.edit_course(course)
+
+    def on_schedule_context_menu(self, position):
+        """在课程表格子上右键时显示课程菜单。"""
+        course = self.schedule_model.course_at(self.schedule_view.indexAt(position))
+        if course:
+            self.show_course_context_menu(self.schedule_view.viewport().mapToGlobal(position), course)
+
+    def on_course_added(self, course):
+        """新增课程后只更新受影响的周和统计数据，课程列表和搜索匹配结果由其模型自行更新。"""
+        self.refresh_schedule_grid(course.weeks)
+        self.invalidate_statistics()
+
+    def on_course_changed(self, old_course, new_course):
+        """课程修改后只更新新旧时间段所在的周和统计数据。"""
+        self.refresh_schedule_grid(old_course.weeks | new_course.weeks)
+        self.invalidate_statistics()
+
+    def on_course_removed(self, course):
+        """删除课程后只更新受影响的周和统计数据。"""
+        self.refresh_schedule_grid(course.weeks)
+        self.invalidate_statistics()
+
+    def refresh_schedule_grid(self, weeks):
+        """修改涉及当前显示的周时刷新课程表网格。"""
+        if weeks >> self.current_week & 1:
+            self.init_schedule_grid()
+
+    def invalidate_statistics(self):
+        """标记统计数据需要重新计算，统计视图正在显示时立即更新。"""
+        self.statistics_dirty = True
+        if self.tab_widget.currentIndex() == 2:
+            self.update_statistics()
+
+    def add_course(self):
+        """添加新课程到课程表中。"""
+        dialog = AddCourseDialog(self, day_names=self.day_names)
+        if dialog.exec_():
+            course = dialog.get_course_data()
+            
+            # 检查课程冲突
+            if self.check_course_conflict(course):
+                reply = QMessageBox.question(
+                    self, "课程冲突", "该时间段已有课程安排，是否继续添加？",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+                )
+                if reply == QMessageBox.No:
+                    return
+            
+            self.courses.add(course)
+            self.record_change('add', course)
+            self.statusBar().showMessage(f"已添加课程: {course.name}")
+
+    def edit_course(self, course):
+        """编辑选中的课程信息。"""
+        dialog = AddCourseDialog(self, course, self.day_names)
+        if dialog.exec_():
+            new_course = dialog.get_course_data()
+            
+            # 检查课程冲突（排除当前正在编辑的课程）
+            if self.check_course_conflict(new_course, exclude_id=course.id):
+                reply = QMessageBox.question(
+                    self, "课程冲突", "该时间段已有课程安排，是否继续修改？",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+                )
+                if reply == QMessageBox.No:
+                    return
+            
+            # 替换课程（保留原课程ID）
+            self.courses.update(course.id, new_course)
+            self.record_change('update', new_course)
+            self.statusBar().showMessage(f"已更新课程: {new_course.name}")
+
+    def delete_course(self, course):
+        """从课程表中删除选中的课程。"""
+        reply = QMessageBox.question(
+            self, "确认删除", f"确定要删除课程 '{course.name}' 吗？",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.courses.remove(course.id)
+            self.record_change('delete', course)
+            self.statusBar().showMessage(f"已删除课程: {course.name}")
+
+    def check_course_conflict(self, new_course, exclude_id=None):
+        """检查新课程是否与现有课程冲突。"""
+        """参数:
+            new_course: 要检查的新课程对象
+            exclude_id: 要排除的课程ID（用于编辑课程时）"""
+        return self.courses.has_conflict(new_course, exclude_id)
+
+    def show_course_context_menu(self, global_position, course):
+        """在屏幕坐标处显示课程的右键菜单。"""
+        menu = QMenu()
+        edit_action = menu.addAction("编辑课程")
+        delete_action = menu.addAction("删除课程")
+        
+        action = menu.exec_(global_position)
+        
+        if action == edit_action:
+            self.edit_course(course)
+        elif action == delete_action:
+            self.delete_course(course)
+
+    def show_list_context_menu(self, position):
+        """显示课程列表的右键菜单。"""
+        course = self.course_filter_model.course_at(self.course_list_view.indexAt(position))
+        if course:
+            self.show_course_context_menu(self.course_list_view.viewport().mapToGlobal(position), course)
+
+    def selected_list_course(self):
+        """返回课程列表中当前选中的课程。"""
+        indexes = self.course_list_view.selectionModel().selectedIndexes()
+        return self.course_filter_model.course_at(indexes[0]) if indexes else None
+
+    def edit_selected_course(self):
+        """编辑选中的课程。"""
+        if self.tab_widget.currentIndex() == 0:  # 课程表视图
+            # 在课程表视图中，编辑当前选中格子中的课程
+            course = self.schedule_model.course_at(self.schedule_view.currentIndex())
+            if course:
+                self.edit_course(course)
+            else:
+                QMessageBox.information(self, "提示", "请在课程表视图中选择或双击要编辑的课程，或在课程列表中选择要编辑的课程。")
+        else:  # 课程列表视图
+            course = self.selected_list_course()
+            if course:
+                self.edit_course(course)
+            else:
+                QMessageBox.information(self, "提示", "请先选择要编辑的课程。")
+
+    def delete_selected_course(self):
+        """删除选中的课程。"""
+        if self.tab_widget.currentIndex() == 0:  # 课程表视图
+            course = self.schedule_model.course_at(self.schedule_view.currentIndex())
+            if course:
+                self.delete_course(course)
+            else:
+                QMessageBox.information(self, "提示", "请在课程表视图中选择或右键点击要删除的课程，或在课程列表中选择要删除的课程。")
+        else:  # 课程列表视图
+            course = self.selected_list_course()
+            if course:
+                self.delete_course(course)
+            else:
+                QMessageBox.information(self, "提示", "请先选择要删除的课程。")
+
+    def prev_week(self):
+        """切换到上一周的课程表。"""
+        if self.current_week > 0:
+            self.show_week(self.current_week - 1)
+
+    def next_week(self):
+        """切换到下一周的课程表。"""
+        if self.current_week < len(self.week_names) - 1:
+            self.show_week(self.current_week + 1)
+
+    def set_week(self, week_idx):
+        """设置当前显示的周数。"""
+        if 0 <= week_idx < len(self.week_names):
+            self.show_week(week_idx)
+
+    def show_week(self, week_idx):
+        """切换课程表网格到指定周。"""
+        self.current_week = week_idx
+        self.week_label.setText(f"当前周: {self.week_names[self.current_week]}")
+        self.init_schedule_grid()
+
+    def on_date_selected(self, date):
+        """当用户在日历中选择日期时的处理函数。"""
+        # 获取选中日期是星期几（周一=1，周二=2，...，周日=7）
+        day_of_week = date.dayOfWeek() - 1  # 转换为0-6
+        
+        if 0 <= day_of_week < len(self.day_names):  # 只处理周一到周五
+            # 这里可以添加跳转到对应日期的课程视图的功能
+            self.statusBar().showMessage(f"已选择 {date.toString('yyyy年MM月dd日')} {self.day_names[day_of_week]}")
+
+    def on_tab_changed(self, index):
+        """当用户切换选项卡时的处理函数。"""
+        # 统计视图只在数据变化后重新创建
+        self.refresh_current_tab()
+        
+        if index == 1:  # 切换到课程列表视图
+            # 显示搜索框
+            self.search_label.show()
+            self.search_edit.show()
+            self.search_mode_action.setVisible(True)
+        else:  # 切换到其他视图
+            # 隐藏搜索框
+            self.search_label.hide()
+            self.search_edit.hide()
+            self.search_mode_action.setVisible(False)
+    
+    def search_courses(self):
+        """根据搜索文本过滤课程列表。"""
+        search_text = self.search_edit.text().lower()
+        if not search_text:
+            self.course_filter_model.set_filter(search_text, None)
+        elif self.search_mode_combo.currentIndex() == 1:
+            ranks = self.courses.fuzzy_search(search_text)
+            self.course_filter_model.set_filter(search_text, set(ranks), ranks)
+        else:
+            self.course_filter_model.set_filter(search_text, self.courses.search(search_text))
+
+    def update_search_match(self, course):
+        """课程新增或修改后更新当前搜索结果中该课程的匹配状态。"""
+        search_text = self.course_filter_model.search_text
+        if not search_text:
+            return
+        if self.search_mode_combo.currentIndex() == 1:
+            rank = self.courses.phonetic_index.score(course.id, ''.join(search_text.split()))
+        else:
+            rank = 0 if any(search_text in text for text in SearchIndex.course_texts(course)) else None
+        self.course_filter_model.set_match(course.id, rank)
+    
+    def import_schedule(self):
+        """导入课程表数据从JSON文件。"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "导入课程表", ".", "JSON Files (*.json);;All Files (*)"
+        )
+        
+        if file_path:
+            # 在后台线程中流式解析文件，分批创建课程
+            task = StreamingImportTask(file_path, parent=self)
+            progress_dialog = QProgressDialog("正在导入课程表...", "取消", 0, 100, self)
+            progress_dialog.setWindowTitle("导入课程表")
+            progress_dialog.setWindowModality(Qt.WindowModal)
+            progress_dialog.setMinimumDuration(500)
+            progress_dialog.setAutoClose(False)
+            progress_dialog.setAutoReset(False)
+            progress_dialog.canceled.connect(task.cancel)
+            task.progress.connect(progress_dialog.setValue)
+            task.finished.connect(lambda courses: self.on_courses_imported(courses, file_path))
+            task.failed.connect(lambda message: self.on_persistence_failed("导入失败", message))
+            for signal in (task.finished, task.failed):
+                signal.connect(progress_dialog.close)
+                signal.connect(task.deleteLater)
+            
+            self.statusBar().showMessage(f"正在从 {file_path} 导入课程表...")
+            task.start(self.persistence.submit)
+    
+    def on_courses_imported(self, courses, file_path):
+        """后台读取完成后，用导入的课程替换当前课程。"""
+        if courses is None:
+            self.statusBar().showMessage("已取消导入课程表")
+            return
+        self.courses.replace_all(courses)
+        # 整体替换后写入新快照，之后的修改日志以此为基础
+        self.request_snapshot()
+        
+        logger.info("已从 %s 导入 %d 门课程", file_path, len(courses))
+        self.statusBar().showMessage(f"成功从 {file_path} 导入课程表")
+    
+    def export_schedule(self):
+        """导出课程表数据到JSON文件。"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出课程表", ".", "JSON Files (*.json);;All Files (*)"
+        )
+        
+        if file_path:
+            data = {
+                'version': config.VERSION,
+                'export_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'courses': [course.to_dict() for course in self.courses]
+            }
+            
+            # 在后台线程中写入文件
+            self.persistence.submit(
+                lambda: atomic_write_json(file_path, data),
+                f"成功导出课程表到 {file_path}",
+                "导出失败"
+            )
+    
+    def init_statistics_tab(self):
+        """创建统计视图的控件，之后只更新标签文字。"""
+        stats_group = QGroupBox("课程统计信息")
+        stats_layout = QVBoxLayout()
+        self.statistics_labels = []
+        for line in self.courses.statistics.report_lines(self.day_names):
+            label = QLabel(line)
+            stats_layout.addWidget(label)
+            self.statistics_labels.append(label)
+        stats_layout.addStretch()
+        stats_group.setLayout(stats_layout)
+        
+        # 课程分析：教师负荷、教室利用率、利用率热力图和高峰时段
+        analytics_group = QGroupBox("课程分析")
+        analytics_layout = QVBoxLayout()
+        self.analytics_tabs = QTabWidget()
+        self.teacher_load_table = self.create_analytics_table(["教师", "总节数", "周均节数", "最高周节数", "最忙的周"])
+        self.classroom_table = self.create_analytics_table(["教室", "占用节次", "利用率"])
+        self.heatmap_table = self.create_analytics_table(self.day_names[:config.WEEKLY_CLASS_DAYS])
+        self.heatmap_table.setRowCount(config.MAX_DAILY_SECTIONS)
+        self.heatmap_table.setVerticalHeaderLabels([f"第{section}节" for section in range(1, config.MAX_DAILY_SECTIONS + 1)])
+        self.heatmap_table.verticalHeader().show()
+        self.heatmap_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.peak_slots_table = self.create_analytics_table(["星期", "节次", "周次", "同时上课的课程数"])
+        self.analytics_tabs.addTab(self.teacher_load_table, "教师负荷")
+        self.analytics_tabs.addTab(self.classroom_table, "教室利用率")
+        self.analytics_tabs.addTab(self.heatmap_table, "利用率热力图")
+        self.analytics_tabs.addTab(self.peak_slots_table, "高峰时段")
+        analytics_layout.addWidget(self.analytics_tabs)
+        if np is None:
+            analytics_layout.addWidget(QLabel("安装NumPy后可以使用课程分析功能（pip install numpy）"))
+        analytics_group.setLayout(analytics_layout)
+        
+        content_layout = QHBoxLayout()
+        content_layout.addWidget(stats_group)
+        content_layout.addWidget(analytics_group, 1)
+        self.statistics_layout.addLayout(content_layout)
+        
+        # 添加导出统计按钮
+        buttons_layout = QHBoxLayout()
+        export_stats_btn = QPushButton("导出统计结果")
+        export_stats_btn.clicked.connect(self.export_statistics)
+        buttons_layout.addWidget(export_stats_btn)
+        export_analytics_btn = QPushButton("导出分析结果(CSV)")
+        export_analytics_btn.clicked.connect(self.export_analytics)
+        export_analytics_btn.setEnabled(np is not None)
+        buttons_layout.addWidget(export_analytics_btn)
+        self.statistics_layout.addLayout(buttons_layout)
+
+    @staticmethod
+    def create_analytics_table(headers):
+        """创建只读的课程分析表格。"""
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    @staticmethod
+    def fill_analytics_table(table, rows):
+        """用行数据填充课程分析表格。"""
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def export_ics(self):
+        """把整个学期的课程导出为iCalendar文件，可导入手机等日历应用。"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出到日历", f"{config.APP_NAME}.ics", "iCalendar Files (*.ics);;All Files (*)"
+        )
+        
+        if file_path:
+            # 只复制课程列表，事件在后台逐个生成并写入
+            courses = list(self.courses)
+            self.persistence.submit(
+                lambda: write_ics(file_path, courses),
+                f"成功导出日历到 {file_path}",
+                "导出失败"
+            )
+
+    def update_statistics(self):
+        """用增量维护的统计数据和课程分析更新统计视图。"""
+        self.statistics_dirty = False
+        lines = self.courses.statistics.report_lines(self.day_names)
+        for label, line in zip(self.statistics_labels, lines):
+            label.setText(line)
+        if self.courses.analytics is not None:
+            self.update_analytics()
+
+    def update_analytics(self):
+        """把课程分析结果显示到各个表格中。"""
+        analytics = self.courses.analytics
+        tables = analytics.csv_tables(self.day_names)
+        self.fill_analytics_table(self.teacher_load_table, tables["teacher_load.csv"][1:])
+        self.fill_analytics_table(self.classroom_table, tables["classroom_utilization.csv"][1:])
+        self.fill_analytics_table(self.peak_slots_table, tables["peak_slots.csv"][1:])
+        # 热力图：颜色越深表示该时段教室利用率越高
+        heatmap = analytics.utilization_heatmap()
+        for section in range(config.MAX_DAILY_SECTIONS):
+            for day in range(config.WEEKLY_CLASS_DAYS):
+                value = float(heatmap[day, section])
+                item = QTableWidgetItem(f"{value:.0%}")
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                item.setBackground(QColor(76, 175, 80, int(40 + 215 * value)) if value else QColor(Qt.GlobalColor.white))
+                self.heatmap_table.setItem(section, day, item)
+
+    def export_analytics(self):
+        """把课程分析结果导出为CSV文件。"""
+        directory = QFileDialog.getExistingDirectory(self, "选择导出分析结果的文件夹", ".")
+        if not directory:
+            return
+        tables = self.courses.analytics.csv_tables(self.day_names)
+        
+        def write_tables():
+            for file_name, rows in tables.items():
+                # 带BOM的UTF-8，方便用Excel直接打开
+                atomic_write_text(os.path.join(directory, file_name), "\ufeff" + csv_text(rows))
+        
+        self.persistence.submit(write_tables, f"成功导出分析结果到 {directory}", "导出失败")
+    
+    def export_statistics(self):
+        """导出课程统计结果。"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出统计结果", ".", "文本文件 (*.txt);;所有文件 (*)"
+        )
+        
+        if file_path:
+            # 生成文件内容，统计数据直接取自增量维护的结果
+            lines = [
+                "课程表统计结果",
+                f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                f"软件版本: {config.VERSION}",
+                "="*40,
+                "",
+            ]
+            lines.extend(self.courses.statistics.report_lines(self.day_names))
+            text = "\n".join(lines) + "\n"
+            
+            # 在后台线程中写入文件
+            self.persistence.submit(
+                lambda: atomic_write_text(file_path, text),
+                f"成功导出统计结果到 {file_path}",
+                "导出失败"
+            )
+
+    def update_ui(self):
+        """全部课程被替换后刷新用户界面：课程表网格、搜索结果和统计视图。"""
+        self.init_schedule_grid()
+        self.statistics_dirty = True
+        self.refresh_current_tab()
+        # 重新执行当前的搜索
+        if self.search_edit.text():
+            self.search_courses()
+
+    def refresh_current_tab(self):
+        """数据已变化的统计视图在显示时重新创建。"""
+        index = self.tab_widget.currentIndex()
+        if index == 2 and self.statistics_dirty:
+            self.update_statistics()
+
+    def record_change(self, op, course):
+        """在后台把单个课程的修改追加到修改日志，日志过大时合并为新快照。"""
+        self.persistence.submit(lambda: self.storage.append(op, course), failure_title="保存课程修改失败")
+        if self.storage.needs_compaction():
+            self.request_snapshot()
+
+    def request_snapshot(self, success_message=None):
+        """请求在后台写入完整快照，短时间内的多次请求只写入一次。"""
+        self.persistence.request_save(
+            lambda: [course.to_dict() for course in self.courses],
+            self.storage.write_snapshot,
+            success_message
+        )
+
+    def save_schedule(self):
+        """保存当前课程表数据到文件中。"""
+        self.request_snapshot("课程表已保存")
+
+    def on_persistence_failed(self, title, message):
+        """后台文件读写失败时在状态栏显示错误信息。"""
+        logger.error("%s: %s", title, message)
+        self.statusBar().showMessage(f"{title}: {message}")
+
+    def load_schedule(self):
+        """从文件加载课程表数据，并回放修改日志中尚未合并的修改。"""
+        try:
+            # 先等待后台写入完成，避免读到写了一半的数据
+            self.persistence.flush()
+            if self.storage.exists():
+                self.courses.replace_all(Course.from_dict(data) for data in self.storage.load())
+                logger.info("已加载课程表，共 %d 门课程", len(self.courses))
+                self.statusBar().showMessage("课程表已加载")
+        except Exception as e:
+            logger.exception("加载课程表失败")
+            QMessageBox.critical(self, "加载失败", f"无法加载课程表: {str(e)}")
+
+    def load_example_schedule(self):
+        """加载示例课程表数据，将覆盖当前所有课程。"""
+        reply = QMessageBox.question(
+            self, "确认加载示例", 
+            "加载示例课程表将覆盖当前的所有课程，确定要继续吗？",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            try:
+                if os.path.exists(config.EXAMPLE_SCHEDULE_FILE_PATH):
+                    with open(config.EXAMPLE_SCHEDULE_FILE_PATH, 'r', encoding='utf-8') as f:
+                        courses_data = json.load(f)
+                        self.courses.replace_all(Course.from_dict(data) for data in courses_data)
+                    # 整体替换后写入新快照，之后的修改日志以此为基础
+                    self.request_snapshot()
+                    self.statusBar().showMessage("示例课程表已加载")
+                else:
+                    QMessageBox.warning(self, "文件不存在", f"示例课程表文件不存在: {config.EXAMPLE_SCHEDULE_FILE_PATH}")
+            except Exception as e:
+                logger.exception("加载示例课程表失败")
+                QMessageBox.critical(self, "加载失败", f"无法加载示例课程表: {str(e)}")
+
+    def print_schedule(self):
+        """预览并打印当前周的课程表，打印按钮在预览对话框中。"""
+        week_view = self.courses.week_view(self.current_week)
+        self.preview_pages([[(week_view, self.week_names[self.current_week])]])
+
+    def preview_pages(self, pages, page_images=None):
+        """打开打印预览：预览显示缓存的页面图像，打印时用矢量绘制pages中的每一页。
+        
+        page_images是已经绘制好的各页预览图像，未提供时在第一次预览时绘制一次，之后刷新预览只重新显示这些图像。
+        """
+        printer = QPrinter(QPrinter.HighResolution)
+        # 页面版面按像素排列，使用与导出相同的分辨率，打印结果与导出的PDF一致
+        printer.setResolution(config.EXPORT_DPI)
+        page_images = list(page_images or [])
+        
+        def paint(printer):
+            # 预览时打印机使用记录绘制命令的预览引擎，真正打印或输出PDF时才需要矢量绘制
+            if printer.paintEngine().type() != QPaintEngine.Picture:
+                paint_schedule_pages(printer, pages, self.day_names)
+                return
+            if len(page_images) != len(pages):
+                page_images[:] = [render_schedule_image(weeks, self.day_names, config.PREVIEW_DPI) for weeks in pages]
+            painter = QPainter(printer)
+            page_rect = QRectF(0, 0, printer.width(), printer.height())
+            for page, image in enumerate(page_images):
+                if page:
+                    printer.newPage()
+                paint_page_image(painter, page_rect, image)
+            painter.end()
+        
+        preview_dialog = QPrintPreviewDialog(printer, self)
+        preview_dialog.paintRequested.connect(paint)
+        preview_dialog.exec_()
+
+    def export_semester_pdf(self):
+        """把整个学期的课程表导出为一个多页PDF，每页可以放一周或几周。"""
+        weeks_per_page_options = ["每页1周", "每页2周", "每页4周"]
+        option, ok = QInputDialog.getItem(self, "导出整个学期", "页面布局:", weeks_per_page_options, 0, False)
+        if not ok:
+            return
+        weeks_per_page = [1, 2, 4][weeks_per_page_options.index(option)]
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出整个学期", f"{config.APP_NAME}.pdf", "PDF Files (*.pdf);;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        # 在界面线程中取出各周的视图，之后的修改不影响正在导出的内容
+        weeks = [(self.courses.week_view(week), self.week_names[week]) for week in range(config.TOTAL_WEEKS)]
+        pages = [weeks[i:i + weeks_per_page] for i in range(0, len(weeks), weeks_per_page)]
+        task = SemesterExportTask(pages, file_path, self.render_executor, self.day_names, parent=self)
+        progress_dialog = QProgressDialog("正在导出课程表...", "取消", 0, len(pages), self)
+        progress_dialog.setWindowTitle("导出整个学期")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        progress_dialog.canceled.connect(task.cancel)
+        task.progress.connect(progress_dialog.setValue)
+        task.finished.connect(lambda page_count: self.on_semester_exported(pages, page_count, file_path, task.preview_images))
+        task.failed.connect(lambda message: self.on_persistence_failed("导出失败", message))
+        for signal in (task.finished, task.failed):
+            signal.connect(progress_dialog.close)
+            signal.connect(task.deleteLater)
+        
+        self.statusBar().showMessage(f"正在导出整个学期到 {file_path}...")
+        task.start()
+
+    def on_semester_exported(self, pages, page_count, file_path, page_images=None):
+        """整学期导出完成后询问是否预览，预览直接使用导出时绘制好的页面图像，打印时使用导出时取出的各周视图。"""
+        if page_count is None:
+            self.statusBar().showMessage("已取消导出")
+            return
+        self.statusBar().showMessage(f"成功导出整个学期到 {file_path}")
+        reply = QMessageBox.question(
+            self, "导出完成", f"已导出 {page_count} 页到 {file_path}，是否预览？",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.preview_pages(pages, page_images)
+        
+    def setup_reminders(self):
+        """创建课程提醒调度器，在每次提醒的时间点触发，而不是每分钟检查一次。"""
+        self.reminder_scheduler = ReminderScheduler(self.courses, self)
+        self.reminder_scheduler.reminder_due.connect(self.show_reminder)
+
+    def show_reminder(self, course, start_time):
+        """通过通知队列显示即将开始的课程的提醒，不阻塞界面。"""
+        remaining_minutes = max(0, int((start_time - datetime.now()).total_seconds() / 60))
+        
+        # 显示提醒，同时到期的多个提醒会合并为一条
+        self.notifications.notify(
+            "课程提醒",
+            f"{course.name} 将在 {remaining_minutes} 分钟后开始！\n"+
+            f"教师: {course.teacher}\n"+
+            f"教室: {course.classroom}\n"+
+            f"时间: {start_time.strftime('%H:%M')}",
+            f"{start_time.strftime('%H:%M')} {course.name}（{course.classroom}）"
+        )
+        
+        # 如果启用了声音提醒，可以在这里添加播放声音的代码
+        if config.ENABLE_SOUND_REMINDER:
+            pass  # 实际应用中可以添加播放提示音的代码
+
+    def show_about(self):
+        """显示关于对话框，包含软件版本、作者等信息。"""
+        QMessageBox.about(
+            self, "关于智能课程表",
+            f"{config.APP_NAME} v{config.VERSION}\n\n"+
+            "一个美观、功能多样的课程表管理软件\n\n"+
+            "功能特点:\n"+
+            "- 可视化课程表视图\n"+
+            "- 课程列表管理\n"+
+            "- 课程添加、编辑、删除\n"+
+            "- 课程冲突检查\n"+
+            "- 自定义课程颜色\n"+
+            "- 课程提醒功能\n"+
+            "- 多周课程表支持\n"+
+            "- 课程表保存与加载\n"+
+            "- 系统托盘支持\n"+
+            "- 悬浮课程表功能\n"+
+            "联系我们:qzrobotboar@gmail.com\n"+
+            f"作者: {config.AUTHOR}\n"+
+            f"版本: {config.VERSION}\n"+
+            f"日期: {config.RELEASE_DATE}"
+        )
+    
+    def show_update_log(self):
+        """显示更新日志对话框。"""
+        update_log_dialog = UpdateLogDialog(self)
+        update_log_dialog.exec_()
+        
+    def init_system_tray(self):
+        """初始化系统托盘图标和相关功能。"""
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            QMessageBox.information(self, "提示", "您的系统不支持系统托盘功能")
+            return
+        
+        self.tray_icon = QSystemTrayIcon(self)
+        
+        # 创建一个简单的图标（使用文字作为图标）
+        pixmap = QPixmap(32, 32)
+        pixmap.fill(QColor(76, 175, 80))  # 使用绿色背景
+        painter = QPainter(pixmap)
+        painter.setPen(Qt.white)
+        painter.setFont(QFont("SimHei", 12, QFont.Bold))
+        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "课")
+        painter.end()
+        self.tray_icon.setIcon(QIcon(pixmap))
+        
+        self.tray_icon.setToolTip("智能课程表")
+        
+        # 创建托盘菜单
+        tray_menu = QMenu()
+        
+        # 显示主窗口动作
+        show_action = tray_menu.addAction("显示主窗口")
+        show_action.triggered.connect(self.show_main_window)
+        
+        # 显示悬浮课程表动作
+        float_action = tray_menu.addAction("显示悬浮课程表")
+        float_action.triggered.connect(self.toggle_floating_window)
+        
+        # 退出动作
+        tray_menu.addSeparator()
+        quit_action = tray_menu.addAction("退出")
+        quit_action.triggered.connect(self.quit_application)
+        
+        self.tray_icon.setContextMenu(tray_menu)
+        self.tray_icon.activated.connect(self.on_tray_icon_activated)
+        self.tray_icon.show()
+        self.notifications.set_tray_icon(self.tray_icon)
+        
+    def on_tray_icon_activated(self, reason):
+        """当系统托盘图标被点击时的处理函数。"""
+        if reason == QSystemTrayIcon.ActivationReason.Trigger:  # 单击
+            self.toggle_floating_window()
+        elif reason == QSystemTrayIcon.ActivationReason.DoubleClick:  # 双击
+            self.show_main_window()
+            
+    def show_main_window(self):
+        """显示主窗口。"""
+        self.showNormal()
+        self.activateWindow()
+        
+    def toggle_floating_window(self):
+        """切换悬浮窗口的显示/隐藏状态。"""
+        if self.floating_window is None:
+            self.create_floating_window()
+        else:
+            self.close_floating_window()
+            
+    def create_floating_window(self):
+        """创建悬浮窗口。"""
+        if hasattr(self, 'courses'):
+            self.floating_window = FloatingScheduleWindow(self.courses, self.day_names)
+            self.floating_window.closed.connect(self.on_floating_window_closed)
+            self.floating_window.show()
+            self.statusBar().showMessage("已显示悬浮课程表")
+            
+    def close_floating_window(self):
+        """关闭悬浮窗口。"""
+        if self.floating_window:
+            self.floating_window.close()
+            self.floating_window = None
+            self.statusBar().showMessage("已关闭悬浮课程表")
+            
+    def on_floating_window_closed(self):
+        """当悬浮窗口关闭时的处理函数。"""
+        self.floating_window = None
+        
+    def quit_application(self):
+        """退出应用程序。"""
+        if self.floating_window:
+            self.floating_window.close()
+        # 退出前写入所有等待中的数据
+        self.persistence.shutdown()
+        self.render_executor.shutdown()
+        QApplication.quit()
+        
+    def closeEvent(self, event):
+        """当主窗口关闭时的事件处理函数。"""
+        if self.tray_icon and self.tray_icon.isVisible():
+            # 询问用户是最小化到托盘还是退出
+            reply = QMessageBox.question(
+                self, "退出确认",
+                "确定要退出智能课程表吗？\n选择'否'将最小化到系统托盘。",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            
+            if reply == QMessageBox.No:
+                self.hide()
+                event.ignore()
+                self.statusBar().showMessage("应用程序已最小化到系统托盘")
+            else:
+                if self.floating_window:
+                    self.floating_window.close()
+                self.persistence.shutdown()
+                self.render_executor.shutdown()
+                event.accept()
+        else:
+            if self.floating_window:
+                self.floating_window.close()
+            self.persistence.shutdown()
+            self.render_executor.shutdown()
+            event.accept()
+
+# 启动画面类
+class SplashScreen(QWidget):
+    def __init__(self):
+        """初始化启动画面。"""
+        super().__init__()
+        self.setWindowFlags(Qt.SplashScreen | Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+        self.setFixedSize(config.SPLASH_SCREEN_WIDTH, config.SPLASH_SCREEN_HEIGHT)
+        self.setStyleSheet(f"background-color: {config.PRIMARY_COLOR};")
+        self.init_ui()
+        
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        # 软件标题
+        title_label = QLabel(config.APP_NAME)
+        title_label.setFont(QFont(config.DEFAULT_FONT, config.TITLE_FONT_SIZE, QFont.Bold))
+        title_label.setStyleSheet("color: white;")
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        # 版本号
+        version_label = QLabel(f"版本: {config.VERSION}")
+        version_label.setFont(QFont(config.DEFAULT_FONT, config.HEADER_FONT_SIZE))
+        version_label.setStyleSheet("color: white;")
+        version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        # 日期
+        date_label = QLabel(f"日期: {config.RELEASE_DATE}")
+        date_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE))
+        date_label.setStyleSheet("color: white;")
+        date_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        layout.addWidget(title_label)
+        layout.addWidget(version_label)
+        layout.addWidget(date_label)
+        
+        self.setLayout(layout)
+        # 居中显示
+        self.move(QApplication.desktop().screen().rect().center() - self.rect().center())
+
+# 更新日志对话框类
+class UpdateLogDialog(QDialog):
+    def __init__(self, parent=None):
+        """初始化更新日志对话框。"""
+        super().__init__(parent)
+        self.setWindowTitle("更新日志")
+        self.resize(600, 400)
+        self.init_ui()
+        
+    def init_ui(self):
+        """初始化更新日志对话框的用户界面。"""
+        layout = QVBoxLayout(self)
+        
+        # 创建滚动区域
+        scroll_area = QWidget()
+        scroll_area.setStyleSheet(f"background-color: {config.BACKGROUND_COLOR};")
+        scroll_layout = QVBoxLayout(scroll_area)
+        scroll_layout.setContentsMargins(20, 20, 20, 20)
+        
+        # 添加标题
+        title_label = QLabel(f"{config.APP_NAME} 更新日志")
+        title_label.setFont(QFont(config.DEFAULT_FONT, config.HEADER_FONT_SIZE, QFont.Bold))
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title_label.setStyleSheet(f"color: {config.PRIMARY_COLOR};")
+        scroll_layout.addWidget(title_label)
+        
+        scroll_layout.addSpacing(20)
+        
+        # 遍历更新日志，按版本号降序排列
+        versions = sorted(config.UPDATE_LOGS.keys(), key=lambda x: [int(part) for part in x.split('.')], reverse=True)
+        
+        # 标记是否已经添加了当前版本
+        current_version_added = False
+        
+        # 添加所有版本的更新日志
+        for version in versions:
+            log_info = config.UPDATE_LOGS[version]
+            
+            # 版本标签
+            version_label = QLabel(f"版本 {version} ({log_info['date']})")
+            
+            if version == config.VERSION and not current_version_added:
+                # 当前版本样式
+                version_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE + 2, QFont.Bold))
+                version_label.setStyleSheet(f"color: {config.SECONDARY_COLOR};")
+                
+                # 添加历史版本标题（仅在第一次添加非当前版本时）
+                current_version_added = True
+                
+                # 历史版本标题
+                history_label_added = False
+            else:
+                # 历史版本样式
+                version_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE, QFont.Bold))
+                
+                # 第一次添加历史版本时，添加历史版本标题
+                if not history_label_added:
+                    scroll_layout.addSpacing(30)
+                    history_version_label = QLabel("历史版本更新日志")
+                    history_version_label.setFont(QFont(config.DEFAULT_FONT, config.FONT_SIZE + 2, QFont.Bold))
+                    history_version_label.setStyleSheet(f"color: {config.SECONDARY_COLOR};")
+                    scroll_layout.addWidget(history_version_label)
+                    history_label_added = True
+                
+                # 添加版本间距
+                scroll_layout.addSpacing(20)
+            
+            scroll_layout.addWidget(version_label)
+            
+            # 更新日志内容
+            log_text = QLabel(log_info['content'].strip())
+            log_text.setWordWrap(True)
+            log_text.setStyleSheet(f"color: {config.TEXT_COLOR};")
+            scroll_layout.addWidget(log_text)
+        
+        scroll_layout.addStretch()
+        
+        # 创建滚动区域并添加到主布局
+        scroll_area_widget = QScrollArea()
+        scroll_area_widget.setWidgetResizable(True)
+        scroll_area_widget.setWidget(scroll_area)
+        layout.addWidget(scroll_area_widget)
+        
+        # 添加关闭按钮
+        button_layout = QHBoxLayout()
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        
+        layout.addLayout(button_layout)
+
+# 读取课程表文件中的所有课程
+def load_schedule_file(file_path):
+    """读取课程表文件（课程数组或导出文件）中的所有课程。"""
+    with open(file_path, 'rb') as f:
+        return [Course.from_dict(data) for data in StreamingCourseReader(f)]
+
+# 导出进程中的Qt应用程序
+_headless_app = None
+
+def init_headless_worker():
+    """初始化导出进程：使用offscreen平台创建Qt应用程序，不会显示任何窗口。"""
+    global _headless_app
+    # 直接覆盖继承来的平台设置，否则QT_QPA_PLATFORM=xcb等会让导出进程连接显示器
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    if QGuiApplication.instance() is None:
+        _headless_app = QGuiApplication([sys.argv[0]])
+
+def export_schedule_file(file_path, output_dir, output_format="pdf", weeks=None, dpi=config.EXPORT_DPI):
+    """把一个课程表文件导出为PDF（每周一页）、PNG（每周一张）或整个学期的iCalendar文件，返回生成的文件列表。"""
+    init_headless_worker()
+    index = ScheduleIndex()
+    index.rebuild(load_schedule_file(file_path))
+    if weeks is None:
+        weeks = [config.START_WEEK - 1]
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    
+    if output_format == "ics":
+        # 日历导出整个学期，不需要绘制
+        output_path = os.path.join(output_dir, f"{name}.ics")
+        write_ics(output_path, index.courses.values(), calendar_name=name)
+        return [output_path]
+    
+    if output_format == "pdf":
+        output_path = os.path.join(output_dir, f"{name}.pdf")
+        writer = QPdfWriter(output_path)
+        writer.setPageSize(QPageSize(QPageSize.A4))
+        writer.setResolution(dpi)
+        painter = QPainter(writer)
+        for page, week in enumerate(weeks):
+            if page:
+                writer.newPage()
+            page_rect = QRectF(0, 0, writer.width(), writer.height())
+            render_schedule_page(painter, page_rect, WeekView(week, index), f"第{week + 1}周")
+        painter.end()
+        return [output_path]
+    
+    output_paths = []
+    for week in weeks:
+        output_path = os.path.join(output_dir, f"{name}_第{week + 1}周.png")
+        if not render_schedule_image([(WeekView(week, index), f"第{week + 1}周")], dpi=dpi).save(output_path, "PNG"):
+            raise OSError(f"无法写入文件 {output_path}")
+        output_paths.append(output_path)
+    return output_paths
+
+def collect_schedule_files(paths):
+    """展开命令行给出的文件和文件夹，文件夹中取所有JSON文件。"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(".json")
+            ))
+        else:
+            files.append(path)
+    return files
+
+def parse_command_line(argv):
+    """解析命令行参数：第一个参数为export时返回批量导出的参数，否则返回None，全部参数留给Qt。"""
+    # 批量导出必须用export子命令，"-style fusion"等Qt参数的值不会被当作课程表文件
+    if not argv or argv[0] != "export":
+        return None
+    parser = argparse.ArgumentParser(
+        prog="classtable.py export",
+        description=f"{config.APP_NAME}：在后台批量导出课程表，不打开任何窗口。"
+    )
+    parser.add_argument("files", nargs="+", help="要导出的课程表文件或包含课程表文件的文件夹")
+    parser.add_argument("-o", "--output", default=".", help="导出文件保存的文件夹（默认为当前文件夹）")
+    parser.add_argument("-f", "--format", choices=["pdf", "png", "ics"], default="pdf", help="导出格式（默认为pdf）")
+    week_group = parser.add_mutually_exclusive_group()
+    week_group.add_argument("-w", "--week", type=int, default=config.START_WEEK, help="导出第几周（默认为开学周）")
+    week_group.add_argument("--all-weeks", action="store_true", help="导出整个学期的每一周")
+    parser.add_argument("--dpi", type=int, default=config.EXPORT_DPI, help="导出分辨率")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="并行导出的进程数（默认为CPU核心数）")
+    args = parser.parse_args(argv[1:])
+    if not args.all_weeks and not 1 <= args.week <= config.TOTAL_WEEKS:
+        parser.error(f"周次应在1到{config.TOTAL_WEEKS}之间")
+    return args
+
+def run_batch_export(args):
+    """用进程池把所有课程表文件导出到输出文件夹，有文件导出失败时返回1。"""
+    files = collect_schedule_files(args.files)
+    weeks = list(range(config.TOTAL_WEEKS)) if args.all_weeks else [args.week - 1]
+    os.makedirs(args.output, exist_ok=True)
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_headless_worker) as executor:
+        futures = {
+            executor.submit(export_schedule_file, file_path, args.output, args.format, weeks, args.dpi): file_path
+            for file_path in files
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                output_paths = future.result()
+            except Exception as e:
+                failures += 1
+                logger.error("导出课程表 %s 失败: %s", file_path, e)
+                print(f"导出失败: {file_path}: {e}", file=sys.stderr)
+            else:
+                print(f"已导出: {file_path} -> {', '.join(output_paths)}")
+    print(f"共 {len(files)} 个课程表，成功 {len(files) - failures} 个，失败 {failures} 个")
+    return 1 if failures else 0
+
+# 主函数
+if __name__ == "__main__":
+    # 日志由后台线程写入日志文件，退出时写完队列中剩余的日志
+    log_listener = setup_logging()
+    
+    # export子命令在后台批量导出，不创建任何窗口
+    args = parse_command_line(sys.argv[1:])
+    if args is not None:
+        exit_code = run_batch_export(args)
+        log_listener.stop()
+        sys.exit(exit_code)
+    
+    app = QApplication(sys.argv)
+    app.aboutToQuit.connect(log_listener.stop)
+    app.setStyle("Fusion")  # 使用Fusion风格，提供更现代的界面
+    
+    # 设置中文显示
+    import locale
+    locale.setlocale(locale.LC_ALL, 'zh_CN.UTF-8')
+    
+    # 设置Qt应用程序的语言环境
+    from PyQt5.QtCore import QLocale
+    QLocale.setDefault(QLocale(QLocale.Chinese, QLocale.China))
+    
+    # 显示启动画面
+    splash = SplashScreen()
+    splash.show()
+    
+    # 等待1秒钟后隐藏启动画面
+    app.processEvents()
+    QTimer.singleShot(1000, splash.close)
+    
+    # 设置全局字体
+    font = QFont(config.DEFAULT_FONT, config.FONT_SIZE)
+    app.setFont(font)
+    
+    # 设置应用程序样式表，使界面更美观
+    app.setStyleSheet(f"""QMainWindow {{background-color: {config.BACKGROUND_COLOR};}}
+        QPushButton {{background-color: {config.PRIMARY_COLOR}; color: white; border-radius: 4px; padding: 6px;}}
+        QPushButton:hover {{background-color: {config.SECONDARY_COLOR};}}
+        QTabWidget::pane {{border: 1px solid #ccc; background-color: white;}}
+        QTabBar::tab {{background-color: #f0f0f0; border: 1px solid #ccc; padding: 8px;}}
+        QTabBar::tab:selected {{background-color: white; border-bottom-color: white;}}
+        QCalendarWidget {{background-color: white;}}
+        QStatusBar {{background-color: #f0f0f0;}}
+        * {{color: {config.TEXT_COLOR};}}
+    """)
+    
+    # 创建并显示主窗口
+    window = ClassTableApp()
+    QTimer.singleShot(1000, window.show)
+    
     sys.exit(app.exec_())
\ No newline at end of file
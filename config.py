@@ -32,6 +32,25 @@ START_WEEK = 1
 # 总周数
 TOTAL_WEEKS = 18
 
+# 第一节课的上课时间（时:分）
+FIRST_SECTION_START = "08:00"
+
+# 下午第一节课是第几节，午休后从AFTERNOON_START开始上课；默认为0，全天连续排课，与原有的上课时间一致
+AFTERNOON_FIRST_SECTION = 0
+
+# 下午第一节课的上课时间（时:分），仅在AFTERNOON_FIRST_SECTION大于1时生效
+AFTERNOON_START = "14:00"
+
+# 自定义作息时间表，每节课一项"上课-下课"，例如["08:00-08:45", "08:55-09:40"]
+# 为空时按上面的时间推算；节次不足时按课间时长顺延
+BELL_SCHEDULE = []
+
+# 按星期单独设置的作息时间表（0表示周一），格式同BELL_SCHEDULE，例如{4: ["08:30-09:15"]}
+BELL_SCHEDULE_OVERRIDES = {}
+
+# 学期第一周中的某一天（年-月-日），用于把周次换算为具体日期
+SEMESTER_START_DATE = "2025-09-01"
+
 # ===== 界面设置 =====
 # 主题颜色
 PRIMARY_COLOR = "#4CAF50"  #主色调（绿色）
@@ -63,6 +82,16 @@ ENABLE_SOUND_REMINDER = True
 # 是否启用弹窗提醒
 ENABLE_POPUP_REMINDER = True
 
+# 距离下一次提醒较远时，定时器最多等待多久（毫秒）后按当前时间重新计算
+# 定时器在系统休眠期间不计时，也不感知系统时间的修改，因此唤醒或改时间后提醒最多延迟这么久
+REMINDER_MAX_WAIT_MS = 60 * 1000
+
+# 提醒通知的显示时间（毫秒）
+NOTIFICATION_DURATION_MS = 8000
+
+# 在这段时间（毫秒）内到达的多条通知合并为一条显示
+NOTIFICATION_COALESCE_MS = 500
+
 # ===== 文件路径设置 =====
 # 课程表数据文件路径
 SCHEDULE_FILE_PATH = "schedule.json"
@@ -70,9 +99,73 @@ SCHEDULE_FILE_PATH = "schedule.json"
 # 示例课程表文件路径
 EXAMPLE_SCHEDULE_FILE_PATH = "example_schedule.json"
 
+# 拼音搜索使用的汉字拼音表文件路径
+PINYIN_TABLE_PATH = "pinyin_table.json"
+
 # 日志文件路径
 LOG_FILE_PATH = "classtable.log"
 
+# 日志级别（DEBUG、INFO、WARNING、ERROR）
+LOG_LEVEL = "INFO"
+
+# 单个日志文件的最大大小（字节）和保留的历史日志文件数
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# 同类调试日志（如每门课程的创建和加载）每秒最多写入的条数
+LOG_RATE_LIMIT_PER_SECOND = 20
+
+# 课程存储后端："json"（数据文件加修改日志）或 "sqlite"（SQLite数据库）
+STORAGE_BACKEND = "json"
+
+# SQLite数据库文件路径（STORAGE_BACKEND为"sqlite"时使用）
+SQLITE_DB_PATH = "schedule.db"
+
+# 课程修改日志文件后缀（位于课程表数据文件旁，记录每次增删改，加载时回放）
+SCHEDULE_JOURNAL_SUFFIX = ".journal"
+
+# 修改日志超过该大小（字节）时，在后台合并为新的课程表快照
+JOURNAL_COMPACT_THRESHOLD = 256 * 1024
+
+# 流式导入时每次读取的字节数
+IMPORT_CHUNK_SIZE = 64 * 1024
+
+# 流式导入时每批创建的课程数
+IMPORT_BATCH_SIZE = 1000
+
+# 合并保存请求的时间窗口（毫秒），窗口内的多次保存只写入一次
+SAVE_DEBOUNCE_MS = 500
+
+# 搜索框输入停顿多久（毫秒）后执行搜索
+SEARCH_DEBOUNCE_MS = 150
+
+# 课程表网格最多缓存多少个周的渲染结果
+WEEK_RENDER_CACHE_SIZE = 20
+
+# 窗口大小停止变化多久（毫秒）后按新大小重新渲染课程表网格
+RESIZE_RENDER_DELAY_MS = 150
+
+# 排好版的课程文字和绘制好的课程格子图像各自最多缓存多少个
+RENDER_CACHE_SIZE = 512
+
+# 课程分析中列出的高峰时段数量
+ANALYTICS_PEAK_SLOTS = 10
+
+# 导出PDF和PNG课程表的分辨率（DPI）
+EXPORT_DPI = 150
+
+# 打印预览中缓存的页面图像的分辨率（DPI），预览时直接显示缓存的图像，打印时仍然按矢量绘制
+PREVIEW_DPI = 96
+
+# 并行绘制导出页面的线程数（None表示按CPU核心数自动决定）
+RENDER_THREADS = None
+
+# 拼音/模糊搜索允许的最大编辑距离（实际按搜索文本长度每3个字符容许1处错误）
+FUZZY_SEARCH_MAX_DISTANCE = 2
+
+# 拼音/模糊搜索中模糊匹配的结果上限：原文和拼音匹配的课程全部返回，达到该数量后不再做模糊匹配，模糊匹配补足到该数量时停止
+FUZZY_SEARCH_MAX_RESULTS = 500
+
 
 # ===== 更新日志 =====
 # 更新日志信息，格式为：版本号 -> 更新内容
@@ -0,0 +1,17 @@
+# 测试公共设置：从仓库根目录导入classtable，并在没有显示器的环境中使用离屏平台
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """返回测试共用的QApplication，使用定时器和信号的测试需要它。"""
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,92 @@
+# 作息时间表的节次时间和二分查找
+import pytest
+
+import config
+from classtable import BellSchedule
+
+SECTIONS = ["08:00-08:45", "08:55-09:40", "10:00-10:45", "10:55-11:40"]
+
+
+def minutes(text):
+    return BellSchedule.parse_time(text)
+
+
+@pytest.fixture
+def bell():
+    return BellSchedule(SECTIONS, {"4": ["08:30-09:15"]})
+
+
+def test_section_times(bell):
+    assert bell.section_start(1) == minutes("08:00")
+    assert bell.section_end(2) == minutes("09:40")
+    assert bell.section_range(3, 4) == (minutes("10:00"), minutes("11:40"))
+
+
+def test_missing_sections_continue_after_breaks(bell):
+    assert bell.section_count() == config.MAX_DAILY_SECTIONS
+    assert bell.section_range(5, 5) == (minutes("11:50"), minutes("12:35"))
+
+
+def test_out_of_range_sections_are_clamped(bell):
+    assert bell.section_start(0) == bell.section_start(1)
+    assert bell.section_end(99) == bell.section_end(config.MAX_DAILY_SECTIONS)
+
+
+@pytest.mark.parametrize("time, section", [
+    ("07:59", None),
+    ("08:00", 1),
+    ("08:44", 1),
+    ("08:45", None),
+    ("08:55", 2),
+    ("09:50", None),
+    ("10:00", 3),
+    ("11:39", 4),
+    ("23:59", None),
+])
+def test_section_at(bell, time, section):
+    assert bell.section_at(minutes(time)) == section
+
+
+@pytest.mark.parametrize("time, started", [("07:00", 0), ("08:00", 1), ("09:50", 2), ("23:00", config.MAX_DAILY_SECTIONS)])
+def test_started_sections(bell, time, started):
+    assert bell.started_sections(minutes(time)) == started
+
+
+def test_day_overrides(bell):
+    assert bell.section_start(1, day=4) == minutes("08:30")
+    assert bell.section_at(minutes("08:10"), day=4) is None
+    assert bell.section_at(minutes("08:10"), day=3) == 1
+    assert bell.section_range(2, 2, day=4) == (minutes("09:25"), minutes("10:10"))
+
+
+@pytest.mark.parametrize("sections", [
+    ["08:45-08:00"],
+    ["08:00-08:45", "08:30-09:15"],
+])
+def test_overlapping_or_reversed_sections_are_rejected(sections):
+    with pytest.raises(ValueError):
+        BellSchedule(sections, {})
+
+
+def test_empty_schedule_follows_durations_and_lunch_break():
+    bell = BellSchedule([], {})
+    assert bell.section_range(1, 1) == (minutes(config.FIRST_SECTION_START), minutes(config.FIRST_SECTION_START) + config.SECTION_DURATION)
+    assert bell.section_start(2) - bell.section_start(1) == config.SECTION_DURATION + config.BREAK_DURATION
+    if config.AFTERNOON_FIRST_SECTION > 1:
+        assert bell.section_start(config.AFTERNOON_FIRST_SECTION) >= minutes(config.AFTERNOON_START)
+
+
+def test_default_schedule_is_continuous_without_lunch_break(monkeypatch):
+    monkeypatch.setattr(config, "AFTERNOON_FIRST_SECTION", 0)
+    bell = BellSchedule([], {})
+    period = config.SECTION_DURATION + config.BREAK_DURATION
+    for section in range(2, config.MAX_DAILY_SECTIONS + 1):
+        assert bell.section_start(section) - bell.section_start(section - 1) == period
+
+
+def test_afternoon_sections_start_after_lunch_break(monkeypatch):
+    monkeypatch.setattr(config, "AFTERNOON_FIRST_SECTION", 5)
+    monkeypatch.setattr(config, "AFTERNOON_START", "14:00")
+    bell = BellSchedule([], {})
+    assert bell.section_start(5) == max(minutes("14:00"), bell.section_start(4) + config.SECTION_DURATION + config.BREAK_DURATION)
+    assert bell.section_start(6) - bell.section_start(5) == config.SECTION_DURATION + config.BREAK_DURATION
@@ -0,0 +1,128 @@
+# 基于NumPy的课程分析：教师课时、教室利用率和高峰时段
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classtable import Course, CourseAnalytics
+
+
+def make_course(name, teacher, classroom, day, start_section, end_section, weeks=Course.ALL_WEEKS):
+    course = Course(name, teacher, classroom, day, start_section, end_section)
+    course.weeks = weeks
+    return course
+
+
+def make_analytics(*courses):
+    return CourseAnalytics(courses, days=7, sections=4, weeks=4, class_days=5)
+
+
+def test_teacher_load_counts_sections_per_week():
+    analytics = make_analytics(
+        make_course("高等数学", "张老师", "A101", 0, 1, 2),
+        make_course("线性代数", "张老师", "A102", 2, 3, 3, Course.make_week_mask(1, 4, Course.WEEK_ODD)),
+        make_course("大学物理", "李老师", "A101", 1, 1, 4, 0b0001),
+    )
+    assert list(analytics.teachers) == ["张老师", "李老师"]
+    assert analytics.teacher_load.tolist() == [[3, 2, 3, 2], [4, 0, 0, 0]]
+    assert analytics.teacher_load_rows() == [("张老师", 10, 2.5, 3, 1), ("李老师", 4, 1.0, 4, 1)]
+
+
+def test_equal_loads_are_ordered_by_name():
+    analytics = make_analytics(
+        make_course("高等数学", "王老师", "", 0, 1, 1),
+        make_course("大学物理", "李老师", "", 1, 1, 1),
+    )
+    assert [row[0] for row in analytics.teacher_load_rows()] == sorted(["王老师", "李老师"])
+
+
+def test_classroom_utilization_counts_occupied_slots_on_class_days():
+    analytics = make_analytics(
+        make_course("高等数学", "张老师", "A101", 0, 1, 2),
+        make_course("大学物理", "李老师", "A101", 0, 2, 3),
+        make_course("周末补课", "李老师", "A101", 5, 1, 4),
+        make_course("线性代数", "王老师", "B202", 1, 1, 1, 0b0001),
+    )
+    # A101：周一第1-3节每周占用，第2节的重叠只算一次，周末不计入
+    assert analytics.classroom_utilization_rows() == [("A101", 12, 12 / 80), ("B202", 1, 1 / 80)]
+    assert analytics.occupancy[0, 0, 1].tolist() == [2, 2, 2, 2]
+    heatmap = analytics.utilization_heatmap()
+    assert heatmap.shape == (5, 4)
+    assert heatmap[0].tolist() == [0.5, 0.5, 0.5, 0.0]
+    assert heatmap[1, 0] == 1 / 8
+
+
+def test_peak_slots_include_courses_without_classroom():
+    analytics = make_analytics(
+        make_course("高等数学", "张老师", "A101", 0, 1, 1, 0b0001),
+        make_course("大学物理", "李老师", "", 0, 1, 1, 0b0001),
+        make_course("线性代数", "王老师", "B202", 2, 2, 2, 0b0010),
+    )
+    assert analytics.peak_slots(2) == [(0, 0, 0, 2), (2, 1, 1, 1)]
+    assert analytics.peak_slots(10) == [(0, 0, 0, 2), (2, 1, 1, 1)]
+
+
+def test_blank_teacher_and_classroom_are_not_listed():
+    analytics = make_analytics(make_course("自习", "", "", 0, 1, 1))
+    assert len(analytics.teachers) == 0
+    assert len(analytics.classrooms) == 0
+    assert analytics.concurrency().sum() == 4
+
+
+def test_removing_courses_matches_rebuilding():
+    courses = [
+        make_course("高等数学", "张老师", "A101", 0, 1, 2),
+        make_course("大学物理", "李老师", "A101", 1, 3, 4, 0b0101),
+        make_course("线性代数", "张老师", "B202", 2, 1, 1),
+    ]
+    analytics = make_analytics(*courses)
+    analytics.remove(courses[1])
+    rebuilt = make_analytics(courses[0], courses[2])
+    assert list(analytics.teachers) == ["张老师"]
+    assert analytics.teacher_load.tolist() == rebuilt.teacher_load.tolist()
+    assert analytics.classroom_utilization_rows() == rebuilt.classroom_utilization_rows()
+    assert analytics.concurrency().tolist() == rebuilt.concurrency().tolist()
+    analytics.remove(courses[0])
+    analytics.remove(courses[2])
+    assert len(analytics.teachers) == 0
+    assert len(analytics.classrooms) == 0
+    assert not analytics.concurrency().any()
+    assert analytics.peak_slots() == []
+
+
+def test_arrays_grow_for_many_teachers_and_classrooms():
+    courses = [make_course(f"课程{i}", f"教师{i}", f"教室{i}", i % 5, 1, 1) for i in range(50)]
+    analytics = make_analytics(*courses)
+    assert len(analytics.teachers) == 50
+    assert analytics.teacher_load.sum() == 50 * 4
+    assert len(analytics.classrooms) == 50
+
+
+def test_csv_tables_have_headers_and_rows():
+    analytics = make_analytics(make_course("高等数学", "张老师", "A101", 0, 1, 2))
+    tables = analytics.csv_tables(["周一", "周二", "周三", "周四", "周五"])
+    assert tables["teacher_load.csv"][1] == ["张老师", 8, "2.00", 2, "第1周"]
+    assert tables["classroom_utilization.csv"][1] == ["A101", 8, "10.00%"]
+    assert len(tables["utilization_heatmap.csv"]) == 1 + 4
+    assert tables["peak_slots.csv"][1][:3] == ["周一", "第1节", "第1周"]
+
+
+def test_bulk_add_matches_adding_one_by_one():
+    courses = [
+        make_course("高等数学", "张老师", "A101", 0, 1, 2),
+        make_course("线性代数", "王老师", "A102", 2, 3, 3, Course.make_week_mask(1, 4, Course.WEEK_ODD)),
+        make_course("大学物理", "李老师", "A101", 0, 2, 4, 0b0101),
+        make_course("体育", "", "", 4, 1, 2),
+        make_course("英语", "王老师", "", 1, 4, 2),
+        make_course("化学", "张老师", "A102", 5, 0, 9, 0b1000),
+        make_course("越界", "赵老师", "B201", 9, 1, 1),
+    ]
+    bulk = CourseAnalytics(sections=4, weeks=4, class_days=5)
+    bulk.add_all(courses, chunk_size=3)
+    incremental = CourseAnalytics(sections=4, weeks=4, class_days=5)
+    for course in courses:
+        incremental.add(course)
+    assert list(bulk.teachers) == list(incremental.teachers) == ["张老师", "王老师", "李老师"]
+    assert list(bulk.classrooms) == list(incremental.classrooms)
+    assert bulk.teacher_load.tolist() == incremental.teacher_load.tolist()
+    assert bulk.occupancy.tolist() == incremental.occupancy.tolist()
+    assert bulk.concurrency().tolist() == incremental.concurrency().tolist()
@@ -0,0 +1,88 @@
+# iCalendar导出的文本转义、长行折叠和事件展开
+from datetime import datetime
+
+import pytest
+
+import config
+from classtable import Course, ics_escape, ics_fold, iter_ics_lines, write_ics
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("高等数学", "高等数学"),
+    ("A;B,C", "A\\;B\\,C"),
+    ("C:\\课程", "C:\\\\课程"),
+    ("第一行\n第二行", "第一行\\n第二行"),
+    ("第一行\r\n第二行", "第一行\\n第二行"),
+    ("第一行\r第二行", "第一行\\n第二行"),
+    ("\\n", "\\\\n"),
+])
+def test_ics_escape(text, expected):
+    assert ics_escape(text) == expected
+
+
+def unfold(text):
+    return text.replace("\r\n ", "")
+
+
+def test_short_lines_are_not_folded():
+    line = "SUMMARY:" + "a" * 67
+    assert ics_fold(line) == line
+
+
+@pytest.mark.parametrize("line", [
+    "DESCRIPTION:" + "a" * 200,
+    "SUMMARY:" + "高等数学" * 30,
+    "LOCATION:" + "教学楼A" * 40,
+])
+def test_folded_lines_fit_in_75_bytes(line):
+    folded = ics_fold(line)
+    parts = folded.split("\r\n")
+    assert len(parts) > 1
+    assert all(len(part.encode('utf-8')) <= 75 for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    assert unfold(folded) == line
+
+
+def test_folding_fills_lines_with_whole_characters():
+    folded = ics_fold("SUMMARY:" + "课" * 40)
+    first, second = folded.split("\r\n")
+    # 第一行8个字节的属性名加上22个3字节的汉字，再多一个汉字就超过75字节
+    assert first == "SUMMARY:" + "课" * 22
+    assert second == " " + "课" * 18
+
+
+def make_course(weeks, reminder=False):
+    course = Course("高等数学", "张老师", "A101", 2, 1, 2, course_id="course01")
+    course.weeks = weeks
+    course.reminder = reminder
+    course.reminder_minutes = 15
+    return course
+
+
+def test_events_follow_course_weeks():
+    lines = list(iter_ics_lines([make_course(Course.make_week_mask(1, 4, Course.WEEK_ODD))], datetime(2025, 9, 1)))
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-1] == "END:VCALENDAR"
+    starts = [line for line in lines if line.startswith("DTSTART:")]
+    assert starts == ["DTSTART:20250903T080000", "DTSTART:20250917T080000"]
+    assert "UID:course01-3@classtable" in lines
+    assert not any(line.startswith("BEGIN:VALARM") for line in lines)
+
+
+def test_reminders_become_alarms():
+    lines = list(iter_ics_lines([make_course(0b1, reminder=True)], datetime(2025, 9, 1)))
+    assert lines.count("BEGIN:VALARM") == 1
+    assert "TRIGGER:-PT15M" in lines
+
+
+def test_written_file_uses_crlf_without_bare_carriage_returns(tmp_path):
+    course = make_course(Course.ALL_WEEKS)
+    course.teacher = "张老师\r\n李老师\r王老师"
+    file_path = tmp_path / "schedule.ics"
+    write_ics(str(file_path), [course], datetime(2025, 9, 1))
+    data = file_path.read_bytes()
+    assert data.endswith(b"END:VCALENDAR\r\n")
+    assert data.count(b"\r") == data.count(b"\r\n")
+    assert data.count(b"\n") == data.count(b"\r\n")
+    assert data.count(b"BEGIN:VEVENT") == config.TOTAL_WEEKS
+    assert "教师: 张老师\\n李老师\\n王老师\\n第1-2节" in unfold(data.decode('utf-8'))
+    assert not (tmp_path / "schedule.ics.tmp").exists()
@@ -0,0 +1,79 @@
+# 课程修改日志的回放和末尾不完整记录的修复
+import json
+
+from classtable import Course, ScheduleJournal
+
+
+def make_course(name, course_id):
+    return Course(name, "张老师", "A101", 0, 1, 2, course_id=course_id)
+
+
+def loaded_names(journal):
+    return sorted(data['name'] for data in journal.load())
+
+
+def test_replay_applies_add_update_and_delete_over_snapshot(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    journal.write_snapshot([make_course("高等数学", "course01").to_dict(), make_course("大学物理", "course02").to_dict()])
+    journal.append('add', make_course("线性代数", "course03"))
+    journal.append('update', make_course("高等数学（下）", "course01"))
+    journal.append('delete', make_course("大学物理", "course02"))
+    assert loaded_names(journal) == ["线性代数", "高等数学（下）"]
+
+
+def test_snapshot_removes_replayed_journal(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    journal.append('add', make_course("高等数学", "course01"))
+    assert journal.size() > 0
+    journal.write_snapshot(journal.load())
+    assert journal.size() == 0
+    assert loaded_names(journal) == ["高等数学"]
+
+
+def test_torn_last_line_is_ignored_on_load(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    journal.append('add', make_course("高等数学", "course01"))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "id": "course02", "course": {"name": "大学')
+    assert loaded_names(journal) == ["高等数学"]
+
+
+def test_torn_last_line_is_truncated_before_next_append(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    journal.append('add', make_course("高等数学", "course01"))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "id": "course02", "course": {"name": "大学')
+    ScheduleJournal(str(tmp_path / "schedule.json")).append('add', make_course("线性代数", "course03"))
+    with open(journal.path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)['id'] for line in lines] == ["course01", "course03"]
+    assert loaded_names(journal) == ["线性代数", "高等数学"]
+
+
+def test_torn_line_longer_than_one_block_is_truncated(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    journal.append('add', make_course("高等数学", "course01"))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "id": "course02", "course": {"name": "' + "课" * 5000)
+    journal.repair_tail()
+    with open(journal.path, 'rb') as f:
+        data = f.read()
+    assert data.endswith(b"\n") and data.count(b"\n") == 1
+
+
+def test_malformed_records_are_skipped(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    journal.append('add', make_course("高等数学", "course01"))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        for record in ([], {"op": "add", "id": "course02"}, {"op": "rename", "id": "course01", "course": {}},
+                       {"op": "delete"}, {"op": "delete", "id": 1}):
+            f.write(json.dumps(record) + "\n")
+    journal.append('add', make_course("线性代数", "course03"))
+    assert loaded_names(journal) == ["线性代数", "高等数学"]
+
+
+def test_missing_files_load_as_empty_schedule(tmp_path):
+    journal = ScheduleJournal(str(tmp_path / "schedule.json"))
+    assert not journal.exists()
+    assert journal.load() == []
+    journal.repair_tail()
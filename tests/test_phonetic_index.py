@@ -0,0 +1,113 @@
+# 拼音、首字母和模糊搜索
+import pytest
+
+from classtable import Course, PhoneticIndex, bounded_substring_distance
+
+PINYIN_TABLE = {
+    "高": "gao", "等": "deng", "数": "shu", "学": "xue", "大": "da", "物": "wu", "理": "li",
+    "张": "zhang", "老": "lao", "师": "shi", "李": "li",
+}
+
+
+@pytest.fixture
+def index():
+    index = PhoneticIndex(PINYIN_TABLE)
+    index.add(Course("高等数学", "张老师", "A101", course_id="course01"))
+    index.add(Course("大学物理", "李老师", "B202", course_id="course02"))
+    return index
+
+
+def test_pinyin_keys_keep_non_chinese_characters():
+    index = PhoneticIndex(PINYIN_TABLE)
+    assert index.pinyin_keys("高等 数学A") == ("gaodengshuxuea", "gdsxa")
+
+
+def test_original_text_match_scores_best(index):
+    assert index.search("数学") == {"course01": PhoneticIndex.SCORE_TEXT}
+    assert index.search("老师") == {"course01": PhoneticIndex.SCORE_TEXT, "course02": PhoneticIndex.SCORE_TEXT}
+
+
+def test_full_pinyin_and_initials(index):
+    assert index.search("gaodeng") == {"course01": PhoneticIndex.SCORE_PREFIX}
+    assert index.search("gdsx") == {"course01": PhoneticIndex.SCORE_PREFIX}
+    assert index.search("shuxue") == {"course01": PhoneticIndex.SCORE_PINYIN}
+    assert index.search("wl") == {"course02": PhoneticIndex.SCORE_PINYIN}
+
+
+def test_search_ignores_case_and_spaces(index):
+    assert index.search(" Gao Deng ") == {"course01": PhoneticIndex.SCORE_PREFIX}
+
+
+def test_fuzzy_match_scores_by_edit_distance(index):
+    assert index.search("gaodangshuxue") == {"course01": PhoneticIndex.SCORE_FUZZY + 1}
+    assert index.search("daxuewuli") == {"course02": PhoneticIndex.SCORE_PREFIX}
+    assert index.search("daxiewuji") == {"course02": PhoneticIndex.SCORE_FUZZY + 2}
+
+
+def test_short_queries_are_not_fuzzy(index):
+    assert index.search("gx") == {}
+    assert index.search("") == {}
+
+
+def test_removed_courses_no_longer_match(index):
+    index.remove(Course("高等数学", "张老师", "A101", course_id="course01"))
+    assert index.search("gaodeng") == {}
+    assert index.search("laoshi") == {"course02": PhoneticIndex.SCORE_PINYIN}
+    assert all("高等数学" not in texts for texts in index.bigrams.values())
+    assert "高等数学" not in index.keys
+    index.remove(Course("高等数学", course_id="course01"))
+    index.remove(Course("大学物理", "李老师", "B202", course_id="course02"))
+    assert index.entries == {} and index.keys == {} and index.bigrams == {}
+
+
+def test_courses_sharing_texts_share_entries():
+    index = PhoneticIndex(PINYIN_TABLE)
+    for i in range(3):
+        index.add(Course("高等数学", "张老师", "A101", course_id=f"course0{i}"))
+    assert len(index.entries) == 3
+    assert index.search("gaodangshuxue") == {f"course0{i}": PhoneticIndex.SCORE_FUZZY + 1 for i in range(3)}
+    index.remove(Course("高等数学", "张老师", "A101", course_id="course00"))
+    assert set(index.search("gdsx")) == {"course01", "course02"}
+
+
+def test_text_used_as_name_and_classroom():
+    index = PhoneticIndex(PINYIN_TABLE)
+    index.add(Course("大学物理", "张老师", "", course_id="course01"))
+    index.add(Course("高等数学", "李老师", "大学物理", course_id="course02"))
+    assert set(index.search("daxuewuli")) == {"course01", "course02"}
+    assert index.search("daxiewuli") == {"course01": PhoneticIndex.SCORE_FUZZY + 1}
+    index.remove(Course("高等数学", "李老师", "大学物理", course_id="course02"))
+    assert "大学物理" in index.keys
+
+
+def test_classrooms_are_not_fuzzy_matched(index):
+    assert index.search("a101") == {"course01": PhoneticIndex.SCORE_TEXT}
+    assert index.search("a1o1") == {}
+    assert index.score("course01", "a1o1") is None
+
+
+def test_fuzzy_results_stop_at_the_limit():
+    index = PhoneticIndex(PINYIN_TABLE, max_results=5)
+    for i in range(10):
+        index.add(Course("高等数学", "张老师", "", course_id=f"course{i:02d}"))
+    assert len(index.search("gaodangshuxue")) == 5
+    # 原文和拼音匹配的课程不受数量限制
+    assert len(index.search("gdsx")) == 10
+
+
+def test_score_matches_search(index):
+    for text in ["数学", "gdsx", "shuxue", "gaodangshuxue", "wl", "laoshi", "b202"]:
+        results = index.search(text)
+        for course_id in ("course01", "course02"):
+            assert index.score(course_id, text) == results.get(course_id)
+
+
+@pytest.mark.parametrize("pattern, text, max_distance, expected", [
+    ("shuxue", "gaodengshuxue", 2, 0),
+    ("shuxve", "gaodengshuxue", 2, 1),
+    ("sxue", "gaodengshuxue", 2, 1),
+    ("wuli", "gaodengshuxue", 2, None),
+    ("", "abc", 0, 0),
+])
+def test_bounded_substring_distance(pattern, text, max_distance, expected):
+    assert bounded_substring_distance(pattern, text, max_distance) == expected
@@ -0,0 +1,130 @@
+# 下一次上课时间的计算和提醒调度的去重
+from datetime import datetime
+
+import pytest
+
+import classtable
+import config
+from classtable import Course, CourseStore, ReminderScheduler, next_course_occurrence
+
+SEMESTER_START = datetime(2025, 9, 1)
+
+
+def make_course(day=0, start_section=1, weeks=Course.ALL_WEEKS, reminder=True, course_id="course01"):
+    course = Course("高等数学", "张老师", "A101", day, start_section, start_section + 1, course_id=course_id)
+    course.weeks = weeks
+    course.reminder = reminder
+    course.reminder_minutes = 15
+    return course
+
+
+def test_next_occurrence_is_the_next_class_day():
+    course = make_course(day=2)
+    assert next_course_occurrence(course, datetime(2025, 9, 1, 9, 0), SEMESTER_START) == datetime(2025, 9, 3, 8, 0)
+
+
+def test_class_starting_now_moves_to_next_week():
+    course = make_course(day=0)
+    assert next_course_occurrence(course, datetime(2025, 9, 1, 8, 0), SEMESTER_START) == datetime(2025, 9, 8, 8, 0)
+    assert next_course_occurrence(course, datetime(2025, 9, 1, 7, 59), SEMESTER_START) == datetime(2025, 9, 1, 8, 0)
+
+
+def test_weeks_without_class_are_skipped():
+    course = make_course(day=2, weeks=Course.make_week_mask(1, 16, Course.WEEK_ODD))
+    assert next_course_occurrence(course, datetime(2025, 9, 3, 9, 0), SEMESTER_START) == datetime(2025, 9, 17, 8, 0)
+
+
+def test_dates_outside_semester_repeat_weekly():
+    course = make_course(day=2, weeks=0b1)
+    assert next_course_occurrence(course, datetime(2025, 8, 1), SEMESTER_START) == datetime(2025, 8, 6, 8, 0)
+    after_semester = datetime(2026, 3, 2)
+    assert next_course_occurrence(course, after_semester, SEMESTER_START) == datetime(2026, 3, 4, 8, 0)
+
+
+def test_rest_of_semester_without_class_is_skipped():
+    course = make_course(day=0, weeks=0b1)
+    # 第2-18周都不上课，下一次是学期结束后按星期提醒的第一个周一
+    assert next_course_occurrence(course, datetime(2025, 9, 2), SEMESTER_START) == datetime(2026, 1, 5, 8, 0)
+
+
+class FakeDatetime(datetime):
+    current = datetime(2025, 9, 1, 7, 50)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(classtable, "semester_start_monday", lambda: SEMESTER_START)
+    monkeypatch.setattr(classtable, "datetime", FakeDatetime)
+    FakeDatetime.current = datetime(2025, 9, 1, 7, 50)
+    return FakeDatetime
+
+
+def make_scheduler(courses):
+    store = CourseStore(courses)
+    scheduler = ReminderScheduler(store)
+    reminders = []
+    scheduler.reminder_due.connect(lambda course, start_time: reminders.append((course.id, start_time)))
+    return store, scheduler, reminders
+
+
+def test_due_reminder_fires_once(qapp, clock):
+    store, scheduler, reminders = make_scheduler([make_course()])
+    scheduler._on_timeout()
+    assert reminders == [("course01", datetime(2025, 9, 1, 8, 0))]
+    scheduler._on_timeout()
+    assert len(reminders) == 1
+
+
+def test_editing_course_does_not_repeat_reminder(qapp, clock):
+    store, scheduler, reminders = make_scheduler([make_course()])
+    scheduler._on_timeout()
+    edited = make_course()
+    edited.name = "高等数学（下）"
+    edited.reminder_minutes = 30
+    store.update("course01", edited)
+    scheduler._on_timeout()
+    store.replace_all([make_course()])
+    scheduler._on_timeout()
+    assert reminders == [("course01", datetime(2025, 9, 1, 8, 0))]
+
+
+def test_next_week_is_reminded_after_current_class(qapp, clock):
+    store, scheduler, reminders = make_scheduler([make_course()])
+    scheduler._on_timeout()
+    clock.current = datetime(2025, 9, 8, 7, 46)
+    scheduler._on_timeout()
+    assert reminders == [("course01", datetime(2025, 9, 1, 8, 0)), ("course01", datetime(2025, 9, 8, 8, 0))]
+
+
+def test_classes_already_started_are_not_reminded(qapp, clock):
+    clock.current = datetime(2025, 9, 1, 8, 10)
+    store, scheduler, reminders = make_scheduler([make_course()])
+    clock.current = datetime(2025, 9, 8, 8, 5)
+    scheduler._on_timeout()
+    assert reminders == []
+
+
+def test_courses_due_together_are_all_reminded(qapp, clock):
+    courses = [make_course(course_id="course01"), make_course(course_id="course02"), make_course(reminder=False, course_id="course03")]
+    store, scheduler, reminders = make_scheduler(courses)
+    scheduler._on_timeout()
+    assert sorted(course_id for course_id, _ in reminders) == ["course01", "course02"]
+
+
+def test_removed_course_is_not_reminded(qapp, clock):
+    store, scheduler, reminders = make_scheduler([make_course()])
+    store.remove("course01")
+    scheduler._on_timeout()
+    assert reminders == []
+    assert not scheduler._timer.isActive()
+
+
+def test_timer_waits_at_most_the_configured_time(qapp, clock):
+    clock.current = datetime(2025, 9, 1, 9, 0)
+    store, scheduler, reminders = make_scheduler([make_course()])
+    assert scheduler._timer.isActive()
+    assert scheduler._timer.interval() <= config.REMINDER_MAX_WAIT_MS
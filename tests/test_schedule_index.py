@@ -0,0 +1,94 @@
+# 课程占用索引的冲突检查和网格查找
+from classtable import Course, ScheduleIndex
+
+
+def make_course(day, start_section, end_section, weeks=Course.ALL_WEEKS, course_id=None):
+    course = Course("高等数学", "张老师", "A101", day, start_section, end_section, course_id=course_id)
+    course.weeks = weeks
+    return course
+
+
+def test_overlapping_sections_conflict():
+    index = ScheduleIndex()
+    index.add(make_course(0, 1, 2))
+    assert index.has_conflict(make_course(0, 2, 3))
+    assert index.has_conflict(make_course(0, 1, 1))
+
+
+def test_adjacent_sections_and_other_days_do_not_conflict():
+    index = ScheduleIndex()
+    index.add(make_course(0, 1, 2))
+    assert not index.has_conflict(make_course(0, 3, 4))
+    assert not index.has_conflict(make_course(1, 1, 2))
+
+
+def test_out_of_range_sections_are_clamped():
+    index = ScheduleIndex(sections=4)
+    index.add(make_course(0, 3, 4))
+    assert not index.has_conflict(make_course(0, 3, 1))
+    assert not index.has_conflict(make_course(0, -2, 0))
+    assert not index.has_conflict(make_course(0, 5, 9))
+    assert index.has_conflict(make_course(0, -2, 3))
+    assert index.has_conflict(make_course(0, 4, 20))
+
+
+def test_alternating_weeks_do_not_conflict():
+    index = ScheduleIndex()
+    index.add(make_course(2, 3, 4, Course.make_week_mask(1, 16, Course.WEEK_ODD)))
+    assert not index.has_conflict(make_course(2, 3, 4, Course.make_week_mask(1, 16, Course.WEEK_EVEN)))
+    assert index.has_conflict(make_course(2, 3, 4, Course.make_week_mask(1, 16)))
+
+
+def test_weeks_outside_semester_do_not_conflict():
+    index = ScheduleIndex()
+    index.add(make_course(0, 1, 2, 1 << 30))
+    assert not index.has_conflict(make_course(0, 1, 2))
+
+
+def test_excluded_course_does_not_conflict_with_itself():
+    index = ScheduleIndex()
+    course = make_course(0, 1, 2, course_id="course01")
+    index.add(course)
+    assert not index.has_conflict(make_course(0, 1, 3), exclude_id="course01")
+    index.add(make_course(0, 3, 3, course_id="course02"))
+    assert index.has_conflict(make_course(0, 1, 3), exclude_id="course01")
+
+
+def test_removed_course_no_longer_conflicts():
+    index = ScheduleIndex()
+    first = make_course(0, 1, 2)
+    second = make_course(0, 2, 2)
+    index.add(first)
+    index.add(second)
+    index.remove(first)
+    assert index.has_conflict(make_course(0, 2, 2))
+    assert not index.has_conflict(make_course(0, 1, 1))
+    index.remove(second)
+    assert not index.has_conflict(make_course(0, 1, 2))
+
+
+def test_weekend_courses_take_part_in_conflict_checks():
+    index = ScheduleIndex()
+    index.add(make_course(6, 1, 2))
+    assert index.has_conflict(make_course(6, 2, 2))
+    assert not index.has_conflict(make_course(7, 1, 2))
+
+
+def test_course_at_returns_course_only_at_its_first_section():
+    index = ScheduleIndex()
+    course = make_course(1, 3, 5)
+    index.add(course)
+    assert index.course_at(1, 3) is course
+    assert index.course_at(1, 4) is None
+    assert index.course_at(1, 6) is None
+
+
+def test_course_at_picks_the_course_running_that_week():
+    index = ScheduleIndex()
+    odd = make_course(0, 1, 2, Course.make_week_mask(1, 16, Course.WEEK_ODD))
+    even = make_course(0, 1, 2, Course.make_week_mask(1, 16, Course.WEEK_EVEN))
+    index.add(odd)
+    index.add(even)
+    assert index.course_at(0, 1, week=0) is odd
+    assert index.course_at(0, 1, week=1) is even
+    assert index.course_at(0, 1, week=17) is None
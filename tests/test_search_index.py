@@ -0,0 +1,60 @@
+# n-gram搜索索引的子串查找
+from classtable import Course, SearchIndex
+
+
+def make_index(*courses):
+    index = SearchIndex()
+    for course in courses:
+        index.add(course)
+    return index
+
+
+def test_short_queries_hit_postings_directly():
+    math = Course("高等数学", "张老师", "A101", course_id="course01")
+    physics = Course("大学物理", "李老师", "B202", course_id="course02")
+    index = make_index(math, physics)
+    assert index.search("数") == {"course01"}
+    assert index.search("学") == {"course01", "course02"}
+    assert index.search("老师") == {"course01", "course02"}
+    assert index.search("化学") == set()
+
+
+def test_long_queries_are_confirmed_as_substrings():
+    index = make_index(
+        Course("Linear Algebra", "", "", course_id="course01"),
+        Course("abcXbcd", "", "", course_id="course02"),
+    )
+    assert index.search("algebra") == {"course01"}
+    assert index.search("linear alg") == {"course01"}
+    # 包含abc和bcd两个n-gram，但不包含abcd子串
+    assert index.search("abcd") == set()
+
+
+def test_search_is_case_insensitive():
+    index = make_index(Course("Python程序设计", "", "LAB-3", course_id="course01"))
+    assert index.search("PYTHON") == {"course01"}
+    assert index.search("lab-3") == {"course01"}
+
+
+def test_grams_do_not_span_fields():
+    index = make_index(Course("高等", "数学", "", course_id="course01"))
+    assert index.search("等数") == set()
+    assert index.search("高等数学") == set()
+
+
+def test_empty_query_returns_all_courses():
+    index = make_index(Course("高等数学", course_id="course01"), Course("大学物理", course_id="course02"))
+    assert index.search("") == {"course01", "course02"}
+
+
+def test_removed_courses_leave_no_postings():
+    math = Course("高等数学", "张老师", "A101", course_id="course01")
+    physics = Course("大学物理", "李老师", "B202", course_id="course02")
+    index = make_index(math, physics)
+    index.remove(math)
+    assert index.search("数") == set()
+    assert index.search("学") == {"course02"}
+    index.remove(physics)
+    assert index.postings == {}
+    assert index.texts == {}
+    index.remove(physics)
@@ -0,0 +1,75 @@
+# 整学期PDF导出任务：按顺序写入、取消，以及绘制完成的回调立即执行时不会死锁
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from classtable import Course, CourseStore, SemesterExportTask
+
+
+class ImmediateExecutor:
+    """在提交时立即执行任务的执行器，返回的future已经完成，回调在添加时就会执行。"""
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+@pytest.fixture
+def pages():
+    store = CourseStore([Course("高等数学", "张老师", "A101", 0, 1, 2), Course("大学物理", "李老师", "B202", 2, 3, 4)])
+    weeks = [(store.week_view(week), f"第{week + 1}周") for week in range(5)]
+    return [weeks[i:i + 2] for i in range(0, len(weeks), 2)]
+
+
+def run_task(qapp, task, timeout=30):
+    results = []
+    task.finished.connect(lambda page_count: results.append(("finished", page_count)))
+    task.failed.connect(lambda message: results.append(("failed", message)))
+    task.start()
+    deadline = time.monotonic() + timeout
+    while not results and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert results, "导出没有结束"
+    return results[0]
+
+
+@pytest.mark.parametrize("make_executor", [ImmediateExecutor, lambda: ThreadPoolExecutor(8)])
+def test_exports_all_pages_in_order(qapp, tmp_path, pages, make_executor):
+    file_path = tmp_path / "semester.pdf"
+    progress = []
+    task = SemesterExportTask(pages, str(file_path), make_executor(), dpi=30, max_pending=2, preview_dpi=15)
+    task.progress.connect(progress.append)
+    assert run_task(qapp, task) == ("finished", len(pages))
+    assert progress == [1, 2, 3]
+    assert file_path.read_bytes().startswith(b"%PDF")
+    assert not (tmp_path / "semester.pdf.tmp").exists()
+    assert len(task.preview_images) == len(pages)
+    assert task.preview_images[0].width() < 200
+
+
+def test_empty_export_finishes_without_file(qapp, tmp_path):
+    task = SemesterExportTask([], str(tmp_path / "semester.pdf"), ImmediateExecutor())
+    assert run_task(qapp, task) == ("finished", 0)
+    assert not (tmp_path / "semester.pdf").exists()
+
+
+def test_cancel_removes_partial_file(qapp, tmp_path, pages):
+    file_path = tmp_path / "semester.pdf"
+    task = SemesterExportTask(pages, str(file_path), ThreadPoolExecutor(2), dpi=30, max_pending=1)
+    task.progress.connect(lambda page_count: task.cancel())
+    assert run_task(qapp, task) == ("finished", None)
+    assert not file_path.exists()
+    assert not (tmp_path / "semester.pdf.tmp").exists()
+    assert task.preview_images == []
+
+
+def test_render_errors_are_reported(qapp, tmp_path, pages):
+    executor = ThreadPoolExecutor(2)
+    executor.shutdown()
+    task = SemesterExportTask(pages, str(tmp_path / "semester.pdf"), executor, dpi=30)
+    status, message = run_task(qapp, task)
+    assert status == "failed" and message
+    assert not (tmp_path / "semester.pdf.tmp").exists()
@@ -0,0 +1,98 @@
+# SQLite课程存储：单行写入、增量同步快照和基于索引的查询
+import json
+
+import pytest
+
+from classtable import Course, SqliteScheduleStorage
+
+
+def make_course(name, teacher, classroom, day, start_section, end_section, course_id, weeks=Course.ALL_WEEKS):
+    course = Course(name, teacher, classroom, day, start_section, end_section, course_id=course_id)
+    course.weeks = weeks
+    return course
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SqliteScheduleStorage(str(tmp_path / "schedule.db"), str(tmp_path / "schedule.json"))
+    storage.write_snapshot([
+        make_course("高等数学", "张老师", "A101", 0, 1, 2, "course01").to_dict(),
+        make_course("大学物理", "李老师", "A101", 0, 3, 4, "course02", Course.make_week_mask(1, 16, Course.WEEK_ODD)).to_dict(),
+        make_course("线性代数", "张老师", "B202", 2, 1, 2, "course03").to_dict(),
+    ])
+    yield storage
+    storage.close()
+
+
+def ids(course_dicts):
+    return [data['id'] for data in course_dicts]
+
+
+def test_single_row_changes(storage):
+    storage.append('add', make_course("程序设计", "王老师", "C303", 4, 5, 6, "course04"))
+    storage.append('update', make_course("高等数学（下）", "张老师", "A101", 0, 1, 2, "course01"))
+    storage.append('delete', make_course("大学物理", "", "", 0, 3, 4, "course02"))
+    loaded = storage.load()
+    assert ids(loaded) == ["course01", "course03", "course04"]
+    assert loaded[0]['name'] == "高等数学（下）"
+    assert loaded[0]['reminder'] is False
+
+
+def test_snapshot_writes_only_changed_rows(storage):
+    course_dicts = storage.load()
+    changes = storage._conn.total_changes
+    storage.write_snapshot(course_dicts)
+    assert storage._conn.total_changes == changes
+    course_dicts[1]['classroom'] = "B303"
+    del course_dicts[2]
+    course_dicts.append(make_course("程序设计", "王老师", "C303", 4, 5, 6, "course04").to_dict())
+    storage.write_snapshot(course_dicts)
+    assert storage._conn.total_changes == changes + 3
+    assert storage.load() == course_dicts
+
+
+def test_indexes_are_used(storage):
+    indexes = {row[1] for row in storage._conn.execute("PRAGMA index_list(courses)")}
+    assert {"idx_courses_day_start", "idx_courses_teacher", "idx_courses_classroom"} <= indexes
+    for sql, index in [
+        ("SELECT id FROM courses WHERE day = 0 AND start_section <= 2", "idx_courses_day_start"),
+        ("SELECT id FROM courses WHERE teacher = '张老师'", "idx_courses_teacher"),
+        ("SELECT id FROM courses WHERE classroom = 'A101'", "idx_courses_classroom"),
+    ]:
+        plan = " ".join(str(row[-1]) for row in storage._conn.execute("EXPLAIN QUERY PLAN " + sql))
+        assert index in plan
+
+
+def test_conflict_query(storage):
+    assert storage.has_conflict(make_course("", "", "", 0, 2, 3, "new"))
+    assert not storage.has_conflict(make_course("", "", "", 0, 5, 6, "new"))
+    assert not storage.has_conflict(make_course("", "", "", 0, 1, 2, "course01"), exclude_id="course01")
+    # 单双周交替不冲突
+    even = make_course("", "", "", 0, 3, 3, "new", Course.make_week_mask(1, 16, Course.WEEK_EVEN))
+    assert not storage.has_conflict(even)
+
+
+def test_lookups(storage):
+    assert ids(storage.courses_at(0)) == ["course01", "course02"]
+    assert ids(storage.courses_at(0, 3, 4)) == ["course02"]
+    assert ids(storage.courses_by_teacher("张老师")) == ["course01", "course03"]
+    assert ids(storage.courses_by_classroom("A101")) == ["course01", "course02"]
+    assert storage.courses_by_teacher("赵老师") == []
+
+
+def test_course_counts(storage):
+    storage.append('add', make_course("自习", "", "", 1, 1, 1, "course04"))
+    assert storage.course_counts('teacher') == sorted([("张老师", 2, 4), ("李老师", 1, 2)])
+    assert storage.course_counts('classroom') == [("A101", 2, 4), ("B202", 1, 2)]
+    with pytest.raises(ValueError):
+        storage.course_counts('name; DROP TABLE courses')
+
+
+def test_migrates_legacy_json(tmp_path):
+    legacy = [make_course("高等数学", "张老师", "A101", 0, 1, 2, "course01").to_dict()]
+    (tmp_path / "schedule.json").write_text(json.dumps(legacy, ensure_ascii=False), encoding='utf-8')
+    storage = SqliteScheduleStorage(str(tmp_path / "schedule.db"), str(tmp_path / "schedule.json"))
+    assert storage.exists()
+    assert storage.load() == legacy
+    assert ids(storage.courses_by_teacher("张老师")) == ["course01"]
+    storage.close()
@@ -0,0 +1,93 @@
+# 流式课程读取器对正常、被截断和格式错误的文件的处理
+import io
+import json
+
+import pytest
+
+from classtable import StreamingCourseReader
+
+
+def course_dicts(count):
+    return [
+        {"name": f"课程{i}", "teacher": "张老师", "classroom": "A101", "day": i % 5,
+         "start_section": 1, "end_section": 2, "color": "#4CAF50", "weeks": 262143, "id": f"course{i:04d}"}
+        for i in range(count)
+    ]
+
+
+def read_all(data, chunk_size=64):
+    return list(StreamingCourseReader(io.BytesIO(data), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 64 * 1024])
+def test_reads_top_level_array(chunk_size):
+    courses = course_dicts(50)
+    data = json.dumps(courses, ensure_ascii=False, indent=2).encode('utf-8')
+    assert read_all(data, chunk_size) == courses
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_reads_courses_field_of_export_file(chunk_size):
+    courses = course_dicts(20)
+    data = json.dumps({"version": "1.2", "exported_at": "2025-09-01", "courses": courses,
+                       "trailing": {"ignored": [1, 2]}}, ensure_ascii=False).encode('utf-8')
+    assert read_all(data, chunk_size) == courses
+
+
+def test_numbers_split_across_chunks_are_read_whole():
+    data = json.dumps([123456789, 987654321]).encode('utf-8')
+    assert read_all(data, chunk_size=3) == [123456789, 987654321]
+
+
+def test_strings_longer_than_a_chunk_are_read_whole():
+    courses = course_dicts(3)
+    courses[1]["name"] = "很长的课程名称" * 100
+    data = json.dumps(courses, ensure_ascii=False).encode('utf-8')
+    assert read_all(data, chunk_size=16) == courses
+
+
+def test_empty_array_and_object():
+    assert read_all(b" [ ] ") == []
+    assert read_all(b"{}") == []
+    assert read_all(b'{"version": "1.2"}') == []
+
+
+def test_counts_bytes_read():
+    data = json.dumps(course_dicts(10)).encode('utf-8')
+    reader = StreamingCourseReader(io.BytesIO(data), chunk_size=16)
+    list(reader)
+    assert reader.bytes_read == len(data)
+
+
+@pytest.mark.parametrize("cut", [1, 100, -40, -1])
+def test_truncated_file_raises(cut):
+    data = json.dumps(course_dicts(10), ensure_ascii=False).encode('utf-8')
+    with pytest.raises(ValueError):
+        read_all(data[:cut])
+
+
+def test_truncated_inside_multibyte_character_raises():
+    data = json.dumps(course_dicts(3), ensure_ascii=False).encode('utf-8')
+    cut = data.index("课".encode('utf-8')) + 1
+    with pytest.raises(ValueError):
+        read_all(data[:cut])
+
+
+@pytest.mark.parametrize("data", [b"", b"42", b'"courses"', b"[1 2]", b'{"courses" []}', b"[{]"])
+def test_malformed_file_raises(data):
+    with pytest.raises(ValueError):
+        read_all(data)
+
+
+def test_malformed_element_fails_without_reading_rest_of_file():
+    courses = course_dicts(2000)
+    data = json.dumps(courses, ensure_ascii=False).encode('utf-8')
+    data = data.replace(b'"id": "course0005"', b'"id": course0005"', 1)
+    stream = io.BytesIO(data)
+    reader = StreamingCourseReader(stream, chunk_size=1024)
+    items = []
+    with pytest.raises(ValueError, match="格式错误"):
+        for item in reader:
+            items.append(item)
+    assert items == courses[:5]
+    assert reader.bytes_read < len(data) // 10